@@ -0,0 +1,55 @@
+"""
+Benchmark of PDF report generation with different numbers of worker processes.
+
+Reports are generated with 1 worker by default; a pool only pays off where this shows a speedup on several CPUs.
+
+Usage:
+    python -m benchmarks.report_benchmark --rows 500000 --columns 10 --workers 1 2 4
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+from idmd.report.report import ReportGenerator
+
+
+def benchmark(rows: int, columns: int, workers: List[int], repeat: int) -> None:
+    """
+    Generates the same report with every worker count and prints the best time and the speedup over 1 worker.
+
+    Args:
+        rows (int): The number of rows of the random dataset.
+        columns (int): The number of numeric columns of the random dataset.
+        workers (List[int]): The worker counts to compare.
+        repeat (int): The number of runs per worker count, of which the fastest is reported.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(rows, columns)), columns=[f"col_{i}" for i in range(columns)])
+    density_cols = df.columns[:2].tolist()
+
+    baseline = None
+    print(f"{rows} rows x {columns} columns")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    for count in workers:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ReportGenerator.create_pdf_report(df, density_cols=density_cols, max_workers=count)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        baseline = baseline or (best if count == 1 else None)
+        speedup = f"{baseline / best:.2f}x" if baseline else "-"
+        print(f"{count:>8} {best:>9.2f} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of rows. Defaults to 200000.")
+    parser.add_argument("--columns", type=int, default=10, help="Number of numeric columns. Defaults to 10.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts. Defaults to 1 2 4.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count. Defaults to 3.")
+    arguments = parser.parse_args()
+    benchmark(arguments.rows, arguments.columns, arguments.workers, arguments.repeat)
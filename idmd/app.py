@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
 import streamlit as st
 from idmd.ui.base import Component
 from streamlit.commands.page_config import Layout
@@ -18,6 +19,10 @@ class DataApp:
             title (str): The title of the application. Defaults to "Interactive Data Manipulator and Descriptor".
             layout (str): The layout of the application. Can be "centered" or "wide". Defaults to "wide".
         """
+        # Dataset versions share column data with each other (see idmd.data.store.DatasetStore), which is only
+        # safe when modifying one DataFrame can never write into another. Copy-on-write guarantees this. It is a
+        # global pandas option, so it is enabled by the application rather than on import of the library.
+        pd.set_option("mode.copy_on_write", True)
         st.set_page_config(layout=layout, page_title=title)
         self.title: str = title
         self.title_color: Optional[str] = None
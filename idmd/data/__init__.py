@@ -1,4 +1,4 @@
 """
 This module handles data upload, export, as well as data generation.
-Contains the following submodules: exporter.py, generator.py, uploader.py
+Contains the following submodules: cache.py, compactor.py, correlation.py, exporter.py, generator.py, stats.py, store.py, uploader.py
 """
@@ -0,0 +1,296 @@
+"""Module for caching parsed data."""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+DIGEST_BLOCK_SIZE = 1 << 20
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = sys.getsizeof) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the cached values in bytes.
+            sizeof (Callable[[Any], int]): Returns the size of a value in bytes. Defaults to sys.getsizeof.
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns a cached value and marks it as recently used.
+
+        Args:
+            key (Hashable): The key of the value.
+            default (Any): The value to return if the key is not cached. Defaults to None.
+
+        Returns:
+            Any: The cached value, or `default`.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """
+        Caches a value, evicting the least recently used values until the cache fits its size limit.
+
+        Values larger than the whole cache are not stored.
+
+        Args:
+            key (Hashable): The key of the value.
+            value (Any): The value to cache.
+            size (int, optional): The size of the value in bytes. Defaults to `sizeof(value)`.
+        """
+        size = self.sizeof(value) if size is None else size
+        with self._lock:
+            self.pop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Removes a value from the cache.
+
+        Args:
+            key (Hashable): The key of the value.
+            default (Any): The value to return if the key is not cached. Defaults to None.
+
+        Returns:
+            Any: The removed value, or `default`.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self.nbytes -= size
+            return value
+
+    def clear(self) -> None:
+        """Removes all values from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+class ParseCache:
+    """Caches parsed DataFrames by a fingerprint of the file content, shared by all sessions."""
+
+    def __init__(self, max_bytes: int = 2 << 30, disk_dir: Optional[str] = None) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            max_bytes (int): The maximum total memory of the cached DataFrames in bytes. Defaults to 2 GiB.
+            disk_dir (str, optional): Directory where parsed DataFrames are also stored as Parquet files, with their
+                metadata in a JSON file next to each, so they survive eviction and server restarts. Defaults to None
+                (memory only).
+        """
+        self.frames = LRUCache(max_bytes, sizeof=lambda df: int(df.memory_usage(deep=True).sum()))
+        self.disk_dir = disk_dir
+        self._digests = LRUCache(1024, sizeof=lambda _: 1)
+        self._metadata = LRUCache(1024, sizeof=lambda _: 1)
+
+    def fingerprint(self, source) -> str:
+        """
+        Computes a fingerprint of the content of a file object or path.
+
+        Digests are memoized per Streamlit upload (`file_id`) and per path, size and modification time, so
+        repeated checks of the same upload or file do not hash it again.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+
+        Returns:
+            str: The hex digest of the file content.
+        """
+        if isinstance(source, str):
+            stat = os.stat(source)
+            memo_key = ("path", os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+        elif getattr(source, "file_id", None) is not None:
+            memo_key = ("upload", source.file_id)
+        else:
+            memo_key = None
+
+        digest = self._digests.get(memo_key) if memo_key else None
+        if digest is None:
+            digest = self._hash_content(source)
+            if memo_key:
+                self._digests.put(memo_key, digest)
+        return digest
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        Returns a cached DataFrame, loading it and its metadata from the disk cache if it is not in memory.
+
+        The returned DataFrame is shared and must not be modified in place.
+
+        Args:
+            key (Hashable): The cache key, starting with the content fingerprint.
+
+        Returns:
+            Optional[pd.DataFrame]: The cached DataFrame, or None if it is not cached.
+        """
+        df = self.frames.get(key)
+        if df is None and self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                df = pd.read_parquet(path)
+                self.frames.put(key, df)
+                metadata_path = self._metadata_path(key)
+                if os.path.exists(metadata_path):
+                    with open(metadata_path, encoding="utf-8") as file:
+                        self._metadata.put(key, json.load(file))
+        return df
+
+    def put(self, key: Hashable, df: pd.DataFrame, metadata: Optional[dict] = None) -> None:
+        """
+        Caches a parsed DataFrame in memory and, if configured, on disk.
+
+        Args:
+            key (Hashable): The cache key, starting with the content fingerprint.
+            df (pd.DataFrame): The parsed DataFrame.
+            metadata (dict, optional): Small JSON-serializable details about the parse kept next to the DataFrame,
+                in memory and on disk. Defaults to None.
+        """
+        self.frames.put(key, df)
+        if metadata is not None:
+            self._metadata.put(key, metadata)
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            df.to_parquet(temp_path)
+            if metadata is not None:
+                # Written before the Parquet file, so a frame found on disk always has its metadata.
+                metadata_temp_path = f"{self._metadata_path(key)}.{threading.get_ident()}.tmp"
+                with open(metadata_temp_path, "w", encoding="utf-8") as file:
+                    json.dump(metadata, file)
+                os.replace(metadata_temp_path, self._metadata_path(key))
+            os.replace(temp_path, path)
+        except (pa.ArrowException, ValueError, TypeError):
+            # Frames with mixed-type object columns cannot be stored as Parquet; keep them in memory only.
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def metadata(self, key: Hashable) -> dict:
+        """
+        Returns the metadata stored with a cached DataFrame.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            dict: The metadata, or an empty dict if none is known.
+        """
+        return self._metadata.get(key, {})
+
+    def clear(self) -> None:
+        """Removes all DataFrames from the memory cache."""
+        self.frames.clear()
+        self._metadata.clear()
+
+    @staticmethod
+    def key_id(key: Hashable) -> str:
+        """
+        Returns a short stable identifier of a cache key, usable as a file name or dataset version.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            str: The hex identifier.
+        """
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def _disk_path(self, key: Hashable) -> str:
+        """
+        Returns the Parquet file path of a cache key.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            str: The path of the cached Parquet file.
+        """
+        return os.path.join(self.disk_dir, f"{self.key_id(key)}.parquet")
+
+    def _metadata_path(self, key: Hashable) -> str:
+        """
+        Returns the path of the JSON file holding the metadata of a cache key.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            str: The path of the metadata file.
+        """
+        return os.path.join(self.disk_dir, f"{self.key_id(key)}.json")
+
+    @staticmethod
+    def _hash_content(source) -> str:
+        """
+        Hashes the whole content of a file object or path.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+
+        Returns:
+            str: The hex digest of the content.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                for block in iter(lambda: file.read(DIGEST_BLOCK_SIZE), b""):
+                    digest.update(block)
+        elif hasattr(source, "getbuffer"):
+            digest.update(source.getbuffer())
+        else:
+            position = source.tell()
+            source.seek(0)
+            block = source.read(DIGEST_BLOCK_SIZE)
+            while block:
+                digest.update(block.encode() if isinstance(block, str) else block)
+                block = source.read(DIGEST_BLOCK_SIZE)
+            source.seek(position)
+
+        return digest.hexdigest()
+
+
+PARSE_CACHE = ParseCache()
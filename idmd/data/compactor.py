@@ -0,0 +1,84 @@
+"""Module for dtype compaction."""
+
+import numpy as np
+import pandas as pd
+
+
+class DtypeCompactor:
+    """Shrinks the memory footprint of a DataFrame by choosing compact dtypes."""
+
+    @staticmethod
+    def compact(
+        df: pd.DataFrame, category_threshold: float = 0.5, arrow_strings: bool = True, lossy_floats: bool = False
+    ) -> pd.DataFrame:
+        """
+        Returns a DataFrame with compact dtypes.
+
+        - Integer columns are downcast to the smallest integer type that holds their values.
+        - Float columns are downcast to float32, only if no precision is lost unless `lossy_floats` is set.
+        - String columns with few distinct values become `category`, the others Arrow-backed strings.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to compact.
+            category_threshold (float): Maximum ratio of distinct values to rows for a string column to become
+                a category. Defaults to 0.5.
+            arrow_strings (bool): Whether to store the remaining string columns as Arrow-backed strings.
+                Defaults to True.
+            lossy_floats (bool): Whether to downcast float columns to float32 even if it loses precision.
+                Defaults to False.
+
+        Returns:
+            pd.DataFrame: The compacted DataFrame. Unchanged columns share their data with `df`.
+        """
+        compacted = df.copy(deep=False)
+
+        for col in df.columns:
+            col_data = df[col]
+            new_data = None
+
+            if pd.api.types.is_bool_dtype(col_data):
+                continue
+            if pd.api.types.is_integer_dtype(col_data):
+                new_data = pd.to_numeric(col_data, downcast="integer")
+            elif col_data.dtype == np.float64:
+                new_data = DtypeCompactor._downcast_float(col_data, lossy_floats)
+            elif col_data.dtype == object and pd.api.types.infer_dtype(col_data, skipna=True) == "string":
+                if col_data.nunique() <= category_threshold * len(col_data):
+                    new_data = col_data.astype("category")
+                elif arrow_strings:
+                    new_data = col_data.astype("string[pyarrow]")
+
+            if new_data is not None and new_data.dtype != col_data.dtype:
+                compacted[col] = new_data
+
+        return compacted
+
+    @staticmethod
+    def memory_usage(df: pd.DataFrame) -> int:
+        """
+        Returns the total memory used by a DataFrame, including the contents of string columns.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to measure.
+
+        Returns:
+            int: The memory usage in bytes.
+        """
+        return int(df.memory_usage(deep=True).sum())
+
+    @staticmethod
+    def _downcast_float(col_data: pd.Series, lossy: bool) -> pd.Series:
+        """
+        Downcasts a float column to float32.
+
+        Args:
+            col_data (pd.Series): The float column.
+            lossy (bool): Whether to downcast even if the values cannot be represented exactly.
+
+        Returns:
+            pd.Series: The downcast column, or the original column if downcasting would lose precision.
+        """
+        downcast = col_data.astype(np.float32)
+        if lossy or np.array_equal(downcast.to_numpy(np.float64), col_data.to_numpy(np.float64), equal_nan=True):
+            return downcast
+        return col_data
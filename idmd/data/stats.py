@@ -0,0 +1,258 @@
+"""Module for caching column statistics."""
+
+import sys
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache
+
+
+class StatisticsCache:
+    """
+    Caches column statistics by column token, shared by all components and sessions.
+
+    A column token identifies the data of a column rather than its name or the DataFrame holding it: operations
+    that leave a column untouched keep its token, so its statistics stay cached, while a column an operation
+    changed gets a new token and is computed again. `DatasetStore` assigns the tokens and tracks every version
+    it publishes here. Statistics of DataFrames that are not tracked are computed without caching.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the cached statistics in bytes (see `sizeof`). Defaults to
+                64 MiB.
+        """
+        self.entries = LRUCache(max_bytes, sizeof=StatisticsCache.sizeof)
+        self._tracked: Dict[int, Tuple[weakref.ref, Dict[Hashable, Hashable]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sizeof(value: Any) -> int:
+        """
+        Estimates the memory used by a cached statistic.
+
+        Args:
+            value (Any): The statistic: a DataFrame, a Series, an array, a scalar, or a tuple, list or dict of them.
+
+        Returns:
+            int: The size of the statistic in bytes.
+        """
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(deep=True))
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(StatisticsCache.sizeof(item) for item in value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(StatisticsCache.sizeof(item) for item in value.values())
+        return sys.getsizeof(value)
+
+    def track(self, df: pd.DataFrame, tokens: Dict[Hashable, Hashable]) -> None:
+        """
+        Associates the columns of a DataFrame with their tokens, for as long as the DataFrame exists.
+
+        Args:
+            df (pd.DataFrame): The DataFrame. It must not be modified in place afterwards.
+            tokens (Dict[Hashable, Hashable]): The token of every column, by column name.
+        """
+        key = id(df)
+        ref = weakref.ref(df, lambda dead, key=key: self._untrack(key, dead))
+        with self._lock:
+            self._tracked[key] = (ref, dict(tokens))
+
+    def tokens(self, df: pd.DataFrame) -> Optional[Dict[Hashable, Hashable]]:
+        """
+        Returns the column tokens of a tracked DataFrame.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+
+        Returns:
+            Optional[Dict[Hashable, Hashable]]: The token of every column, or None if the DataFrame is not tracked.
+        """
+        with self._lock:
+            entry = self._tracked.get(id(df))
+        if entry is None or entry[0]() is not df:
+            return None
+        return entry[1]
+
+    def describe(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns the summary statistics of `DataFrame.describe`, computing only the columns not cached yet.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            columns (List[str], optional): The columns to describe. Defaults to None (all columns).
+
+        Returns:
+            pd.DataFrame: The same result as `df[columns].describe()`.
+        """
+        data = df if columns is None else df[columns]
+        tokens = self.tokens(df)
+        described = data.select_dtypes(include=[np.number, "datetime"]).columns
+        cacheable = (
+            tokens is not None
+            and not described.empty
+            and not described.has_duplicates
+            and described.equals(data.select_dtypes(include=np.number).columns)
+        )
+        if not cacheable:
+            return data.describe()
+
+        stats = {col: self.entries.get(("describe", tokens.get(col))) for col in described}
+        missing = [col for col in described if stats[col] is None or tokens.get(col) is None]
+        if missing:
+            computed = data[missing].describe()
+            for col in missing:
+                stats[col] = computed[col]
+                if tokens.get(col) is not None:
+                    self.entries.put(("describe", tokens[col]), computed[col])
+
+        return pd.concat([stats[col] for col in described], axis=1).set_axis(described, axis=1)
+
+    def cached_describe(self, df: pd.DataFrame, columns: List[str]) -> Optional[pd.DataFrame]:
+        """
+        Returns the summary statistics of `DataFrame.describe` only if they are cached for all columns.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            columns (List[str]): The numeric columns to describe.
+
+        Returns:
+            Optional[pd.DataFrame]: The same result as `df[columns].describe()`, or None if any column is not
+                cached. Nothing is computed.
+        """
+        tokens = self.tokens(df)
+        if tokens is None or not columns or len(set(columns)) < len(columns):
+            return None
+        stats = [
+            self.entries.get(("describe", tokens[col])) if tokens.get(col) is not None else None for col in columns
+        ]
+        if any(col_stats is None for col_stats in stats):
+            return None
+        return pd.concat(stats, axis=1).set_axis(pd.Index(columns), axis=1)
+
+    def corr(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns the pairwise Pearson correlation of columns, computing only the pairs not cached yet.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            columns (List[str], optional): The columns to correlate. Defaults to None (all columns).
+
+        Returns:
+            pd.DataFrame: The same result as `df[columns].corr()`.
+        """
+        data = df if columns is None else df[columns]
+        tokens = self.tokens(df)
+        labels = list(data.columns)
+        if not labels or tokens is None or data.columns.has_duplicates or any(tokens.get(c) is None for c in labels):
+            return data.corr()
+
+        size = len(labels)
+        keys = [[("corr", frozenset((tokens[a], tokens[b]))) for b in labels] for a in labels]
+        matrix = np.array([[self.entries.get(key, np.nan) for key in row] for row in keys], dtype=np.float64)
+        missing = {(i, j) for i in range(size) for j in range(i, size) if keys[i][j] not in self.entries}
+
+        # Recompute whole rows, choosing greedily the columns that cover most missing pairs (usually the columns
+        # an operation changed), until every missing pair is covered.
+        stale = []
+        while missing:
+            counts = np.bincount([i for pair in missing for i in set(pair)], minlength=size)
+            stale.append(int(np.argmax(counts)))
+            missing = {pair for pair in missing if stale[-1] not in pair}
+
+        if len(stale) * 2 > size:
+            matrix = data.corr().to_numpy(dtype=np.float64)
+        else:
+            for i in stale:
+                matrix[i] = matrix[:, i] = data.corrwith(data[labels[i]]).to_numpy(dtype=np.float64)
+
+        for i in stale:
+            for j in range(size):
+                self.entries.put(keys[i][j], matrix[i, j])
+
+        return pd.DataFrame(matrix, index=data.columns, columns=data.columns)
+
+    def per_column(
+        self,
+        df: pd.DataFrame,
+        kind: Hashable,
+        columns: List[str],
+        compute: Callable[[List[str]], Dict[Hashable, Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Returns a statistic of every column, computing it in a single call for the columns not cached yet.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            kind (Hashable): Identifies the statistic and its parameters, e.g. ("histogram", 20).
+            columns (List[str]): The columns.
+            compute (Callable[[List[str]], Dict[Hashable, Any]]): Computes the statistic of the given columns of
+                `df`, by column name.
+
+        Returns:
+            Dict[Hashable, Any]: The statistic of every column, by column name.
+        """
+        tokens = self.tokens(df) or {}
+        results = {col: self.entries.get((kind, tokens[col])) for col in columns if tokens.get(col) is not None}
+        missing = [col for col in columns if results.get(col) is None]
+        if missing:
+            computed = compute(missing)
+            for col in missing:
+                results[col] = computed[col]
+                if tokens.get(col) is not None:
+                    self.entries.put((kind, tokens[col]), computed[col])
+        return {col: results[col] for col in columns}
+
+    def joint(self, df: pd.DataFrame, kind: Hashable, columns: List[str], compute: Callable[[], Any]) -> Any:
+        """
+        Returns a statistic of several columns together, e.g. their 2D histogram, computing it if not cached yet.
+
+        Args:
+            df (pd.DataFrame): The DataFrame.
+            kind (Hashable): Identifies the statistic and its parameters, e.g. ("density", 100).
+            columns (List[str]): The columns, in the order the statistic depends on.
+            compute (Callable[[], Any]): Computes the statistic of the columns of `df`.
+
+        Returns:
+            Any: The statistic.
+        """
+        tokens = self.tokens(df) or {}
+        if any(tokens.get(col) is None for col in columns):
+            return compute()
+
+        key = (kind, tuple(tokens[col] for col in columns))
+        result = self.entries.get(key)
+        if result is None:
+            result = compute()
+            self.entries.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Removes all cached statistics."""
+        self.entries.clear()
+
+    def _untrack(self, key: int, ref: weakref.ref) -> None:
+        """
+        Forgets a DataFrame that no longer exists.
+
+        Args:
+            key (int): The identity of the DataFrame.
+            ref (weakref.ref): The dead reference to the DataFrame.
+        """
+        with self._lock:
+            if key in self._tracked and self._tracked[key][0] is ref:
+                del self._tracked[key]
+
+
+STATS_CACHE = StatisticsCache()
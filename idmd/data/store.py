@@ -0,0 +1,458 @@
+"""Module for versioned dataset storage."""
+
+import uuid
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..manipulation.plan import LazyPlan, Operation
+from .stats import STATS_CACHE
+
+
+class DatasetVersion:
+    """A single version of a dataset: the operation that produced it and the resulting data."""
+
+    __slots__ = ("version_id", "operation", "frame", "plan_operation", "tokens")
+
+    def __init__(
+        self,
+        version_id: str,
+        operation: str,
+        frame: Optional[pd.DataFrame],
+        plan_operation: Optional[Operation] = None,
+        tokens: Optional[Dict[Hashable, Hashable]] = None,
+    ) -> None:
+        """
+        Initializes the version.
+
+        Args:
+            version_id (str): The identifier of the version.
+            operation (str): A description of the operation that produced the version.
+            frame (Optional[pd.DataFrame]): The data of the version, or None until a recorded operation has been
+                executed.
+            plan_operation (Operation, optional): The recorded operation that produces the data from the previous
+                version. Defaults to None.
+            tokens (Dict[Hashable, Hashable], optional): The token identifying the data of every column, by column
+                name (see `StatisticsCache`). Defaults to a new token for every column of `frame`.
+        """
+        self.version_id = version_id
+        self.operation = operation
+        self.frame = frame
+        self.plan_operation = plan_operation
+        self.tokens = tokens if tokens is not None else {col: (version_id, col) for col in frame.columns}
+
+
+class DatasetStore:
+    """
+    Keeps a base snapshot of a dataset and the versions derived from it by operations.
+
+    Versions are never modified in place. With pandas copy-on-write, which `DataApp` enables, a version shares the
+    data of every column an operation did not change with its parent, so keeping the history, resetting,
+    undoing and redoing never duplicate the full dataset.
+
+    Operations recorded with `apply` are executed lazily: the data of a version is computed only when it is
+    requested, by running an optimized `LazyPlan` of all pending operations since the last computed version.
+
+    Every column of a version has a token that identifies its data. Columns an operation did not change keep
+    their token, so their statistics stay in the shared `StatisticsCache` across versions.
+    """
+
+    SESSION_KEY = "dataset"
+
+    def __init__(self, base: pd.DataFrame, base_id: Optional[str] = None) -> None:
+        """
+        Initializes the store with a base snapshot.
+
+        Args:
+            base (pd.DataFrame): The loaded or generated dataset.
+            base_id (str, optional): The version identifier of the base snapshot, e.g. derived from the content
+                of the loaded file. Defaults to a new unique identifier.
+        """
+        self._versions: List[DatasetVersion] = [DatasetVersion(base_id or self._new_id(), "load", base)]
+        self._position = 0
+        self._published: Optional[pd.DataFrame] = None
+
+    @property
+    def base(self) -> pd.DataFrame:
+        """pd.DataFrame: The base snapshot of the dataset."""
+        return self._versions[0].frame
+
+    @property
+    def current(self) -> pd.DataFrame:
+        """pd.DataFrame: The data of the current version, executing pending operations if needed."""
+        return self._materialize(self._position)
+
+    @property
+    def columns(self) -> List[str]:
+        """List[str]: The columns of the current version, known without executing pending operations."""
+        return self._plan(self._position).columns
+
+    @property
+    def pending(self) -> int:
+        """int: The number of recorded operations of the current version that have not been executed yet."""
+        return self._position - self._last_materialized(self._position)
+
+    @property
+    def column_tokens(self) -> Dict[Hashable, Hashable]:
+        """Dict[Hashable, Hashable]: The token identifying the data of every column of the current version."""
+        return self._versions[self._position].tokens
+
+    @property
+    def version_id(self) -> str:
+        """str: The identifier of the current version."""
+        return self._versions[self._position].version_id
+
+    @property
+    def history(self) -> List[str]:
+        """List[str]: The operations that led to the current version, oldest first."""
+        return [version.operation for version in self._versions[: self._position + 1]]
+
+    @property
+    def can_undo(self) -> bool:
+        """bool: Whether there is a version before the current one."""
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        """bool: Whether an undone version can be restored."""
+        return self._position < len(self._versions) - 1
+
+    def commit(self, df: pd.DataFrame, operation: str) -> str:
+        """
+        Adds a new version on top of the current one, discarding any undone versions.
+
+        Args:
+            df (pd.DataFrame): The data of the new version. It must not be modified in place afterwards.
+            operation (str): A description of the operation that produced the data.
+
+        Returns:
+            str: The identifier of the new version.
+        """
+        parent = self._versions[self._position]
+        version_id = self._new_id()
+        tokens = {
+            col: (
+                parent.tokens[col]
+                if parent.frame is not None
+                and col in parent.frame.columns
+                and self._same_data(df[col], parent.frame[col])
+                else (version_id, col)
+            )
+            for col in df.columns
+        }
+        return self._append(DatasetVersion(version_id, operation, df, tokens=tokens))
+
+    def apply(self, operation: Operation, execute: bool = False) -> str:
+        """
+        Records an operation as a new version, without executing it unless requested.
+
+        A deferred operation runs, together with any other pending operations, when the data of the version is
+        requested through `current` or `publish`. If it fails then, its version is discarded (see `_materialize`).
+
+        Args:
+            operation (Operation): The operation to record.
+            execute (bool): Whether to execute the operation before recording it, so that an operation that
+                fails is never added to the history. Defaults to False.
+
+        Returns:
+            str: The identifier of the new version.
+
+        Raises:
+            KeyError: If the operation refers to a column the current version does not have.
+            Exception: Any error raised by executing the operation; the history is then left unchanged.
+        """
+        if execute:
+            self._materialize(self._position)
+        plan = self._plan(self._position).then(operation)
+        version_id = self._new_id()
+        tokens = self._versions[self._position].tokens
+        if operation.kind in ("replace", "replace_batch"):
+            changed = operation.args[0] if operation.kind == "replace_batch" else operation.args[:1]
+            tokens = {**tokens, **{col: (version_id, col) for col in changed}}
+        else:
+            tokens = dict(LazyPlan.apply_to_layout(list(tokens.items()), operation))
+        frame = plan.collect() if execute else None
+        if frame is not None:
+            STATS_CACHE.track(frame, tokens)
+        return self._append(DatasetVersion(version_id, operation.describe(), frame, operation, tokens))
+
+    def reset(self) -> str:
+        """
+        Adds a version that restores the base snapshot. The reset itself can be undone.
+
+        Returns:
+            str: The identifier of the new version, which is the identifier of the base snapshot.
+        """
+        base = self._versions[0]
+        return self._append(DatasetVersion(base.version_id, "reset", base.frame, tokens=base.tokens))
+
+    def undo(self) -> bool:
+        """
+        Moves to the previous version.
+
+        Returns:
+            bool: True if a version was undone, False if the current version is the first one.
+        """
+        if not self.can_undo:
+            return False
+        self._position -= 1
+        return True
+
+    def redo(self) -> bool:
+        """
+        Moves to the next undone version.
+
+        Returns:
+            bool: True if a version was restored, False if there is nothing to redo.
+        """
+        if not self.can_redo:
+            return False
+        self._position += 1
+        return True
+
+    def publish(self, session_state) -> None:
+        """
+        Exposes the current version in the session state under "df" and its identifier under "df_version".
+
+        Pending operations are executed first, and the published data is tracked in the statistics cache.
+
+        Args:
+            session_state (dict): The session state to update.
+        """
+        self._published = self.current
+        STATS_CACHE.track(self._published, self.column_tokens)
+        session_state["df"] = self._published
+        session_state["df_version"] = self.version_id
+
+    @classmethod
+    def load(cls, session_state, df: pd.DataFrame, base_id: Optional[str] = None) -> "DatasetStore":
+        """
+        Creates a store for a newly loaded dataset and publishes it in the session state.
+
+        The memory report of a previously loaded dataset is removed; loaders that compact the dataset record the
+        report of the new one afterwards.
+
+        Args:
+            session_state (dict): The session state to store the dataset.
+            df (pd.DataFrame): The loaded or generated dataset.
+            base_id (str, optional): The version identifier of the dataset. Defaults to a new unique identifier.
+
+        Returns:
+            DatasetStore: The new store.
+        """
+        store = cls(df, base_id)
+        session_state.pop("memory_report", None)
+        session_state[cls.SESSION_KEY] = store
+        store.publish(session_state)
+        return store
+
+    @classmethod
+    def from_session(cls, session_state) -> Optional["DatasetStore"]:
+        """
+        Returns the store of the session.
+
+        A dataset placed in the session state under "df" without a store becomes the base snapshot of a new
+        store. If "df" was replaced without going through the store, the new data is committed as a new version,
+        so the store always describes the published data.
+
+        Args:
+            session_state (dict): The session state holding the store.
+
+        Returns:
+            Optional[DatasetStore]: The store, or None if there is no dataset in the session state.
+        """
+        if cls.SESSION_KEY not in session_state:
+            return cls.load(session_state, session_state["df"]) if "df" in session_state else None
+
+        store = session_state[cls.SESSION_KEY]
+        if "df" in session_state and session_state["df"] is not store._published:
+            store.commit(session_state["df"], "external change")
+            store.publish(session_state)
+        return store
+
+    @classmethod
+    def record(cls, session_state, operation: Operation, lazy: bool = False) -> str:
+        """
+        Records an operation as a new version of the session's dataset.
+
+        Args:
+            session_state (dict): The session state holding the store.
+            operation (Operation): The operation to record.
+            lazy (bool): Whether to defer executing the operation until the data is requested through
+                `current_frame`. Otherwise it is executed and published immediately. Defaults to False.
+
+        Returns:
+            str: The identifier of the new version.
+
+        Raises:
+            Exception: Any error raised by executing an operation that is not deferred; the dataset is then left
+                unchanged.
+        """
+        store = cls.from_session(session_state)
+        version_id = store.apply(operation, execute=not lazy)
+        if not lazy:
+            store.publish(session_state)
+        return version_id
+
+    @classmethod
+    def current_frame(cls, session_state) -> Optional[pd.DataFrame]:
+        """
+        Returns the current data of the session's dataset, executing pending operations first.
+
+        Components that display or export the data use this instead of reading "df" directly, so lazily recorded
+        operations run only when their result is actually needed.
+
+        Args:
+            session_state (dict): The session state holding the store.
+
+        Returns:
+            Optional[pd.DataFrame]: The current data, or None if there is no dataset in the session state.
+        """
+        store = cls.from_session(session_state)
+        if store is None:
+            return None
+        if store.pending or session_state.get("df_version") != store.version_id:
+            store.publish(session_state)
+        return session_state["df"]
+
+    @classmethod
+    def update(cls, session_state, df: pd.DataFrame, operation: str) -> str:
+        """
+        Commits the result of an operation as a new version of the session's dataset and publishes it.
+
+        Args:
+            session_state (dict): The session state holding the store.
+            df (pd.DataFrame): The data of the new version.
+            operation (str): A description of the operation that produced the data.
+
+        Returns:
+            str: The identifier of the new version.
+        """
+        store = cls.from_session(session_state)
+        if store is None:
+            return cls.load(session_state, df).version_id
+        version_id = store.commit(df, operation)
+        store.publish(session_state)
+        return version_id
+
+    def _materialize(self, position: int) -> pd.DataFrame:
+        """
+        Computes the data of a version from the closest computed version before it.
+
+        If a pending operation fails, its version and the versions recorded after it are discarded, the current
+        version falls back to the last version that could be computed, and the error is raised. The dataset is
+        therefore never left with an operation that fails every time its data is requested.
+
+        Args:
+            position (int): The position of the version in the history.
+
+        Returns:
+            pd.DataFrame: The data of the version.
+        """
+        version = self._versions[position]
+        if version.frame is None:
+            try:
+                version.frame = self._plan(position).collect()
+            except Exception:
+                self._discard_failed(position)
+                raise
+            STATS_CACHE.track(version.frame, version.tokens)
+        return version.frame
+
+    def _discard_failed(self, position: int) -> None:
+        """
+        Computes the pending versions up to a position one at a time, and discards the first one that fails with
+        every version after it.
+
+        Args:
+            position (int): The position of the version whose plan failed.
+        """
+        failed = self._last_materialized(position) + 1
+        while failed <= position:
+            version, parent = self._versions[failed], self._versions[failed - 1]
+            try:
+                version.frame = LazyPlan(parent.frame, [version.plan_operation]).collect()
+            except Exception:
+                break
+            STATS_CACHE.track(version.frame, version.tokens)
+            failed += 1
+        del self._versions[failed:]
+        self._position = min(self._position, failed - 1)
+
+    def _plan(self, position: int) -> LazyPlan:
+        """
+        Builds the plan of the pending operations that lead to a version.
+
+        Args:
+            position (int): The position of the version in the history.
+
+        Returns:
+            LazyPlan: The plan, starting from the closest computed version before the position.
+        """
+        start = self._last_materialized(position)
+        first, last = start + 1, position + 1
+        operations = [version.plan_operation for version in self._versions[first:last]]
+        return LazyPlan(self._versions[start].frame, operations)
+
+    def _last_materialized(self, position: int) -> int:
+        """
+        Finds the closest version at or before a position whose data has been computed.
+
+        Args:
+            position (int): The position of the version in the history.
+
+        Returns:
+            int: The position of the computed version.
+        """
+        while self._versions[position].frame is None:
+            position -= 1
+        return position
+
+    def _append(self, version: DatasetVersion) -> str:
+        """
+        Appends a version after the current one, discarding any undone versions.
+
+        Args:
+            version (DatasetVersion): The version to append.
+
+        Returns:
+            str: The identifier of the appended version.
+        """
+        position = self._position + 1
+        del self._versions[position:]
+        self._versions.append(version)
+        self._position = position
+        return version.version_id
+
+    @staticmethod
+    def _same_data(new: pd.Series, old: pd.Series) -> bool:
+        """
+        Checks whether two columns hold the very same data in memory, without comparing their values.
+
+        Args:
+            new (pd.Series): The column of the new version.
+            old (pd.Series): The column of the previous version.
+
+        Returns:
+            bool: True if both columns are views of the same buffer.
+        """
+        if new.dtype != old.dtype or len(new) != len(old):
+            return False
+        if not isinstance(new.dtype, np.dtype):
+            return new.array is old.array
+        new_values, old_values = new.to_numpy(), old.to_numpy()
+        return (
+            new_values.__array_interface__["data"][0] == old_values.__array_interface__["data"][0]
+            and new_values.strides == old_values.strides
+        )
+
+    @staticmethod
+    def _new_id() -> str:
+        """
+        Creates a new unique version identifier.
+
+        Returns:
+            str: The identifier.
+        """
+        return uuid.uuid4().hex[:16]
@@ -1,58 +1,283 @@
 """Module for data upload."""
 
+import os
+from typing import Callable, List, Optional
+
 import pandas as pd
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .cache import PARSE_CACHE, ParseCache
+from .compactor import DtypeCompactor
+from .store import DatasetStore
+
+COLUMNAR_FORMATS = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather"}
 
 
 class FileUploader:
     """Handles file upload and data initialization."""
 
-    def __init__(self, file_types=None, default_file=None) -> None:
+    def __init__(
+        self,
+        file_types=None,
+        default_file=None,
+        chunk_size: Optional[int] = None,
+        cache: Optional[ParseCache] = None,
+        compact: bool = False,
+    ) -> None:
         """
         Initializes the FileUploader with allowed file types and a default file.
 
         Args:
-            file_types (list, optional): List of allowed file types for upload. Defaults to ["csv", "xlsx"].
+            file_types (list, optional): List of allowed file types for upload.
+                Defaults to ["csv", "xlsx", "parquet", "feather", "arrow"].
             default_file (str, optional): Path to a default file to load if no file is uploaded. Defaults to None.
+            chunk_size (int, optional): Number of rows parsed per batch when reading CSV files. Defaults to None,
+                which parses the whole file in a single pass.
+            cache (ParseCache, optional): Cache of parsed files keyed by content. Defaults to the parse cache
+                shared by all sessions of the server.
+            compact (bool): Whether to convert loaded data to compact dtypes (see `DtypeCompactor`) and record
+                the memory saved in the session state under "memory_report". Defaults to False.
         """
-        self.file_types = file_types or ["csv", "xlsx"]
+        self.file_types = file_types or ["csv", "xlsx", "parquet", "feather", "arrow"]
         self.default_file = default_file
+        self.chunk_size = chunk_size
+        self.cache = cache if cache is not None else PARSE_CACHE
+        self.compact = compact
 
-    def is_new_file(self, file, session_state) -> bool:
+    def is_new_file(self, file, session_state, columns: Optional[List[str]] = None) -> bool:
         """
         Checks if the uploaded file is new.
 
+        A file is new if its content differs from the loaded file, regardless of its name.
+
         Args:
             file: The uploaded file.
             session_state (dict): The session state to track the uploaded file.
+            columns (List[str], optional): The columns requested for loading. A different projection of an
+                already loaded file counts as new. Defaults to None (all columns).
 
         Returns:
             bool: True if the file is new, False otherwise.
         """
-        return session_state.get("uploaded_file_name") != file.name
+        if "uploaded_file_hash" not in session_state or session_state.get("uploaded_columns") != columns:
+            return True
+        return session_state["uploaded_file_hash"] != self.cache.fingerprint(file)
+
+    def get_columns(self, source, name: Optional[str] = None) -> List[str]:
+        """
+        Reads only the column names of a file, without parsing its data.
+
+        For Parquet and Feather/Arrow files only the schema is read. File objects are rewound afterwards.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+            name (str, optional): The file name used to determine the format. Defaults to the name of `source`.
+
+        Returns:
+            List[str]: The column names of the file.
+        """
+        name = name or (source if isinstance(source, str) else source.name)
+        file_format = self._file_format(name)
+
+        if file_format == "parquet":
+            schema = pq.ParquetFile(source).schema_arrow
+            index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+            columns = [col for col in schema.names if col not in index_columns]
+        elif file_format == "feather":
+            columns = ipc.open_file(source).schema.names
+        elif file_format == "csv":
+            columns = pd.read_csv(source, nrows=0).columns.tolist()
+        else:
+            columns = pd.read_excel(source, nrows=0).columns.tolist()
+
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return columns
 
-    def process_upload(self, file, session_state) -> None:
+    def process_upload(
+        self,
+        file,
+        session_state,
+        columns: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> None:
         """
         Processes the uploaded file and initializes the dataset in the session state.
 
         Args:
             file: The uploaded file.
             session_state (dict): The session state to store the dataset.
+            columns (List[str], optional): Columns to load. For Parquet and Feather/Arrow files only these
+                columns are read from disk. Defaults to None (all columns).
+            progress_callback (Callable[[float], None], optional): Called with the fraction of the file parsed so
+                far (between 0 and 1). Defaults to None.
         """
-        df = pd.read_csv(file) if file.name.endswith(".csv") else pd.read_excel(file)
-        session_state["original_df"] = df.copy()
-        session_state["df"] = df.copy()
+        digest = self.cache.fingerprint(file)
+        self._load(digest, file, file.name, session_state, columns, progress_callback)
         session_state["uploaded_file_name"] = file.name
+        session_state["uploaded_file_hash"] = digest
+        session_state["uploaded_columns"] = columns
 
-    def load_default_file(self, session_state) -> None:
+    def load_default_file(self, session_state, columns: Optional[List[str]] = None) -> None:
         """
         Loads the default file and initializes the dataset in the session state.
 
+        The parsed file is shared through the parse cache, so it is parsed once per server rather than per session.
+
         Args:
             session_state (dict): The session state to store the dataset.
+            columns (List[str], optional): Columns to load. Defaults to None (all columns).
         """
         if not self.default_file:
             raise ValueError("No default file specified.")
-        loader = pd.read_csv if self.default_file.endswith(".csv") else pd.read_excel
-        df = loader(self.default_file)
-        session_state["original_df"] = df.copy()
-        session_state["df"] = df.copy()
+        digest = self.cache.fingerprint(self.default_file)
+        self._load(digest, self.default_file, self.default_file, session_state, columns)
+
+    def _load(
+        self,
+        digest: str,
+        source,
+        name: str,
+        session_state,
+        columns: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        """
+        Loads a file into a new dataset store in the session state.
+
+        The parsed file is taken from the parse cache, and parsed (and compacted) and cached on a miss. The
+        store is not given a copy: its base snapshot is the cached DataFrame itself.
+
+        Args:
+            digest (str): The content fingerprint of the file.
+            source: The uploaded file object or a path to the file.
+            name (str): The file name used to determine the format.
+            session_state (dict): The session state to store the dataset.
+            columns (List[str], optional): Columns to load. Defaults to None (all columns).
+            progress_callback (Callable[[float], None], optional): Receives the parse progress. Defaults to None.
+        """
+        key = (digest, self._file_format(name), tuple(columns) if columns else None, self.compact)
+        df = self.cache.get(key)
+        if df is None:
+            df = self._read(source, name, columns, progress_callback)
+            metadata = {}
+            if self.compact:
+                before = DtypeCompactor.memory_usage(df)
+                df = DtypeCompactor.compact(df)
+                metadata["memory_report"] = {"before": before, "after": DtypeCompactor.memory_usage(df)}
+            self.cache.put(key, df, metadata)
+        elif progress_callback:
+            progress_callback(1.0)
+
+        DatasetStore.load(session_state, df, base_id=self.cache.key_id(key))
+        memory_report = self.cache.metadata(key).get("memory_report")
+        if memory_report:
+            session_state["memory_report"] = memory_report
+
+    def _read(
+        self,
+        source,
+        name: str,
+        columns: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Parses a file or path into a DataFrame based on its extension.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+            name (str): The file name used to determine the format.
+            columns (List[str], optional): Columns to load. Defaults to None (all columns).
+            progress_callback (Callable[[float], None], optional): Receives the parse progress. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The parsed DataFrame.
+        """
+        file_format = self._file_format(name)
+
+        if file_format == "parquet":
+            df = pd.read_parquet(source, columns=columns)
+        elif file_format == "feather":
+            df = pd.read_feather(source, columns=columns)
+        elif file_format != "csv":
+            df = pd.read_excel(source, usecols=columns)
+        elif self.chunk_size:
+            df = self._read_csv_chunked(source, columns, progress_callback)
+        else:
+            df = pd.read_csv(source, usecols=columns)
+
+        if progress_callback:
+            progress_callback(1.0)
+        return df
+
+    def _read_csv_chunked(
+        self,
+        source,
+        columns: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Parses a CSV file in batches of `chunk_size` rows and concatenates them once at the end.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+            columns (List[str], optional): Columns to load. Defaults to None (all columns).
+            progress_callback (Callable[[float], None], optional): Receives the parse progress. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The parsed DataFrame.
+        """
+        total = self._source_size(source)
+        chunks = []
+
+        with pd.read_csv(source, usecols=columns, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                chunks.append(chunk)
+                if progress_callback and total and hasattr(source, "tell"):
+                    progress_callback(min(source.tell() / total, 1.0))
+
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True, copy=False)
+
+    @staticmethod
+    def _file_format(name: str) -> str:
+        """
+        Determines the reader to use for a file name.
+
+        Args:
+            name (str): The file name.
+
+        Returns:
+            str: "csv", "parquet", "feather", or "excel" for any other extension.
+        """
+        extension = os.path.splitext(name)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        return COLUMNAR_FORMATS.get(extension, "excel")
+
+    @staticmethod
+    def _source_size(source) -> Optional[int]:
+        """
+        Determines the size of a file object or path in bytes.
+
+        Args:
+            source: The uploaded file object or a path to the file.
+
+        Returns:
+            Optional[int]: The size in bytes, or None if it cannot be determined.
+        """
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        size = getattr(source, "size", None)
+        if size is not None:
+            return size
+        try:
+            position = source.tell()
+            source.seek(0, os.SEEK_END)
+            size = source.tell()
+            source.seek(position)
+        except (AttributeError, OSError):
+            return None
+        return size
@@ -1,4 +1,4 @@
 """
 This module handles data manipulation.
-Contains the following submodules: columns.py, replace.py
+Contains the following submodules: columns.py, plan.py, replace.py, sketch.py
 """
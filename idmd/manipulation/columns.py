@@ -13,20 +13,20 @@ class ColumnManipulatorLogic:
         """
         Swap two columns in the DataFrame.
 
+        The columns exchange their positions, which only changes the column labels: no data is copied.
+
         Args:
             df (pd.DataFrame): The DataFrame to modify.
             col1 (str): The first column to swap.
             col2 (str): The second column to swap.
 
         Returns:
-            pd.DataFrame: The modified DataFrame with swapped columns.
+            pd.DataFrame: The modified DataFrame with swapped columns. It shares all data with `df`.
         """
-        df = df.copy()
         col_order = df.columns.tolist()
         idx1, idx2 = col_order.index(col1), col_order.index(col2)
         col_order[idx1], col_order[idx2] = col_order[idx2], col_order[idx1]
-        df[col1], df[col2] = df[col2], df[col1]
-        return df[col_order]
+        return df.set_axis(col_order, axis=1)
 
     @staticmethod
     def drop_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
@@ -38,7 +38,8 @@ class ColumnManipulatorLogic:
             column (str): The column to drop.
 
         Returns:
-            pd.DataFrame: The modified DataFrame without the dropped column.
+            pd.DataFrame: The modified DataFrame without the dropped column. With copy-on-write, it shares the
+                data of the remaining columns with `df`.
         """
         return df.drop(columns=[column])
 
@@ -52,6 +53,7 @@ class ColumnManipulatorLogic:
             columns (List[str]): The list of columns to keep.
 
         Returns:
-            pd.DataFrame: The modified DataFrame with only the selected columns.
+            pd.DataFrame: The modified DataFrame with only the selected columns. With copy-on-write, it shares
+                their data with `df`, and modifying it later copies only the modified columns.
         """
         return df[columns]
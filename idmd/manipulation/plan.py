@@ -0,0 +1,277 @@
+"""Module for lazy operation plans."""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import pandas as pd
+
+from ..data.stats import STATS_CACHE
+from .replace import ReplaceLogic
+
+
+class Operation(NamedTuple):
+    """A column or value replacement operation recorded for later execution."""
+
+    kind: str
+    args: Tuple
+
+    @classmethod
+    def swap(cls, col1: str, col2: str) -> "Operation":
+        """
+        Records swapping two columns (see `ColumnManipulatorLogic.swap_columns`).
+
+        Args:
+            col1 (str): The first column to swap.
+            col2 (str): The second column to swap.
+
+        Returns:
+            Operation: The recorded operation.
+        """
+        return cls("swap", (col1, col2))
+
+    @classmethod
+    def drop(cls, column: str) -> "Operation":
+        """
+        Records dropping a column.
+
+        Args:
+            column (str): The column to drop.
+
+        Returns:
+            Operation: The recorded operation.
+        """
+        return cls("drop", (column,))
+
+    @classmethod
+    def select(cls, columns: Sequence[str]) -> "Operation":
+        """
+        Records selecting the columns to keep.
+
+        Args:
+            columns (Sequence[str]): The columns to keep, in their new order.
+
+        Returns:
+            Operation: The recorded operation.
+        """
+        return cls("select", (tuple(columns),))
+
+    @classmethod
+    def replace(
+        cls,
+        column: str,
+        values_to_replace: str,
+        replacement_method: str,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> "Operation":
+        """
+        Records replacing values in a column (see `ReplaceLogic.replace_values`).
+
+        Args:
+            column (str): The column to modify.
+            values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
+            replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            approximate (bool): Whether to detect outliers from approximate quartiles. Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles. Defaults to 0.01.
+
+        Returns:
+            Operation: The recorded operation.
+        """
+        return cls("replace", (column, values_to_replace, replacement_method, approximate, error))
+
+    @classmethod
+    def replace_batch(
+        cls,
+        columns: Sequence[str],
+        values_to_replace: str,
+        replacement_method: str,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> "Operation":
+        """
+        Records replacing values in several columns (see `ReplaceLogic.replace_values_batch`).
+
+        Args:
+            columns (Sequence[str]): The columns to modify.
+            values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
+            replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            approximate (bool): Whether to detect outliers from approximate quartiles. Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles. Defaults to 0.01.
+
+        Returns:
+            Operation: The recorded operation.
+        """
+        return cls("replace_batch", (tuple(columns), values_to_replace, replacement_method, approximate, error))
+
+    def describe(self) -> str:
+        """
+        Returns a short human-readable description of the operation.
+
+        Returns:
+            str: The description.
+        """
+        if self.kind == "swap":
+            return f"swap {self.args[0]} ↔ {self.args[1]}"
+        if self.kind == "drop":
+            return f"drop {self.args[0]}"
+        if self.kind == "select":
+            return f"select {len(self.args[0])} columns"
+        column, values_to_replace, replacement_method, approximate, error = self.args
+        if self.kind == "replace_batch":
+            column = f"{len(column)} columns"
+        description = f"replace {values_to_replace} in {column} with {replacement_method}"
+        if approximate and values_to_replace == "outliers":
+            return f"{description} (approximate, error {error:g})"
+        return description
+
+
+class LazyPlan:
+    """
+    Records operations on a DataFrame and executes them only when the result is needed.
+
+    Before execution the plan is optimized:
+
+    - Column selections, drops and swaps only change which source columns end up where, so they are resolved
+      first into a single projection. Replacements on columns that are dropped later are never executed.
+    - Replacements are applied in order per column, and the same replacement on several columns runs as one
+      batched pass over all of them (see `ReplaceLogic.replace_values_batch`).
+    """
+
+    def __init__(self, source: pd.DataFrame, operations: Sequence[Operation] = ()) -> None:
+        """
+        Initializes the plan.
+
+        Args:
+            source (pd.DataFrame): The DataFrame the operations apply to. It is never modified.
+            operations (Sequence[Operation]): Operations to record. Defaults to none.
+        """
+        self.source = source
+        self.operations: List[Operation] = []
+        self._layout: List[Tuple[str, str]] = [(col, col) for col in source.columns]
+        for operation in operations:
+            self.then(operation)
+
+    @property
+    def columns(self) -> List[str]:
+        """List[str]: The columns of the result, known without executing the plan."""
+        return [label for label, _ in self._layout]
+
+    def then(self, operation: Operation) -> "LazyPlan":
+        """
+        Records an operation.
+
+        Args:
+            operation (Operation): The operation to record.
+
+        Returns:
+            LazyPlan: The plan itself, allowing method chaining.
+
+        Raises:
+            KeyError: If the operation refers to a column that the result would not have at that point.
+        """
+        labels = self.columns
+        if operation.kind in ("select", "replace_batch"):
+            referenced = operation.args[0]
+        elif operation.kind == "swap":
+            referenced = operation.args
+        else:
+            referenced = operation.args[:1]
+        missing = [col for col in referenced if col not in labels]
+        if missing:
+            raise KeyError(f"{missing} not found in columns")
+
+        self._layout = self.apply_to_layout(self._layout, operation)
+        self.operations.append(operation)
+        return self
+
+    def optimize(self) -> Tuple[List[Tuple[str, str]], Dict[str, List[Tuple[str, str, bool, float]]]]:
+        """
+        Resolves the recorded operations into a projection and fused replacements.
+
+        Returns:
+            Tuple[List[Tuple[str, str]], Dict[str, List[Tuple[str, str, bool, float]]]]: The projection as
+                (result column, source column) pairs in result order, and for every source column that is kept, the
+                (values_to_replace, replacement_method, approximate, error) steps to apply to it, in order.
+        """
+        layout = [(col, col) for col in self.source.columns]
+        replacements: Dict[str, List[Tuple[str, str, bool, float]]] = {}
+
+        for operation in self.operations:
+            if operation.kind in ("replace", "replace_batch"):
+                columns, step = operation.args[0], operation.args[1:]
+                if operation.kind == "replace":
+                    columns = (columns,)
+                sources = dict(layout)
+                for column in columns:
+                    replacements.setdefault(sources[column], []).append(step)
+            else:
+                layout = self.apply_to_layout(layout, operation)
+
+        kept = {source_col for _, source_col in layout}
+        return layout, {col: steps for col, steps in replacements.items() if col in kept}
+
+    def explain(self) -> List[str]:
+        """
+        Describes the optimized execution steps.
+
+        Returns:
+            List[str]: One line per step.
+        """
+        layout, replacements = self.optimize()
+        steps = [f"project {len(layout)} of {len(self.source.columns)} columns"]
+        labels = {source_col: label for label, source_col in layout}
+        for source_col, column_steps in replacements.items():
+            fused = ", ".join(f"{values} → {method}" for values, method, _, _ in column_steps)
+            steps.append(f"replace in {labels[source_col]}: {fused}")
+        return steps
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Executes the optimized plan.
+
+        Returns:
+            pd.DataFrame: The result. Columns without replacements share their data with the source.
+        """
+        layout, replacements = self.optimize()
+        result = self.source[[source_col for _, source_col in layout]]
+        result = result.set_axis([label for label, _ in layout], axis=1)
+        source_tokens = STATS_CACHE.tokens(self.source)
+        if source_tokens is not None:
+            STATS_CACHE.track(result, {label: source_tokens.get(source_col) for label, source_col in layout})
+
+        # Replacements run in rounds: round k applies the k-th replacement of every column, batching all columns
+        # that share the same replacement into one vectorized call.
+        steps = {label: replacements[source_col] for label, source_col in layout if source_col in replacements}
+        for k in range(max(map(len, steps.values()), default=0)):
+            batches: Dict[Tuple[str, str, bool, float], List[str]] = {}
+            for label, column_steps in steps.items():
+                if k < len(column_steps):
+                    batches.setdefault(column_steps[k], []).append(label)
+            for (values_to_replace, replacement_method, approximate, error), labels in batches.items():
+                result = ReplaceLogic.replace_values_batch(
+                    result, labels, values_to_replace, replacement_method, approximate=approximate, error=error
+                )
+
+        return result
+
+    @staticmethod
+    def apply_to_layout(layout: List[Tuple[str, str]], operation: Operation) -> List[Tuple[str, str]]:
+        """
+        Applies a column operation to a projection.
+
+        Args:
+            layout (List[Tuple[str, str]]): (result column, source column) pairs in result order.
+            operation (Operation): The operation to apply. Replacements do not change the projection.
+
+        Returns:
+            List[Tuple[str, str]]: The new projection.
+        """
+        if operation.kind == "swap":
+            col1, col2 = operation.args
+            renamed = {col1: col2, col2: col1}
+            return [(renamed.get(label, label), source_col) for label, source_col in layout]
+        if operation.kind == "drop":
+            return [(label, source_col) for label, source_col in layout if label != operation.args[0]]
+        if operation.kind == "select":
+            sources = dict(layout)
+            return [(label, sources[label]) for label in operation.args[0]]
+        return layout
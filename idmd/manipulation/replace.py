@@ -1,13 +1,27 @@
 """Module for value replacement."""
 
+import warnings
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 
+from ..data.stats import STATS_CACHE
+from .sketch import QuantileSketch
+
 
 class ReplaceLogic:
     """Handles the logic for replacing values in a DataFrame."""
 
     @staticmethod
-    def replace_values(df: pd.DataFrame, column: str, values_to_replace: str, replacement_method: str) -> pd.DataFrame:
+    def replace_values(
+        df: pd.DataFrame,
+        column: str,
+        values_to_replace: str,
+        replacement_method: str,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> pd.DataFrame:
         """
         Replaces values in a specified column of the DataFrame.
 
@@ -16,11 +30,115 @@ class ReplaceLogic:
             column (str): The column to modify.
             values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
             replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            approximate (bool): Whether to detect outliers from approximate quartiles (see `QuantileSketch`),
+                which avoids sorting very large columns. Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles, as a fraction of the number of
+                values. Defaults to 0.01.
+
+        Returns:
+            pd.DataFrame: The modified DataFrame. The input DataFrame is left unchanged, and the returned one
+                shares the data of all other columns with it.
+        """
+        df = df.copy(deep=False)
+        df[column] = ReplaceLogic.replace_in_series(
+            df[column], values_to_replace, replacement_method, approximate, error
+        )
+        return df
+
+    @staticmethod
+    def replace_values_batch(
+        df: pd.DataFrame,
+        columns: List[str],
+        values_to_replace: str,
+        replacement_method: str,
+        rng: Optional[np.random.Generator] = None,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> pd.DataFrame:
+        """
+        Replaces values in several columns of the DataFrame at once.
+
+        The numeric columns are taken as a single 2D block, and the values to replace and the replacement
+        statistics (quartiles, median, min, max) of all of them are computed in one vectorized pass. Where the
+        statistics cache already holds the summary statistics of all of them, the cached exact quartiles, medians,
+        minima and maxima are used instead; they are never computed for this purpose, and approximate outlier
+        detection always uses a sketch. Other columns are handled one by one as in `replace_values`.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to modify.
+            columns (List[str]): The columns to modify.
+            values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
+            replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            rng (np.random.Generator, optional): The random generator for the "random" method. Defaults to a new
+                unseeded generator.
+            approximate (bool): Whether to detect outliers from approximate quartiles (see `QuantileSketch`).
+                Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles, as a fraction of the number of
+                values. Defaults to 0.01.
 
         Returns:
-            pd.DataFrame: The modified DataFrame.
+            pd.DataFrame: The modified DataFrame. The input DataFrame is left unchanged, and the returned one
+                shares the data of all columns without replaced values with it.
         """
-        col_data = df[column]
+        numeric = [
+            col for col in columns if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+        ]
+        updated = {}
+
+        if numeric:
+            block = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+            sketched = approximate and values_to_replace == "outliers"
+            stats = None if sketched else STATS_CACHE.cached_describe(df, numeric)
+            mask = ReplaceLogic._replace_mask(block, values_to_replace, stats, approximate, error)
+            if replacement_method == "np.nan" and values_to_replace in ("np.nan", "all"):
+                mask[:] = False
+            if values_to_replace not in ("np.nan", "all"):
+                stats = None
+            fill = ReplaceLogic._replacement_values(block, mask, replacement_method, rng, stats)
+            for j in np.flatnonzero(mask.any(axis=0)):
+                col_data = df[numeric[j]]
+                col_data = col_data.mask(mask[:, j]) if fill is None else col_data.mask(mask[:, j], fill[j])
+                updated[numeric[j]] = col_data.astype(df[numeric[j]].dtype, errors="ignore")
+
+        for col in columns:
+            if col not in numeric:
+                updated[col] = ReplaceLogic.replace_in_series(
+                    df[col], values_to_replace, replacement_method, approximate, error
+                )
+
+        if not updated:
+            return df
+        df = df.copy(deep=False)
+        for col, col_data in updated.items():
+            df[col] = col_data
+        return df
+
+    @staticmethod
+    def replace_in_series(
+        col_data: pd.Series,
+        values_to_replace: str,
+        replacement_method: str,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> pd.Series:
+        """
+        Replaces values in a single column.
+
+        Args:
+            col_data (pd.Series): The column to modify.
+            values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
+            replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            approximate (bool): Whether to detect outliers from approximate quartiles (see `QuantileSketch`).
+                Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles, as a fraction of the number of
+                values. Defaults to 0.01.
+
+        Returns:
+            pd.Series: The modified column, cast back to the original dtype where possible. As in
+                `replace_values_batch`, missing values are NaN for NumPy dtypes (integer columns become float64)
+                and NA for nullable dtypes, and are never outliers.
+        """
+        dtype = col_data.dtype
 
         if values_to_replace == "0":
             if replacement_method == "median":
@@ -32,7 +150,8 @@ class ReplaceLogic:
             elif replacement_method == "random":
                 col_data = col_data.replace(0, col_data[col_data != 0].sample(n=1).values[0])
             elif replacement_method == "np.nan":
-                col_data = col_data.replace(0, pd.NA)
+                # Masking keeps the missing value of the dtype (NaN, or NA for nullable dtypes), as in the batch path.
+                col_data = col_data.mask(col_data == 0)
 
         elif values_to_replace == "np.nan":
             if replacement_method == "median":
@@ -45,23 +164,28 @@ class ReplaceLogic:
                 col_data = col_data.fillna(col_data.dropna().sample(n=1).values[0])
 
         elif values_to_replace == "outliers":
-            q1 = col_data.quantile(0.25)
-            q3 = col_data.quantile(0.75)
+            if approximate:
+                values = col_data.to_numpy(np.float64, na_value=np.nan)
+                q1, q3 = ReplaceLogic._approximate_quartiles(values, error)
+            else:
+                q1 = col_data.quantile(0.25)
+                q3 = col_data.quantile(0.75)
             iqr = q3 - q1
             lower = q1 - 1.5 * iqr
             upper = q3 + 1.5 * iqr
-            outliers_mask = (col_data < lower) | (col_data > upper)
+            # Missing values of nullable dtypes compare as NA; they are not outliers.
+            outliers_mask = ((col_data < lower) | (col_data > upper)).fillna(False).astype(bool)
 
             if replacement_method == "median":
-                col_data[outliers_mask] = col_data[~outliers_mask].median()
+                col_data = col_data.mask(outliers_mask, col_data[~outliers_mask].median())
             elif replacement_method == "min":
-                col_data[outliers_mask] = col_data[~outliers_mask].min()
+                col_data = col_data.mask(outliers_mask, col_data[~outliers_mask].min())
             elif replacement_method == "max":
-                col_data[outliers_mask] = col_data[~outliers_mask].max()
+                col_data = col_data.mask(outliers_mask, col_data[~outliers_mask].max())
             elif replacement_method == "random":
-                col_data[outliers_mask] = col_data[~outliers_mask].sample(n=1).values[0]
+                col_data = col_data.mask(outliers_mask, col_data[~outliers_mask].sample(n=1).values[0])
             elif replacement_method == "np.nan":
-                col_data[outliers_mask] = pd.NA
+                col_data = col_data.mask(outliers_mask)
 
         elif values_to_replace == "all":
             if replacement_method == "median":
@@ -75,5 +199,106 @@ class ReplaceLogic:
             elif replacement_method == "np.nan":
                 col_data = col_data.fillna(pd.NA)
 
-        df[column] = col_data.astype(df[column].dtype, errors="ignore")
-        return df
+        return col_data.astype(dtype, errors="ignore")
+
+    @staticmethod
+    def _replace_mask(
+        block: np.ndarray,
+        values_to_replace: str,
+        stats: Optional[pd.DataFrame] = None,
+        approximate: bool = False,
+        error: float = 0.01,
+    ) -> np.ndarray:
+        """
+        Finds the values to replace in a 2D block of numeric columns.
+
+        Args:
+            block (np.ndarray): The columns as a float64 array of shape (rows, columns), with NaN for missing values.
+            values_to_replace (str): The type of values to replace ("0", "np.nan", "outliers", "all").
+            stats (pd.DataFrame, optional): The `describe` statistics of the columns, to take the quartiles from.
+                Defaults to None, which computes them.
+            approximate (bool): Whether to compute approximate quartiles with a `QuantileSketch` per column
+                instead of exact ones, unless `stats` are given. Defaults to False.
+            error (float): The targeted rank error of the approximate quartiles. Defaults to 0.01.
+
+        Returns:
+            np.ndarray: A boolean array of the same shape, True where a value is to be replaced.
+        """
+        if values_to_replace == "0":
+            return block == 0
+        if values_to_replace == "outliers":
+            if stats is not None:
+                q1, q3 = stats.loc[["25%", "75%"]].to_numpy(dtype=np.float64)
+            elif approximate:
+                q1, q3 = np.array([ReplaceLogic._approximate_quartiles(values, error) for values in block.T]).T
+            else:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    q1, q3 = np.nanpercentile(block, [25, 75], axis=0)
+            iqr = q3 - q1
+            with np.errstate(invalid="ignore"):
+                return (block < q1 - 1.5 * iqr) | (block > q3 + 1.5 * iqr)
+        return np.isnan(block)
+
+    @staticmethod
+    def _approximate_quartiles(values: np.ndarray, error: float = 0.01) -> np.ndarray:
+        """
+        Computes approximate quartiles of a column with a `QuantileSketch`.
+
+        The sketch is seeded, so replacing the same data gives the same result every time.
+
+        Args:
+            values (np.ndarray): The values of the column, with NaN for missing values.
+            error (float): The targeted rank error, as a fraction of the number of values. Defaults to 0.01.
+
+        Returns:
+            np.ndarray: The first and third quartiles.
+        """
+        return QuantileSketch.from_array(values, error, seed=0).quantile([0.25, 0.75])
+
+    @staticmethod
+    def _replacement_values(
+        block: np.ndarray,
+        mask: np.ndarray,
+        replacement_method: str,
+        rng: Optional[np.random.Generator] = None,
+        stats: Optional[pd.DataFrame] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Computes the replacement value of every column of a 2D block from the values that are kept.
+
+        Args:
+            block (np.ndarray): The columns as a float64 array of shape (rows, columns), with NaN for missing values.
+            mask (np.ndarray): A boolean array of the same shape, True where a value is to be replaced.
+            replacement_method (str): The method to replace values ("median", "min", "max", "random", "np.nan").
+            rng (np.random.Generator, optional): The random generator for the "random" method. Defaults to a new
+                unseeded generator.
+            stats (pd.DataFrame, optional): The `describe` statistics of the kept values of the columns, to take
+                the median, min and max from. Defaults to None, which computes them.
+
+        Returns:
+            Optional[np.ndarray]: One replacement value per column (NaN for columns without kept values), or
+                None if the values are to be replaced with missing values.
+        """
+        if replacement_method == "np.nan":
+            return None
+        if stats is not None and replacement_method in ("median", "min", "max"):
+            return stats.loc["50%" if replacement_method == "median" else replacement_method].to_numpy(np.float64)
+
+        kept = np.where(mask, np.nan, block)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            if replacement_method == "median":
+                return np.nanmedian(kept, axis=0)
+            if replacement_method == "min":
+                return np.nanmin(kept, axis=0)
+            if replacement_method == "max":
+                return np.nanmax(kept, axis=0)
+
+        # "random": pick the k-th kept value of every column, with k drawn uniformly per column
+        valid = ~np.isnan(kept)
+        counts = valid.sum(axis=0)
+        rng = rng or np.random.default_rng()
+        picks = np.floor(rng.random(block.shape[1]) * counts)
+        rows = np.argmax(valid & (np.cumsum(valid, axis=0) == picks + 1), axis=0)
+        return np.where(counts > 0, kept[rows, np.arange(block.shape[1])], np.nan)
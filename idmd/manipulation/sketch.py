@@ -0,0 +1,298 @@
+"""Module for approximate quantiles and frequent values."""
+
+import math
+from typing import Hashable, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Mergeable sketch of a stream of numbers that answers quantile queries approximately (KLL-style).
+
+    The sketch keeps a stack of sorted levels. Each value at level `l` stands for `2 ** l` values of the input.
+    When a level grows beyond its capacity, it is compacted: every other value, starting at a random offset, is
+    promoted to the next level and the rest are discarded. The memory used therefore grows only logarithmically
+    with the number of values, sketches of separate chunks can be merged, and the rank of a value returned for a
+    quantile `q` is typically within `error` of `q`. Until the first compaction, the results are exact.
+    """
+
+    def __init__(self, error: float = 0.01, seed: Optional[int] = None) -> None:
+        """
+        Initializes an empty sketch.
+
+        Args:
+            error (float): The targeted rank error, as a fraction of the number of values. Smaller errors need
+                more memory. Defaults to 0.01.
+            seed (int, optional): Seed of the random compaction offsets, for reproducible results. Defaults to None.
+
+        Raises:
+            ValueError: If `error` is not between 0 and 1.
+        """
+        if not 0 < error < 1:
+            raise ValueError("The error must be between 0 and 1.")
+        self.error = error
+        self.capacity = 2 * math.ceil(2 / error)
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: Union[np.ndarray, Iterable[float]]) -> "QuantileSketch":
+        """
+        Adds values to the sketch. Missing values (NaN) are ignored.
+
+        Args:
+            values (Union[np.ndarray, Iterable[float]]): The values to add.
+
+        Returns:
+            QuantileSketch: The sketch itself, allowing method chaining.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Adds all values summarized by another sketch, e.g. of another chunk of the same column.
+
+        Args:
+            other (QuantileSketch): The sketch to merge. It is left unchanged.
+
+        Returns:
+            QuantileSketch: The sketch itself, allowing method chaining.
+
+        Raises:
+            ValueError: If the sketches were created with different errors.
+        """
+        if other.capacity != self.capacity:
+            raise ValueError("Only sketches with the same error can be merged.")
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compact()
+        return self
+
+    def quantile(self, q: Union[float, Iterable[float]]) -> Union[float, np.ndarray]:
+        """
+        Returns approximate quantiles of the values added so far.
+
+        Args:
+            q (Union[float, Iterable[float]]): The quantile or quantiles to compute, between 0 and 1.
+
+        Returns:
+            Union[float, np.ndarray]: The quantiles, NaN if the sketch is empty.
+        """
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+        if self.count == 0:
+            result = np.full(q.shape, np.nan)
+        elif len(self.levels) == 1:
+            result = np.quantile(self.levels[0], q)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 2**i) for i, level in enumerate(self.levels)])
+            order = np.argsort(items, kind="stable")
+            ranks = np.cumsum(weights[order])
+            positions = np.searchsorted(ranks, q * ranks[-1], side="left")
+            result = items[order][np.minimum(positions, len(items) - 1)]
+
+        return float(result[0]) if scalar else result
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[Union[np.ndarray, Iterable[float]]], error: float = 0.01, seed: Optional[int] = None
+    ) -> "QuantileSketch":
+        """
+        Builds a sketch from chunks of values, e.g. a column read in batches, without holding them all in memory.
+
+        Args:
+            chunks (Iterable[Union[np.ndarray, Iterable[float]]]): The chunks of values.
+            error (float): The targeted rank error. Defaults to 0.01.
+            seed (int, optional): Seed of the random compaction offsets. Defaults to None.
+
+        Returns:
+            QuantileSketch: The sketch of all values.
+        """
+        sketch = cls(error, seed)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch
+
+    @classmethod
+    def from_array(
+        cls, values: np.ndarray, error: float = 0.01, seed: Optional[int] = None, chunk_size: int = 1 << 20
+    ) -> "QuantileSketch":
+        """
+        Builds a sketch of an array, adding it in chunks so that only one chunk at a time is sorted.
+
+        Args:
+            values (np.ndarray): The values.
+            error (float): The targeted rank error. Defaults to 0.01.
+            seed (int, optional): Seed of the random compaction offsets. Defaults to None.
+            chunk_size (int): The number of values added at once. Defaults to 1048576.
+
+        Returns:
+            QuantileSketch: The sketch of all values.
+        """
+        values = np.asarray(values).ravel()
+        return cls.from_chunks(np.array_split(values, max(1, math.ceil(len(values) / chunk_size))), error, seed)
+
+    def _compact(self) -> None:
+        """Compacts every level that exceeds the capacity, promoting half of its values to the next level."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # An odd value out stays at its level so that the total weight is preserved.
+                kept = items[-1:] if len(items) % 2 else items[:0]
+                offset, pairs = int(self._rng.integers(2)), len(items) - len(kept)
+                promoted = items[offset:pairs:2]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+
+class HeavyHitters:
+    """
+    Mergeable summary of the most frequent values of a stream (Space-Saving).
+
+    At most `capacity` values are monitored, each with an estimated count that is never below its true count. Each
+    chunk of input is counted exactly and then merged into the summary, keeping the values with the largest counts.
+    `floor` bounds the count of every value that is not monitored, and every estimate exceeds the true count by at
+    most `floor`, which is itself at most about `count / capacity`. As long as no more than `capacity` distinct
+    values were seen, `floor` is 0 and all counts are exact.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        """
+        Initializes an empty summary.
+
+        Args:
+            capacity (int): The maximum number of monitored values. More values give tighter estimates. Defaults
+                to 1000.
+
+        Raises:
+            ValueError: If `capacity` is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("The capacity must be positive.")
+        self.capacity = capacity
+        self.count = 0
+        self.floor = 0
+        self.counts = pd.Series(dtype=np.int64)
+
+    @property
+    def exact(self) -> bool:
+        """Whether the counts are exact, i.e. no value has been dropped from the summary yet."""
+        return self.floor == 0
+
+    def update(self, values: Union[pd.Series, np.ndarray, Iterable[Hashable]]) -> "HeavyHitters":
+        """
+        Adds values to the summary. Missing values are ignored.
+
+        Args:
+            values (Union[pd.Series, np.ndarray, Iterable[Hashable]]): The values to add.
+
+        Returns:
+            HeavyHitters: The summary itself, allowing method chaining.
+        """
+        counts = (values if isinstance(values, pd.Series) else pd.Series(values)).value_counts(sort=False)
+        counts = counts[counts > 0].astype(np.int64)
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(counts.index.categories.dtype)
+        self.count += int(counts.sum())
+        floor = 0
+        if len(counts) > self.capacity:
+            # The values dropped here occur at most as often as the largest of them.
+            counts = counts.nlargest(self.capacity + 1, keep="first")
+            floor, counts = int(counts.iloc[-1]), counts.iloc[:-1]
+        self._combine(counts, floor)
+        return self
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        """
+        Adds all values summarized by another summary, e.g. of another chunk of the same column.
+
+        Args:
+            other (HeavyHitters): The summary to merge. It is left unchanged.
+
+        Returns:
+            HeavyHitters: The summary itself, allowing method chaining.
+        """
+        self.count += other.count
+        self._combine(other.counts, other.floor)
+        return self
+
+    def top(self, k: int) -> pd.Series:
+        """
+        Returns the most frequent values.
+
+        Args:
+            k (int): The number of values to return.
+
+        Returns:
+            pd.Series: The estimated counts of the `k` most frequent values, by value, in decreasing order.
+        """
+        return self.counts.sort_values(ascending=False, kind="stable").iloc[:k]
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[Union[pd.Series, np.ndarray, Iterable[Hashable]]], capacity: int = 1000
+    ) -> "HeavyHitters":
+        """
+        Builds a summary from chunks of values, e.g. a column read in batches, without holding them all in memory.
+
+        Args:
+            chunks (Iterable[Union[pd.Series, np.ndarray, Iterable[Hashable]]]): The chunks of values.
+            capacity (int): The maximum number of monitored values. Defaults to 1000.
+
+        Returns:
+            HeavyHitters: The summary of all values.
+        """
+        summary = cls(capacity)
+        for chunk in chunks:
+            summary.update(chunk)
+        return summary
+
+    @classmethod
+    def from_series(cls, values: pd.Series, capacity: int = 1000, chunk_size: int = 1 << 20) -> "HeavyHitters":
+        """
+        Builds a summary of a column, counting it in chunks so that only one chunk at a time is hashed.
+
+        Args:
+            values (pd.Series): The column.
+            capacity (int): The maximum number of monitored values. Defaults to 1000.
+            chunk_size (int): The number of values counted at once. Defaults to 1048576.
+
+        Returns:
+            HeavyHitters: The summary of all values.
+        """
+        chunks = (values.iloc[slice(start, start + chunk_size)] for start in range(0, len(values), chunk_size))
+        return cls.from_chunks(chunks, capacity)
+
+    def _combine(self, counts: pd.Series, floor: int) -> None:
+        """
+        Merges estimated counts into the summary and keeps the `capacity` largest.
+
+        Args:
+            counts (pd.Series): The estimated counts to merge, by value.
+            floor (int): The bound on the count of values missing from `counts`.
+        """
+        values = self.counts.index.union(counts.index, sort=False)
+        merged = self.counts.reindex(values, fill_value=self.floor) + counts.reindex(values, fill_value=floor)
+        self.floor += floor
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False, kind="stable")
+            self.floor = max(self.floor, int(merged.iloc[self.capacity]))
+            merged = merged.iloc[: self.capacity]
+        self.counts = merged.astype(np.int64)
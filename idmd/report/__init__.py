@@ -1,4 +1,4 @@
 """
 This module handles report generation.
-Contains the following submodules: report.py
+Contains the following submodules: cache.py, jobs.py, pdf.py, report.py
 """
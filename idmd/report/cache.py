@@ -0,0 +1,83 @@
+"""Module for caching report pages."""
+
+from typing import Hashable, Optional, Sequence
+
+from ..data.cache import LRUCache
+
+
+class ReportCache:
+    """
+    Caches generated PDF reports and their rendered pages, keyed by the data and columns every page shows.
+
+    Page keys are built from the column tokens of the dataset (see `StatisticsCache`), so a page whose columns an
+    operation left untouched is reused by the reports of later versions, while the report as a whole is cached by
+    the keys of all its pages. Pages are kept as single-page PDFs, which `PdfAssembler` copies into a report
+    without computing, drawing or rendering their plots again. The least recently used entries are evicted once the
+    cache exceeds its memory limit.
+    """
+
+    def __init__(self, max_bytes: int = 128 << 20) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the cached reports and pages in bytes, half of which is
+                used for each. Defaults to 128 MiB.
+        """
+        self.reports = LRUCache(max_bytes // 2, sizeof=len)
+        self.pages = LRUCache(max_bytes // 2, sizeof=len)
+
+    def report(self, page_keys: Optional[Sequence[Hashable]]) -> Optional[bytes]:
+        """
+        Returns a cached report.
+
+        Args:
+            page_keys (Sequence[Hashable], optional): The keys of the pages of the report, in order. None if the
+                report cannot be cached.
+
+        Returns:
+            Optional[bytes]: The PDF, or None if it is not cached.
+        """
+        return None if page_keys is None else self.reports.get(tuple(page_keys))
+
+    def put_report(self, page_keys: Optional[Sequence[Hashable]], pdf: bytes) -> None:
+        """
+        Caches a report, unless it cannot be cached.
+
+        Args:
+            page_keys (Sequence[Hashable], optional): The keys of the pages of the report, in order.
+            pdf (bytes): The PDF.
+        """
+        if page_keys is not None:
+            self.reports.put(tuple(page_keys), pdf)
+
+    def page(self, key: Optional[Hashable]) -> Optional[bytes]:
+        """
+        Returns a cached page.
+
+        Args:
+            key (Hashable, optional): The key of the page, or None if it cannot be cached.
+
+        Returns:
+            Optional[bytes]: The page as a single-page PDF, or None if it is not cached.
+        """
+        return None if key is None else self.pages.get(key)
+
+    def put_page(self, key: Optional[Hashable], pdf: bytes) -> None:
+        """
+        Caches a page, unless it cannot be cached.
+
+        Args:
+            key (Hashable, optional): The key of the page.
+            pdf (bytes): The page as a single-page PDF.
+        """
+        if key is not None:
+            self.pages.put(key, pdf)
+
+    def clear(self) -> None:
+        """Removes all cached reports and pages."""
+        self.reports.clear()
+        self.pages.clear()
+
+
+REPORT_CACHE = ReportCache()
@@ -0,0 +1,161 @@
+"""Module for background report generation."""
+
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Hashable, Optional
+
+import pandas as pd
+
+from .cache import REPORT_CACHE, ReportCache
+from .report import ReportCancelled, ReportGenerator
+
+
+class ReportJob:
+    """A PDF report generated in the background, with its progress, that can be cancelled."""
+
+    def __init__(self, version: Optional[Hashable], selection: tuple = ()) -> None:
+        """
+        Initializes a job that has not been scheduled yet.
+
+        Args:
+            version (Hashable, optional): The version of the dataset the report is generated from.
+            selection (tuple): The column selections of the report, as passed to `create_pdf_report`. Defaults to
+                an empty tuple.
+        """
+        self.version = version
+        self.selection = selection
+        self.pages_written = 0
+        self.pages_total = 0
+        self.future: Optional["Future[BinaryIO]"] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def status(self) -> str:
+        """
+        The state of the job: "running", "done", "cancelled" or "failed".
+
+        A job is "cancelled" as soon as its cancellation is requested, even though the page being built is still
+        finished in the background.
+        """
+        if self._cancel_event.is_set():
+            return "cancelled"
+        if self.future is None or not self.future.done():
+            return "running"
+        return "failed" if self.future.exception() is not None else "done"
+
+    @property
+    def progress(self) -> float:
+        """The share of pages written so far, between 0 and 1."""
+        return self.pages_written / self.pages_total if self.pages_total else 0.0
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception that made the job fail, if it failed."""
+        return self.future.exception() if self.status == "failed" else None
+
+    def cancel(self) -> None:
+        """Requests the cancellation of the job, which stops before its next page."""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def result(self) -> BinaryIO:
+        """
+        Waits for the report.
+
+        Returns:
+            BinaryIO: The file containing the generated PDF report, read from the start.
+
+        Raises:
+            ReportCancelled: If the job was cancelled.
+        """
+        if self._cancel_event.is_set():
+            raise ReportCancelled("The report was cancelled.")
+        buffer = self.future.result()
+        buffer.seek(0)
+        return buffer
+
+    def _update(self, written: int, total: int) -> None:
+        """Records the progress reported by the report generator."""
+        self.pages_written, self.pages_total = written, total
+
+
+class ReportJobRunner:
+    """
+    Generates PDF reports on a bounded pool of background threads.
+
+    Jobs outlive the Streamlit script run that started them, so the session stays responsive while the report is
+    built and the job can be picked up again from the session state on the next rerun. At most `max_workers`
+    reports are generated at once, whatever the number of sessions; the pages of each report may still be built
+    in worker processes (see `ReportGenerator.create_pdf_report`). A report found in the report cache is returned
+    by a job that is done at once.
+    """
+
+    def __init__(self, max_workers: int = 2, cache: Optional[ReportCache] = None) -> None:
+        """
+        Initializes the runner. Worker threads are started on demand.
+
+        Args:
+            max_workers (int): The maximum number of reports generated at once. Defaults to 2.
+            cache (ReportCache, optional): Cache of reports and pages. Defaults to the report cache shared by all
+                sessions of the server.
+        """
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else REPORT_CACHE
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="idmd-report")
+
+    def submit(
+        self,
+        version: Optional[Hashable],
+        df: pd.DataFrame,
+        plot_cols=None,
+        heatmap_cols=None,
+        hist_cols=None,
+        density_cols=None,
+        max_workers: int = 1,
+    ) -> ReportJob:
+        """
+        Schedules the generation of a report.
+
+        Args:
+            version (Hashable, optional): The version of the dataset the report is generated from.
+            df (pd.DataFrame): The DataFrame to include in the report.
+            plot_cols (list, optional): Columns to include in the line plot. Defaults to None.
+            heatmap_cols (list, optional): Columns to include in the heatmap. Defaults to None.
+            hist_cols (list, optional): Columns to include in the histograms. Defaults to None.
+            density_cols (list, optional): The two columns to compare in a density plot. Defaults to None.
+            max_workers (int): The number of processes the pages are rendered in. Defaults to 1.
+
+        Returns:
+            ReportJob: The scheduled job, already done if the report is cached.
+        """
+        job = ReportJob(version, (plot_cols, heatmap_cols, hist_cols, density_cols))
+        page_keys = ReportGenerator.page_keys(df, plot_cols, heatmap_cols, hist_cols, density_cols)
+        pdf = self.cache.report(page_keys)
+        if pdf is not None:
+            job.future = Future()
+            job.future.set_result(io.BytesIO(pdf))
+            job._update(len(page_keys), len(page_keys))
+            return job
+
+        job.future = self._executor.submit(
+            ReportGenerator.create_pdf_report,
+            df,
+            plot_cols,
+            heatmap_cols,
+            hist_cols,
+            density_cols,
+            max_workers=max_workers,
+            progress=job._update,
+            cancel_event=job._cancel_event,
+            cache=self.cache,
+        )
+        return job
+
+    def shutdown(self) -> None:
+        """Waits for the scheduled reports and stops the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+REPORT_JOBS = ReportJobRunner()
@@ -0,0 +1,256 @@
+"""Module for assembling PDF files from single-page PDFs."""
+
+import re
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+_HEADER = b"%PDF-1.4\n%\xac\xdc \xab\xba\n"
+_CATALOG_ID = 1
+_PAGES_ID = 2
+_REFERENCE = re.compile(rb"(\d+)(\s+)(\d+)(\s+)R(?![A-Za-z0-9_])")
+_OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+
+
+class PdfAssembler:
+    """
+    Joins single-page PDF documents, such as the figures matplotlib saves as PDF, into one PDF file.
+
+    Pages can therefore be rendered anywhere, e.g. in worker processes or ahead of time in a cache, and only
+    copied here. The objects of every page are renumbered and written to the output as soon as the page is added,
+    so the memory used does not grow with the number of pages; the page tree, catalog and cross-reference table
+    follow in `close`. Only classic cross-reference tables are read, as written by matplotlib.
+    """
+
+    def __init__(self, output: BinaryIO) -> None:
+        """
+        Starts a PDF file.
+
+        Args:
+            output (BinaryIO): The binary file the PDF is written to, from its current position.
+        """
+        self.output = output
+        self._offsets: Dict[int, int] = {}
+        self._kids: List[int] = []
+        self._next_id = _PAGES_ID + 1
+        self._position = 0
+        self._write(_HEADER)
+
+    def __enter__(self) -> "PdfAssembler":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # An incomplete file is not finished, like `PdfPages` leaves a failed report.
+        if exc_type is None:
+            self.close()
+
+    @property
+    def page_count(self) -> int:
+        """The number of pages added so far."""
+        return len(self._kids)
+
+    def add_page(self, pdf: bytes) -> None:
+        """
+        Appends the page of a single-page PDF document.
+
+        Args:
+            pdf (bytes): The document.
+
+        Raises:
+            ValueError: If the document does not have exactly one page or cannot be read.
+        """
+        extents, trailer = PdfAssembler._read_xref(pdf)
+        root = PdfAssembler._reference(trailer, b"/Root")
+        info = PdfAssembler._reference(trailer, b"/Info")
+        pages = PdfAssembler._reference(PdfAssembler._object(pdf, extents, root)[0], b"/Pages")
+        kids = re.search(rb"/Kids\s*\[\s*(\d+)\s+\d+\s+R\s*\]", PdfAssembler._object(pdf, extents, pages)[0])
+        if kids is None:
+            raise ValueError("The document must have exactly one page.")
+        page = int(kids.group(1))
+
+        numbers = {pages: _PAGES_ID}
+        for number in sorted(extents):
+            if number not in (root, info, pages):
+                numbers[number] = self._next_id
+                self._next_id += 1
+
+        for number in sorted(extents):
+            if number in (root, info, pages):
+                continue
+            head, tail = PdfAssembler._object(pdf, extents, number)
+            self._offsets[numbers[number]] = self._position
+            self._write(b"%d 0 obj\n" % numbers[number])
+            self._write(PdfAssembler._renumber(head, numbers))
+            self._write(tail)
+            self._write(b"\nendobj\n")
+        self._kids.append(numbers[page])
+
+    def close(self) -> None:
+        """Writes the page tree, the catalog and the cross-reference table that complete the file."""
+        kids = b" ".join(b"%d 0 R" % kid for kid in self._kids)
+        self._offsets[_PAGES_ID] = self._position
+        self._write(
+            b"%d 0 obj\n<< /Type /Pages /Kids [ %s ] /Count %d >>\nendobj\n" % (_PAGES_ID, kids, len(self._kids))
+        )
+        self._offsets[_CATALOG_ID] = self._position
+        self._write(b"%d 0 obj\n<< /Type /Catalog /Pages %d 0 R >>\nendobj\n" % (_CATALOG_ID, _PAGES_ID))
+
+        xref = self._position
+        entries = b"".join(b"%010d 00000 n \n" % self._offsets[number] for number in range(1, self._next_id))
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n%s" % (self._next_id, entries))
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (self._next_id, _CATALOG_ID))
+        self._write(b"startxref\n%d\n%%%%EOF\n" % xref)
+
+    def _write(self, data: bytes) -> None:
+        """Writes to the output, keeping track of the offset of the next object."""
+        self.output.write(data)
+        self._position += len(data)
+
+    @staticmethod
+    def _read_xref(pdf: bytes) -> Tuple[Dict[int, Tuple[int, int]], bytes]:
+        """
+        Reads the cross-reference table of a document.
+
+        The extent of every object is taken from the table, up to the next object, so stream data never needs to
+        be parsed.
+
+        Args:
+            pdf (bytes): The document.
+
+        Returns:
+            Tuple[Dict[int, Tuple[int, int]], bytes]: The start and end offsets of every object in use, by object
+                number, and the trailer dictionary.
+
+        Raises:
+            ValueError: If the document has no classic cross-reference table.
+        """
+        start = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", pdf)
+        if start is None or not pdf.startswith(b"xref", int(start.group(1))):
+            raise ValueError("The document has no cross-reference table.")
+
+        xref = int(start.group(1))
+        offsets: Dict[int, int] = {}
+        lines = iter(pdf[slice(xref, start.start())].split(b"\n"))
+        next(lines)
+        for line in lines:
+            if line.startswith(b"trailer"):
+                break
+            first, count = map(int, line.split())
+            for number in range(first, first + count):
+                offset, _, kind = next(lines).split()[:3]
+                if kind == b"n" and number:
+                    offsets[number] = int(offset)
+        bounds = sorted(offsets.values()) + [xref]
+        ends = dict(zip(bounds, bounds[1:]))
+        trailer = pdf[slice(pdf.index(b"trailer", xref), start.start())]
+        return {number: (offset, ends[offset]) for number, offset in offsets.items()}, trailer
+
+    @staticmethod
+    def _reference(dictionary: bytes, key: bytes) -> Optional[int]:
+        """
+        Reads the object number an entry of a dictionary refers to.
+
+        Args:
+            dictionary (bytes): The dictionary.
+            key (bytes): The name of the entry, e.g. b"/Root".
+
+        Returns:
+            Optional[int]: The object number, or None if the dictionary has no such reference.
+        """
+        match = re.search(re.escape(key) + rb"\s+(\d+)\s+\d+\s+R", dictionary)
+        return None if match is None else int(match.group(1))
+
+    @staticmethod
+    def _object(pdf: bytes, extents: Dict[int, Tuple[int, int]], number: int) -> Tuple[bytes, bytes]:
+        """
+        Extracts an object of a document, without its "obj" and "endobj" keywords.
+
+        Args:
+            pdf (bytes): The document.
+            extents (Dict[int, Tuple[int, int]]): The start and end offsets of every object, by object number.
+            number (int): The object number.
+
+        Returns:
+            Tuple[bytes, bytes]: The object up to its stream data, and its stream data with the "stream" and
+                "endstream" keywords (empty for objects without a stream).
+        """
+        start, end = extents[number]
+        header = _OBJECT_HEADER.match(pdf, start)
+        if header is None or int(header.group(1)) != number:
+            raise ValueError(f"Object {number} is not at its offset.")
+        body = pdf[slice(header.end(), end)].rstrip()
+        if not body.endswith(b"endobj"):
+            raise ValueError(f"Object {number} is not terminated.")
+        body = body[slice(0, -len(b"endobj"))].rstrip()
+        split = PdfAssembler._segments(body)[-1][1]
+        return body[slice(0, split)], body[slice(split, None)]
+
+    @staticmethod
+    def _renumber(head: bytes, numbers: Dict[int, int]) -> bytes:
+        """
+        Renumbers the indirect references of an object, outside of its strings.
+
+        Args:
+            head (bytes): The object up to its stream data.
+            numbers (Dict[int, int]): The new number of every object, by its number in the page document.
+
+        Returns:
+            bytes: The object with its references renumbered.
+
+        Raises:
+            ValueError: If the object refers to an object of the page document that is not copied.
+        """
+
+        def replace(match: "re.Match[bytes]") -> bytes:
+            number = int(match.group(1))
+            if number not in numbers:
+                raise ValueError(f"Reference to the missing object {number}.")
+            return b"%d%s0%sR" % (numbers[number], match.group(2), match.group(4))
+
+        parts = []
+        for start, end, is_string in PdfAssembler._segments(head):
+            segment = head[slice(start, end)]
+            parts.append(segment if is_string else _REFERENCE.sub(replace, segment))
+        return b"".join(parts)
+
+    @staticmethod
+    def _segments(data: bytes) -> List[Tuple[int, int, bool]]:
+        """
+        Splits PDF object syntax into strings and everything else, up to the stream data of the object if any.
+
+        Strings can hold any bytes, so references and the "stream" keyword are only looked for outside of them.
+
+        Args:
+            data (bytes): The object syntax.
+
+        Returns:
+            List[Tuple[int, int, bool]]: The start and end offsets of every segment, and whether it is a literal
+                or hexadecimal string. The last segment ends where the stream data starts, or at the end.
+        """
+        segments = []
+        start = position = 0
+        while position < len(data):
+            char = data[slice(position, position + 1)]
+            if char == b"(":
+                end, depth = position + 1, 1
+                while depth and end < len(data):
+                    if data[end] == ord("\\"):
+                        end += 1
+                    elif data[end] == ord("("):
+                        depth += 1
+                    elif data[end] == ord(")"):
+                        depth -= 1
+                    end += 1
+            elif char == b"<" and data[slice(position + 1, position + 2)] != b"<":
+                end = data.index(b">", position) + 1
+            elif char == b"<":
+                position += 2
+                continue
+            elif data.startswith(b"stream", position) and (position == 0 or data[position - 1] in b" \t\r\n>]"):
+                break
+            else:
+                position += 1
+                continue
+            segments.append((start, position, False))
+            segments.append((position, end, True))
+            start = position = end
+        segments.append((start, position, False))
+        return [segment for segment in segments if segment[0] < segment[1]] or [(0, 0, False)]
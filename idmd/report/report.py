@@ -1,111 +1,424 @@
 """Module for report generation."""
 
+import collections
 import io
+import itertools
+import multiprocessing
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib import gridspec
-from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from ..data.stats import STATS_CACHE
+from ..visualization.aggregation import ChartData
+from ..visualization.density import DensityGenerator
+from ..visualization.histograms import HistogramGenerator
+from ..visualization.render import RenderPool
+from .cache import REPORT_CACHE, ReportCache
+from .pdf import PdfAssembler
+
+A4_INCHES = (8.27, 11.69)
+HISTOGRAM_BINS = 30
+SUMMARY_COLUMNS_PER_PAGE = 8
+LINE_COLUMNS_PER_PLOT = 10
+HEATMAP_COLUMNS_PER_BLOCK = 20
+HEATMAP_ANNOTATE_MAX_COLUMNS = 10
+HISTOGRAMS_PER_PAGE = 12
+SPOOL_MAX_BYTES = 16 << 20
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ReportCancelled(Exception):
+    """Raised when the generation of a report is cancelled."""
 
 
 class ReportGenerator:
     """Handles the logic for generating PDF reports."""
 
     @staticmethod
-    def create_pdf_report(df: pd.DataFrame, plot_cols=None, heatmap_cols=None, hist_cols=None) -> io.BytesIO:
+    def create_pdf_report(
+        df: pd.DataFrame,
+        plot_cols=None,
+        heatmap_cols=None,
+        hist_cols=None,
+        density_cols=None,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        cache: Optional[ReportCache] = None,
+        output: Optional[BinaryIO] = None,
+    ) -> BinaryIO:
         """
         Create a polished PDF report containing:
         - DataFrame preview
         - DataFrame statistics (rounded)
-        - Line plot + correlation heatmap
-        - Histograms in a compact grid
+        - Line plots + correlation heatmap
+        - Histograms with kernel density estimates in a compact grid
+        - Optionally, a 2D density plot of two columns
+
+        Every column is included: wide tables, line plots, heatmaps and histogram grids are split across as many
+        pages as needed (see `_layout`). The pages are prepared, drawn and written one after another, and every
+        page is disposed once written to the output file, so the memory used does not grow with the number of
+        pages.
+
+        Every page is drawn and rendered to a single-page PDF on its own, each from only the data it shows, and the
+        rendered pages are joined into the report in order by `PdfAssembler`, which only copies their objects.
+        Statistics that are cached for the dataset (summary statistics, correlations, the decimated rows of the line
+        plot, histogram counts, kernel density estimates and the 2D density histogram) are computed beforehand in
+        the calling process, so the pages are drawn from data whose size does not depend on the number of rows.
+        With more than one worker, the pages are drawn and rendered concurrently in a process pool; only the
+        statistics stay serial. The workers are started with `WORKER_START_METHOD` rather than forked, as reports
+        are generated on background threads (see `ReportJobRunner`), so a pool only pays off on several CPUs and
+        for reports of many pages.
+
+        Reports of a dataset published by `DatasetStore` are cached with their rendered pages (see `ReportCache`):
+        a report requested again is returned at once, and only the pages showing changed data or columns are drawn.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to include in the report.
+            plot_cols (list, optional): Columns to include in the line plots. Defaults to None (all numeric columns).
+            heatmap_cols (list, optional): Columns to include in the heatmap. Defaults to None (all numeric columns).
+            hist_cols (list, optional): Columns to include in the histograms. Defaults to None (all numeric columns).
+            density_cols (list, optional): The two columns to compare in a density plot. Defaults to None (no
+                density plot).
+            max_workers (int): The number of worker processes the pages are drawn and rendered in. With 1, they are
+                drawn one after another in the calling process, without a pool. Defaults to 1.
+            progress (Callable[[int, int], None], optional): Called with the number of pages written and the total
+                number of pages after every page. Defaults to None.
+            cancel_event (threading.Event, optional): Cancels the report once set; it is checked before every
+                page. Defaults to None.
+            cache (ReportCache, optional): Cache of reports and pages. Defaults to the report cache shared by all
+                sessions of the server.
+            output (BinaryIO, optional): The binary file the PDF is streamed to. Defaults to None, which uses a
+                temporary file that is kept in memory up to `SPOOL_MAX_BYTES` and moved to disk beyond.
+
+        Returns:
+            BinaryIO: The output file containing the generated PDF report, read from the start.
+
+        Raises:
+            ReportCancelled: If the cancel event is set before the last page is written.
+        """
+        cache = cache if cache is not None else REPORT_CACHE
+        output = output if output is not None else tempfile.SpooledTemporaryFile(SPOOL_MAX_BYTES)
+        layout = ReportGenerator._layout(df, plot_cols, heatmap_cols, hist_cols, density_cols)
+        page_keys = ReportGenerator.page_keys(df, plot_cols, heatmap_cols, hist_cols, density_cols)
+        report = cache.report(page_keys)
+        if report is not None:
+            output.write(report)
+            output.seek(0)
+            if progress is not None:
+                progress(len(page_keys), len(page_keys))
+            return output
+
+        keys = page_keys if page_keys is not None else [None] * len(layout)
+        cached = [key is not None and key in cache.pages for key in keys]
+        missing = (ReportGenerator._prepare(df, *page) for page, hit in zip(layout, cached) if not hit)
+
+        def pages(rendered: Iterator[bytes]) -> Iterator[bytes]:
+            # Cached pages are looked up one at a time, when they are written.
+            for page, key, hit in zip(layout, keys, cached):
+                pdf = cache.page(key) if hit else next(rendered)
+                if pdf is None:  # Evicted since the lookup above.
+                    pdf = ReportGenerator._render_page(ReportGenerator._prepare(df, *page))
+                elif not hit:
+                    cache.put_page(key, pdf)
+                yield pdf
+
+        if max_workers > 1 and cached.count(False) > 1:
+            # Reports are generated on background threads, which forking would copy the locks of mid-use.
+            context = multiprocessing.get_context(WORKER_START_METHOD)
+            with ProcessPoolExecutor(min(max_workers, cached.count(False)), mp_context=context) as pool:
+                rendered = ReportGenerator._render_in_pool(pool, missing, 2 * max_workers)
+                try:
+                    ReportGenerator._write_pdf(pages(rendered), len(layout), output, progress, cancel_event)
+                finally:
+                    rendered.close()
+        else:
+            rendered = map(ReportGenerator._render_page, missing)
+            ReportGenerator._write_pdf(pages(rendered), len(layout), output, progress, cancel_event)
+
+        size = output.seek(0, io.SEEK_END)
+        if page_keys is not None and size <= cache.reports.max_bytes:
+            output.seek(0)
+            cache.put_report(page_keys, output.read())
+        output.seek(0)
+        return output
+
+    @staticmethod
+    def page_keys(
+        df: pd.DataFrame, plot_cols=None, heatmap_cols=None, hist_cols=None, density_cols=None
+    ) -> Optional[List[Hashable]]:
+        """
+        Identifies every page of the report by its kind and the name and column token of every column it shows.
 
         Args:
             df (pd.DataFrame): The DataFrame to include in the report.
-            plot_cols (list, optional): Columns to include in the line plot. Defaults to None.
+            plot_cols (list, optional): Columns to include in the line plots. Defaults to None.
             heatmap_cols (list, optional): Columns to include in the heatmap. Defaults to None.
             hist_cols (list, optional): Columns to include in the histograms. Defaults to None.
+            density_cols (list, optional): The two columns to compare in a density plot. Defaults to None.
 
         Returns:
-            io.BytesIO: A buffer containing the generated PDF report.
+            Optional[List[Hashable]]: The key of every page, in order, or None if the columns of the DataFrame
+                have no tokens (see `StatisticsCache.tokens`).
         """
+        tokens = STATS_CACHE.tokens(df)
+        if tokens is None:
+            return None
+        return [
+            (draw.__name__,) + tuple(tuple((col, tokens[col]) for col in group or ()) for group in groups)
+            for draw, groups in ReportGenerator._layout(df, plot_cols, heatmap_cols, hist_cols, density_cols)
+        ]
+
+    @staticmethod
+    def pages(
+        df: pd.DataFrame, plot_cols=None, heatmap_cols=None, hist_cols=None, density_cols=None
+    ) -> List[Tuple[Callable[..., Figure], tuple]]:
+        """
+        Prepares the pages of the report: the function that draws every page, with the data it shows.
+
+        `create_pdf_report` prepares the pages one at a time instead, as they are drawn.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to include in the report.
+            plot_cols (list, optional): Columns to include in the line plots. Defaults to None.
+            heatmap_cols (list, optional): Columns to include in the heatmap. Defaults to None.
+            hist_cols (list, optional): Columns to include in the histograms. Defaults to None.
+            density_cols (list, optional): The two columns to compare in a density plot. Defaults to None.
+
+        Returns:
+            List[Tuple[Callable[..., Figure], tuple]]: The drawing function and its arguments of every page, in
+                order. Both can be sent to another process.
+        """
+        return [
+            ReportGenerator._prepare(df, draw, groups)
+            for draw, groups in ReportGenerator._layout(df, plot_cols, heatmap_cols, hist_cols, density_cols)
+        ]
+
+    @staticmethod
+    def _layout(
+        df: pd.DataFrame, plot_cols=None, heatmap_cols=None, hist_cols=None, density_cols=None
+    ) -> List[Tuple[Callable[..., Figure], tuple]]:
+        """
+        Splits the report into pages, so that every table and grid stays legible however many columns there are.
+
+        - Summary pages show the preview and statistics of `SUMMARY_COLUMNS_PER_PAGE` columns each.
+        - Plot pages show a line plot of `LINE_COLUMNS_PER_PLOT` columns and a block of at most
+          `HEATMAP_COLUMNS_PER_BLOCK` by `HEATMAP_COLUMNS_PER_BLOCK` correlations each, until both run out. As the
+          correlation matrix is symmetric, only the blocks on and above its diagonal are shown.
+        - Histogram pages show a grid of `HISTOGRAMS_PER_PAGE` histograms each.
+        - A density page follows if two density columns are given.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to include in the report.
+            plot_cols (list, optional): Columns to include in the line plots. Defaults to None (all numeric
+                columns).
+            heatmap_cols (list, optional): Columns to include in the heatmap. Defaults to None (all numeric
+                columns).
+            hist_cols (list, optional): Columns to include in the histograms. Defaults to None (all numeric
+                columns).
+            density_cols (list, optional): The two columns to compare in a density plot. Defaults to None.
+
+        Returns:
+            List[Tuple[Callable[..., Figure], tuple]]: The drawing function of every page, in order, with the
+                groups of columns it shows. Groups a page does not show are None.
+        """
+        numeric_cols = df.select_dtypes(include="number").columns.tolist()
+        plot_cols = list(plot_cols or numeric_cols)
+        heatmap_cols = list(heatmap_cols or numeric_cols)
+        hist_cols = list(hist_cols or numeric_cols)
+
+        def chunks(columns: list, size: int) -> List[list]:
+            return [columns[slice(start, start + size)] for start in range(0, len(columns), size)]
+
+        blocks = chunks(heatmap_cols, HEATMAP_COLUMNS_PER_BLOCK)
+        heatmap_groups = [(rows, cols) for i, rows in enumerate(blocks) for cols in blocks[slice(i, None)]]
+        plot_groups = itertools.zip_longest(chunks(plot_cols, LINE_COLUMNS_PER_PLOT), heatmap_groups)
+
+        layout = [
+            (ReportGenerator._summary_page, (group,)) for group in chunks(list(df.columns), SUMMARY_COLUMNS_PER_PAGE)
+        ]
+        layout += [(ReportGenerator._plots_page, (line, *(block or (None, None)))) for line, block in plot_groups]
+        layout += [(ReportGenerator._histograms_page, (group,)) for group in chunks(hist_cols, HISTOGRAMS_PER_PAGE)]
+        if density_cols:
+            layout.append((ReportGenerator._density_page, (list(density_cols),)))
+        return layout
+
+    @staticmethod
+    def _prepare(df: pd.DataFrame, draw: Callable[..., Figure], groups: tuple) -> Tuple[Callable[..., Figure], tuple]:
+        """
+        Gathers the data a page of the layout shows. Cached statistics are computed here, in the calling process.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to include in the report.
+            draw (Callable[..., Figure]): The drawing function of the page.
+            groups (tuple): The groups of columns the page shows, as returned by `_layout`.
+
+        Returns:
+            Tuple[Callable[..., Figure], tuple]: The drawing function and its arguments.
+        """
+        if draw is ReportGenerator._summary_page:
+            (columns,) = groups
+            numeric = df[columns].select_dtypes(include="number").columns.tolist()
+            return draw, (df[columns].head(), STATS_CACHE.describe(df, numeric).round(3) if numeric else None)
+        if draw is ReportGenerator._plots_page:
+            line, rows, cols = groups
+            corr = STATS_CACHE.corr(df, list(dict.fromkeys(rows + cols))).loc[rows, cols] if rows else None
+            return draw, (ChartData.line(df, line) if line else None, corr)
+        if draw is ReportGenerator._histograms_page:
+            (columns,) = groups
+            return draw, (
+                HistogramGenerator.compute_histograms(df, columns, HISTOGRAM_BINS),
+                HistogramGenerator.compute_kdes(df, columns),
+            )
+        x, y = groups[0]
+        return draw, (DensityGenerator.compute_density(df, x, y), x, y)
+
+    @staticmethod
+    def _build_page(page: Tuple[Callable[..., Figure], tuple]) -> Figure:
+        """Draws a page prepared by `pages`."""
+        draw, args = page
+        return draw(*args)
+
+    @staticmethod
+    def _render_page(page: Tuple[Callable[..., Figure], tuple]) -> bytes:
+        """Draws a page prepared by `pages` and renders it to a single-page PDF, disposing its figure."""
+        fig = ReportGenerator._build_page(page)
         buffer = io.BytesIO()
-        A4_inches = (8.27, 11.69)  # A4 size
+        fig.savefig(buffer, format="pdf")
+        RenderPool.dispose(fig)
+        return buffer.getvalue()
 
-        with PdfPages(buffer) as pdf:
-            numeric_cols = df.select_dtypes(include="number").columns.tolist()
-            plot_cols = plot_cols or numeric_cols[:10]
-            heatmap_cols = heatmap_cols or numeric_cols[:10]
-            hist_cols = hist_cols or numeric_cols[:10]
+    @staticmethod
+    def _render_in_pool(
+        pool: ProcessPoolExecutor, pages: Iterable[Tuple[Callable[..., Figure], tuple]], window: int
+    ) -> Iterator[bytes]:
+        """
+        Draws and renders pages in a process pool and yields them in order. At most `window` pages are prepared or
+        rendered ahead of the page being written, so the memory used does not grow with the number of pages.
+        """
+        pending: "Deque[Future[bytes]]" = collections.deque()
+        try:
+            for page in pages:
+                pending.append(pool.submit(ReportGenerator._render_page, page))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Pages not started yet are dropped if the report is cancelled or fails.
+            for future in pending:
+                future.cancel()
 
-            # --- Page 1: Preview + Description ---
-            fig = plt.figure(figsize=A4_inches)
-            gs = gridspec.GridSpec(4, 1, height_ratios=[1.5, 0.5, 2, 2])
+    @staticmethod
+    def _write_pdf(
+        pages: Iterable[bytes],
+        total: int,
+        output: BinaryIO,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> None:
+        """Joins rendered single-page PDFs into a PDF file, in order."""
+        pages = iter(pages)
+        with PdfAssembler(output) as pdf:
+            for written in range(1, total + 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled("The report was cancelled.")
+                pdf.add_page(next(pages))
+                if progress is not None:
+                    progress(written, total)
 
-            # DataFrame Preview
-            ax1 = fig.add_subplot(gs[0])
-            ax1.axis("off")
-            ax1.set_title("Dataframe Preview")
-            table1 = ax1.table(cellText=df.head().values, colLabels=df.columns, loc="center")
-            table1.auto_set_font_size(False)
-            table1.set_fontsize(8)
-            table1.scale(1, 1.5)
-
-            # DataFrame Describe
-            desc = df.describe().round(3)
-            ax2 = fig.add_subplot(gs[2])
-            ax2.axis("off")
+    @staticmethod
+    def _summary_page(head: pd.DataFrame, desc: Optional[pd.DataFrame]) -> Figure:
+        """Draws a page with the first rows and the summary statistics (of the numeric ones) of some columns."""
+        fig = Figure(figsize=A4_INCHES)
+        gs = gridspec.GridSpec(4, 1, height_ratios=[1.5, 0.5, 2, 2])
+
+        # DataFrame Preview
+        ax1 = fig.add_subplot(gs[0])
+        ax1.axis("off")
+        ax1.set_title("Dataframe Preview")
+        table1 = ax1.table(cellText=head.values, colLabels=head.columns, loc="center")
+        table1.auto_set_font_size(False)
+        table1.set_fontsize(8)
+        table1.scale(1, 1.5)
+
+        # DataFrame Describe
+        ax2 = fig.add_subplot(gs[2])
+        ax2.axis("off")
+        if desc is not None:
             ax2.set_title("Dataframe Statistics")
             table2 = ax2.table(cellText=desc.values, colLabels=desc.columns, rowLabels=desc.index, loc="center")
             table2.auto_set_font_size(False)
             table2.set_fontsize(6)
             table2.scale(1, 1.5)
 
-            fig.tight_layout(pad=1.0)
-            pdf.savefig(fig)
-            plt.close(fig)
-
-            # --- Page 2: Line Plot + Correlation Heatmap ---
-            fig = plt.figure(figsize=A4_inches)
-            gs = gridspec.GridSpec(2, 1, height_ratios=[1, 1])
-
-            ax1 = fig.add_subplot(gs[0])
-            if plot_cols:
-                df[plot_cols].plot(ax=ax1)
-                ax1.set_title("Line Plot of Selected Columns", fontsize=12, fontweight="bold")
-            ax1.set_xlabel("")
-            ax1.set_ylabel("")
-
-            ax2 = fig.add_subplot(gs[1])
-            if heatmap_cols:
-                sns.heatmap(df[heatmap_cols].corr(), annot=True, cmap="coolwarm", ax=ax2, cbar=True)
-                ax2.set_title("Correlation Heatmap", fontsize=12, fontweight="bold")
-
-            fig.tight_layout(pad=0.5)
-            pdf.savefig(fig)
-            plt.close(fig)
-
-            # --- Page 3: All Histograms in one Figure (grid layout) ---
-            n_cols = 3
-            n_rows = (len(hist_cols) + n_cols - 1) // n_cols
-            fig, axs = plt.subplots(n_rows, n_cols, figsize=A4_inches)
-
-            axs = axs.flatten()
-
-            for idx, col in enumerate(hist_cols):
-                sns.histplot(df[col], kde=True, ax=axs[idx])
-                axs[idx].set_title(f"Histogram of {col}", fontsize=10)
-                axs[idx].set_xlabel("")
-                axs[idx].set_ylabel("")
-
-            # Hide any empty subplots
-            for i in range(len(hist_cols), len(axs)):
-                axs[i].axis("off")
-
-            fig.tight_layout()
-            pdf.savefig(fig)
-            plt.close(fig)
-
-        buffer.seek(0)
-        return buffer
+        fig.tight_layout(pad=1.0)
+        return fig
+
+    @staticmethod
+    def _plots_page(line_data: Optional[pd.DataFrame], corr: Optional[pd.DataFrame]) -> Figure:
+        """Draws a page with a line plot of the (decimated) rows and a block of the correlation matrix, if given."""
+        fig = Figure(figsize=A4_INCHES)
+        gs = gridspec.GridSpec(2, 1, height_ratios=[1, 1])
+
+        ax1 = fig.add_subplot(gs[0])
+        if line_data is not None:
+            line_data.plot(ax=ax1)
+            ax1.set_title("Line Plot of Selected Columns", fontsize=12, fontweight="bold")
+        else:
+            ax1.axis("off")
+        ax1.set_xlabel("")
+        ax1.set_ylabel("")
+
+        ax2 = fig.add_subplot(gs[1])
+        if corr is not None:
+            annotate = max(corr.shape) <= HEATMAP_ANNOTATE_MAX_COLUMNS
+            sns.heatmap(corr, annot=annotate, cmap="coolwarm", vmin=-1, vmax=1, ax=ax2, cbar=True)
+            ax2.set_title("Correlation Heatmap", fontsize=12, fontweight="bold")
+        else:
+            ax2.axis("off")
+
+        fig.tight_layout(pad=0.5)
+        return fig
+
+    @staticmethod
+    def _histograms_page(
+        histograms: Dict[str, Tuple[np.ndarray, np.ndarray]], kdes: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    ) -> Figure:
+        """Draws the page with the histograms of all columns, and their kernel density estimates, in a grid."""
+        n_cols = 3
+        n_rows = (len(histograms) + n_cols - 1) // n_cols
+        fig = Figure(figsize=A4_INCHES)
+        axs = fig.subplots(n_rows, n_cols, squeeze=False)
+
+        axs = axs.flatten()
+
+        for idx, (col, (counts, edges)) in enumerate(histograms.items()):
+            axs[idx].stairs(counts, edges, fill=True, alpha=0.5, color="C0")
+            grid, density = kdes[col]
+            # Scales the density to the counts, like the KDE line of `sns.histplot`.
+            axs[idx].plot(grid, density * counts.sum() * (edges[1] - edges[0]), color="C0")
+            axs[idx].set_title(f"Histogram of {col}", fontsize=10)
+            axs[idx].set_xlabel("")
+            axs[idx].set_ylabel("")
+
+        # Hide any empty subplots
+        for i in range(len(histograms), len(axs)):
+            axs[i].axis("off")
+
+        fig.tight_layout()
+        return fig
+
+    @staticmethod
+    def _density_page(density: Tuple[np.ndarray, np.ndarray, np.ndarray], x: str, y: str) -> Figure:
+        """Draws the page with the density plot of two columns from their 2D histogram."""
+        fig = DensityGenerator.draw_density_plot(density, x, y)
+        fig.set_size_inches(A4_INCHES[0], A4_INCHES[0] * 0.75)
+        return fig
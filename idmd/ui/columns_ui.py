@@ -1,15 +1,29 @@
 """Module for column manipulator component."""
 
-import pandas as pd
+from typing import List
+
 import streamlit as st
 
-from ..manipulation.columns import ColumnManipulatorLogic
+from ..data.store import DatasetStore
+from ..manipulation.plan import Operation
 from .base import Component
 
 
 class ColumnManipulatorUI(Component):
     """Provides UI for column operations and transformations."""
 
+    def __init__(self, position: int = 0, lazy: bool = False) -> None:
+        """
+        Initializes the ColumnManipulatorUI component.
+
+        Args:
+            position (int): The column position of the component. Defaults to 0.
+            lazy (bool): Whether to only record operations and execute them, optimized together, when the data
+                is next displayed, plotted or exported. Defaults to False.
+        """
+        super().__init__(position)
+        self.lazy = lazy
+
     def render(self) -> None:
         """
         Renders column manipulation tools in the Streamlit interface.
@@ -18,62 +32,63 @@ class ColumnManipulatorUI(Component):
         """
         st.header("Column Manipulation")
 
-        if "df" not in st.session_state:
+        store = DatasetStore.from_session(st.session_state)
+        if store is None:
             st.warning("No dataset available. Please upload a dataset first.")
             return
 
-        df = st.session_state.df
+        columns = store.columns
 
-        self._render_column_swapper(df)
-        self._render_column_dropper(df)
-        self._render_column_selector(df)
+        self._render_column_swapper(columns)
+        self._render_column_dropper(columns)
+        self._render_column_selector(columns)
 
-    def _render_column_swapper(self, df: pd.DataFrame) -> None:
+    def _render_column_swapper(self, columns: List[str]) -> None:
         """
         Renders the UI for swapping two columns.
 
         Args:
-            df (pd.DataFrame): The DataFrame to modify.
+            columns (List[str]): The columns of the dataset.
         """
         st.subheader("Swap Two Columns")
         col1, col2 = st.columns(2)
 
         with col1:
-            col_a = st.selectbox("First Column", df.columns, key="swap_col1")
+            col_a = st.selectbox("First Column", columns, key="swap_col1")
         with col2:
-            col_b = st.selectbox("Second Column", df.columns, key="swap_col2")
+            col_b = st.selectbox("Second Column", columns, key="swap_col2")
 
         if st.button("Swap Columns"):
             if col_a != col_b:
-                st.session_state.df = ColumnManipulatorLogic.swap_columns(df, col_a, col_b)
+                DatasetStore.record(st.session_state, Operation.swap(col_a, col_b), self.lazy)
                 st.success(f"Swapped columns: {col_a} ↔ {col_b}")
             else:
                 st.warning("Please select two different columns.")
 
-    def _render_column_dropper(self, df: pd.DataFrame) -> None:
+    def _render_column_dropper(self, columns: List[str]) -> None:
         """
         Renders the UI for dropping a column.
 
         Args:
-            df (pd.DataFrame): The DataFrame to modify.
+            columns (List[str]): The columns of the dataset.
         """
         st.subheader("Drop a Column")
-        drop_col = st.selectbox("Select Column to Remove", df.columns, key="drop_col")
+        drop_col = st.selectbox("Select Column to Remove", columns, key="drop_col")
 
         if st.button("Remove Column"):
-            st.session_state.df = ColumnManipulatorLogic.drop_column(df, drop_col)
+            DatasetStore.record(st.session_state, Operation.drop(drop_col), self.lazy)
             st.success(f"Removed column: {drop_col}")
 
-    def _render_column_selector(self, df: pd.DataFrame) -> None:
+    def _render_column_selector(self, columns: List[str]) -> None:
         """
         Renders the UI for selecting specific columns to keep.
 
         Args:
-            df (pd.DataFrame): The DataFrame to modify.
+            columns (List[str]): The columns of the dataset.
         """
         st.subheader("Column Selection Filter")
-        selected = st.multiselect("Select Columns to Keep", df.columns, default=list(df.columns), key="select_columns")
+        selected = st.multiselect("Select Columns to Keep", columns, default=list(columns), key="select_columns")
 
         if st.button("Apply Selection Filter"):
-            st.session_state.df = ColumnManipulatorLogic.select_columns(df, selected)
+            DatasetStore.record(st.session_state, Operation.select(selected), self.lazy)
             st.success("Updated the dataset with selected columns.")
@@ -2,6 +2,7 @@
 
 import streamlit as st
 
+from ..data.store import DatasetStore
 from .base import Component
 
 
@@ -12,15 +13,16 @@ class DataPreview(Component):
         """
         Renders the dataset preview in the Streamlit interface.
 
-        Displays the first few rows of the dataset if it exists in the session state.
+        Displays the first few rows of the dataset if it exists in the session state, together with controls to
+        reset the dataset and to undo or redo operations.
         """
         if "df" in st.session_state:
-            df = st.session_state.df
+            df = DatasetStore.current_frame(st.session_state)
             st.header("Dataset Preview")
             st.dataframe(df.head())
             st.session_state._refresh_preview = False
 
-            col1, col2, _ = st.columns([1, 1, 2])
+            col1, col2, col3, col4 = st.columns(4)
 
             with col1:
                 if st.button("Refresh Preview"):
@@ -28,9 +30,32 @@ class DataPreview(Component):
 
             with col2:
                 if st.button("Reset to Default Data"):
-                    if "original_df" in st.session_state:
-                        st.session_state.df = st.session_state.original_df.copy()
-                        st.success("Data has been reset to original upload.")
-                        st.session_state._refresh_preview = True
-                    else:
-                        st.warning("No original data found to reset.")
+                    store = DatasetStore.from_session(st.session_state)
+                    store.reset()
+                    store.publish(st.session_state)
+                    st.success("Data has been reset to original upload.")
+                    st.session_state._refresh_preview = True
+
+            with col3:
+                if st.button("Undo"):
+                    self._move(DatasetStore.undo, "Nothing to undo.")
+
+            with col4:
+                if st.button("Redo"):
+                    self._move(DatasetStore.redo, "Nothing to redo.")
+
+    @staticmethod
+    def _move(step, warning: str) -> None:
+        """
+        Moves the dataset to another version in its history.
+
+        Args:
+            step (Callable[[DatasetStore], bool]): `DatasetStore.undo` or `DatasetStore.redo`.
+            warning (str): The warning to show if there is no version to move to.
+        """
+        store = DatasetStore.from_session(st.session_state)
+        if step(store):
+            store.publish(st.session_state)
+            st.session_state._refresh_preview = True
+        else:
+            st.warning(warning)
@@ -4,6 +4,9 @@ import io
 
 import streamlit as st
 
+from ..data.compactor import DtypeCompactor
+from ..data.stats import STATS_CACHE
+from ..data.store import DatasetStore
 from ..ui.base import Component
 
 
@@ -14,18 +17,46 @@ class DataStats(Component):
         if "df" not in st.session_state:
             return
 
-        df = st.session_state.df
+        df = DatasetStore.current_frame(st.session_state)
 
         with st.expander("Dataset Statistics"):
             self._show_basic_stats(df)
             self._show_column_info(df)
+            self._show_memory_usage(df)
 
     def _show_basic_stats(self, df) -> None:
         if st.checkbox("Show Summary Statistics", key="stats_checkbox"):
-            st.write(df.describe())
+            st.write(STATS_CACHE.describe(df))
 
     def _show_column_info(self, df) -> None:
         if st.checkbox("Show Column Metadata", key="colinfo_checkbox"):
             buffer = io.StringIO()
             df.info(buf=buffer)
             st.text(buffer.getvalue())
+
+    def _show_memory_usage(self, df) -> None:
+        if st.checkbox("Show Memory Usage", key="memory_checkbox"):
+            current = DtypeCompactor.memory_usage(df)
+            report = st.session_state.get("memory_report")
+
+            if report:
+                saved = report["before"] - report["after"]
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Before Compaction", self._format_bytes(report["before"]))
+                col2.metric(
+                    "After Compaction",
+                    self._format_bytes(report["after"]),
+                    delta=f"-{saved / report['before']:.0%}" if report["before"] else None,
+                    delta_color="inverse",
+                )
+                col3.metric("Current Dataset", self._format_bytes(current))
+            else:
+                st.metric("Current Dataset", self._format_bytes(current))
+
+    @staticmethod
+    def _format_bytes(size: float) -> str:
+        for unit in ["B", "KB", "MB", "GB"]:
+            if size < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} TB"
@@ -3,6 +3,7 @@
 import streamlit as st
 
 from ..data.exporter import DataExporter
+from ..data.store import DatasetStore
 from .base import Component
 
 
@@ -27,7 +28,7 @@ class DataExporterUI(Component):
         """
         Renders the download button for exporting the dataset.
         """
-        export_df = st.session_state.df
+        export_df = DatasetStore.current_frame(st.session_state)
         csv_data = DataExporter.export_to_csv(export_df)
 
         st.download_button(
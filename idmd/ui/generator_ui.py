@@ -3,6 +3,7 @@
 import streamlit as st
 
 from ..data.generator import DatasetGenerator
+from ..data.store import DatasetStore
 from .base import Component
 
 
@@ -43,7 +44,7 @@ class DataGeneratorUI(Component):
 
         if st.button("Generate Normal Distribution"):
             df = DatasetGenerator.generate_normal_distribution(size=(size, 1), mean=mean, std=std)
-            st.session_state.df = df
+            DatasetStore.load(st.session_state, df)
             st.success("Normal distribution dataset generated!")
             st.dataframe(df.head())
 
@@ -59,7 +60,7 @@ class DataGeneratorUI(Component):
 
         if st.button("Generate Uniform Distribution"):
             df = DatasetGenerator.generate_uniform_distribution(size=(size, 1), low=low, high=high)
-            st.session_state.df = df
+            DatasetStore.load(st.session_state, df)
             st.success("Uniform distribution dataset generated!")
             st.dataframe(df.head())
 
@@ -75,6 +76,6 @@ class DataGeneratorUI(Component):
 
         if st.button("Generate Random Integers"):
             df = DatasetGenerator.generate_random_integers(size=(size, 1), low=low, high=high)
-            st.session_state.df = df
+            DatasetStore.load(st.session_state, df)
             st.success("Random integers dataset generated!")
             st.dataframe(df.head())
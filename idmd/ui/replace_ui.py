@@ -1,37 +1,68 @@
 """Module for value replacement component."""
 
+from typing import List
+
 import streamlit as st
-from pandas import DataFrame
 
-from ..manipulation.replace import ReplaceLogic
+from ..data.store import DatasetStore
+from ..manipulation.plan import Operation
 from .base import Component
 
 
 class ReplaceUI(Component):
     """Provides UI for replacing values in a DataFrame."""
 
+    def __init__(self, position: int = 0, lazy: bool = False) -> None:
+        """
+        Initializes the ReplaceUI component.
+
+        Args:
+            position (int): The column position of the component. Defaults to 0.
+            lazy (bool): Whether to only record replacements and execute them, optimized together, when the data
+                is next displayed, plotted or exported. Defaults to False.
+        """
+        super().__init__(position)
+        self.lazy = lazy
+
     def render(self) -> None:
         """
-        Renders the UI for replacing values in a column of the dataset.
+        Renders the UI for replacing values in one or more columns of the dataset.
         """
-        st.header("Replace Values in Column")
+        st.header("Replace Values in Columns")
 
-        if "df" not in st.session_state:
+        store = DatasetStore.from_session(st.session_state)
+        if store is None:
             st.warning("No dataset available. Please upload a dataset first.")
             return
 
-        df: DataFrame = st.session_state.df
+        columns: List[str] = store.columns
 
-        replace_col: str = st.selectbox("Select Column to Modify", df.columns)
+        replace_cols: List[str] = st.multiselect("Select Columns to Modify", columns)
         values_to_replace: str = st.selectbox("Select Values to Replace", ["0", "np.nan", "outliers", "all"])
         replacement_method: str = st.selectbox("Replace With", ["median", "min", "max", "random", "np.nan"])
+        approximate: bool = values_to_replace == "outliers" and st.checkbox(
+            "Approximate Quartiles",
+            help="Detect outliers from approximate quartiles, which is faster on large columns.",
+        )
+        error: float = 0.01
+        if approximate:
+            error = st.number_input(
+                "Quartile Rank Error",
+                min_value=0.001,
+                max_value=0.2,
+                value=0.01,
+                step=0.001,
+                format="%.3f",
+                help="The targeted error of the approximate quartiles, as a fraction of the number of rows. "
+                "Smaller errors use more memory.",
+            )
 
         if st.button("Apply Value Replacement"):
-            if replace_col and values_to_replace and replacement_method:
-                updated_df: DataFrame = ReplaceLogic.replace_values(
-                    df, replace_col, values_to_replace, replacement_method
+            if replace_cols and values_to_replace and replacement_method:
+                operation = Operation.replace_batch(
+                    replace_cols, values_to_replace, replacement_method, approximate, error
                 )
-                st.session_state.df = updated_df
-                st.success(f"Values in '{replace_col}' replaced successfully.")
+                DatasetStore.record(st.session_state, operation, self.lazy)
+                st.success(f"Values in {', '.join(map(repr, replace_cols))} replaced successfully.")
             else:
-                st.warning("Please select a column, values to replace, and replacement method.")
+                st.warning("Please select columns, values to replace, and replacement method.")
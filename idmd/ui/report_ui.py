@@ -1,14 +1,34 @@
 """Module for report generator component."""
 
+from typing import Optional
+
 import streamlit as st
 
-from ..report.report import ReportGenerator
+from ..data.store import DatasetStore
+from ..report.jobs import REPORT_JOBS, ReportJob, ReportJobRunner
 from .base import Component
 
 
 class ReportUI(Component):
     """Provides UI for generating PDF reports."""
 
+    POLL_SECONDS = 0.5
+
+    def __init__(self, position: int = 0, max_workers: int = 1, jobs: Optional[ReportJobRunner] = None) -> None:
+        """
+        Initializes the ReportUI component.
+
+        Args:
+            position (int): The column position of the component. Defaults to 0.
+            max_workers (int): The number of processes the report pages are rendered in. Defaults to 1 (rendered
+                in the background thread of the report job).
+            jobs (ReportJobRunner, optional): Runs the report jobs in the background. Defaults to the runner shared
+                by all sessions of the server.
+        """
+        super().__init__(position)
+        self.max_workers = max_workers
+        self.jobs = jobs if jobs is not None else REPORT_JOBS
+
     def render(self) -> None:
         """
         Renders the UI for generating a PDF report of the dataset.
@@ -19,17 +39,54 @@ class ReportUI(Component):
             st.warning("No dataset available. Please upload a dataset first.")
             return
 
-        df = st.session_state.df
+        # The report is generated by a background job kept in the session state, so the session stays responsive
+        # and the job is picked up again on every rerun. A session runs at most one job per dataset version.
+        key = f"_report_{self.position}_job"
+        version = st.session_state.get("df_version")
+        selection = tuple(
+            st.session_state.get(name)
+            for name in ("custom_plot_cols", "custom_heatmap_cols", "custom_hist_cols", "custom_density_cols")
+        )
+        job: Optional[ReportJob] = st.session_state.get(key)
+        if job is not None and job.version != version:
+            job.cancel()
+            job = st.session_state[key] = None
+        elif job is not None and job.status == "done" and job.selection != selection:
+            job = st.session_state[key] = None
 
-        if st.button("Generate PDF Report"):
-            plot_cols = st.session_state.get("custom_plot_cols")
-            heatmap_cols = st.session_state.get("custom_heatmap_cols")
-            hist_cols = st.session_state.get("custom_hist_cols")
+        if job is None or job.status in ("cancelled", "failed"):
+            if job is not None and job.status == "failed":
+                st.error(f"The report could not be generated: {job.error}")
+            elif job is not None:
+                st.info("The report was cancelled.")
+            if not st.button("Generate PDF Report"):
+                return
+            # Reports in the report cache are returned at once, by a job that is already done.
+            job = st.session_state[key] = self.jobs.submit(
+                version, DatasetStore.current_frame(st.session_state), *selection, max_workers=self.max_workers
+            )
 
-            pdf_buffer = ReportGenerator.create_pdf_report(df, plot_cols, heatmap_cols, hist_cols)
+        if job.status == "done":
+            # The report may be spooled to disk, so it is read only when the download is requested.
             st.download_button(
                 label="Download PDF Report",
-                data=pdf_buffer,
+                data=lambda: job.result().read(),
                 file_name="data_report.pdf",
                 mime="application/pdf",
             )
+            return
+
+        st.fragment(self._render_progress, run_every=self.POLL_SECONDS)(job)
+
+    def _render_progress(self, job: ReportJob) -> None:
+        """
+        Renders the progress of a running report job, refreshed on its own until the job stops.
+
+        Args:
+            job (ReportJob): The running job.
+        """
+        if st.button("Cancel Report"):
+            job.cancel()
+        if job.status != "running":
+            st.rerun()
+        st.progress(job.progress, text=f"Generating report: page {job.pages_written} of {job.pages_total or '?'}")
@@ -4,6 +4,7 @@ import pandas as pd
 import streamlit as st
 
 from ..data.generator import DatasetGenerator
+from ..data.store import DatasetStore
 from .base import Component
 
 
@@ -53,6 +54,5 @@ class FileGeneratorUI(Component):
             elif selected_distribution == "random":
                 data = DatasetGenerator.generate_random_integers(size, params["rnd_lb"], params["rnd_ub"])
 
-            st.session_state["original_df"] = data.copy()
-            st.session_state["df"] = data.copy()
+            DatasetStore.load(st.session_state, data)
             st.session_state["uploaded_file_name"] = f"{selected_distribution}_{time.time_ns()}.csv"
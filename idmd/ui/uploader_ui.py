@@ -1,5 +1,7 @@
 """Module for file uploader component."""
 
+from typing import List, Optional
+
 import streamlit as st
 
 from ..data.uploader import FileUploader
@@ -9,17 +11,26 @@ from .base import Component
 class FileUploaderUI(Component):
     """Provides UI for file uploading."""
 
-    def __init__(self, position: int = 0, file_types=None, default_file=None) -> None:
+    def __init__(
+        self, position: int = 0, file_types=None, default_file=None, chunk_size=None, cache=None, compact=False
+    ) -> None:
         """
         Initializes the FileUploaderUI component with a specific position, file types, and a default file.
 
         Args:
             position (int): The column position of the component. Defaults to 0.
-            file_types (list, optional): List of allowed file types for upload. Defaults to ["csv", "xlsx"].
+            file_types (list, optional): List of allowed file types for upload.
+                Defaults to ["csv", "xlsx", "parquet", "feather", "arrow"].
             default_file (str, optional): Path to a default file to load if no file is uploaded. Defaults to None.
+            chunk_size (int, optional): Number of rows parsed per batch when reading CSV files. Defaults to None.
+            cache (ParseCache, optional): Cache of parsed files keyed by content. Defaults to the parse cache
+                shared by all sessions of the server.
+            compact (bool): Whether to convert loaded data to compact dtypes. Defaults to False.
         """
         super().__init__(position)
-        self.uploader = FileUploader(file_types=file_types, default_file=default_file)
+        self.uploader = FileUploader(
+            file_types=file_types, default_file=default_file, chunk_size=chunk_size, cache=cache, compact=compact
+        )
 
     def render(self) -> None:
         """
@@ -29,14 +40,59 @@ class FileUploaderUI(Component):
         """
         st.header("File Upload")
         uploaded_file = st.file_uploader(
-            "Upload a CSV or Excel file", type=self.uploader.file_types, key="file_uploader"
+            "Upload a CSV, Excel, Parquet or Feather file", type=self.uploader.file_types, key="file_uploader"
         )
 
-        if uploaded_file and self.uploader.is_new_file(uploaded_file, st.session_state):
-            self.uploader.process_upload(uploaded_file, st.session_state)
+        if uploaded_file:
+            all_columns = self._get_columns(uploaded_file)
+            selected = st.multiselect(
+                "Columns to Load", all_columns, default=all_columns, key=f"upload_columns_{uploaded_file.name}"
+            )
 
-        if self.uploader.default_file and not st.session_state.get("df"):
+            if not selected:
+                st.warning("Please select at least one column to load.")
+            else:
+                columns = None if len(selected) == len(all_columns) else selected
+                if self.uploader.is_new_file(uploaded_file, st.session_state, columns):
+                    self._process_upload(uploaded_file, columns)
+
+        if self.uploader.default_file and "df" not in st.session_state:
             try:
                 self.uploader.load_default_file(st.session_state)
             except ValueError as e:
                 st.error(str(e))
+
+    def _get_columns(self, uploaded_file) -> List[str]:
+        """
+        Returns the column names of the uploaded file, reading them only once per file.
+
+        Args:
+            uploaded_file: The uploaded file.
+
+        Returns:
+            List[str]: The column names of the file.
+        """
+        file_key = uploaded_file.file_id
+        cached = st.session_state.get("uploaded_file_schema")
+        if cached is None or cached[0] != file_key:
+            cached = (file_key, self.uploader.get_columns(uploaded_file))
+            st.session_state["uploaded_file_schema"] = cached
+        return cached[1]
+
+    def _process_upload(self, uploaded_file, columns: Optional[List[str]]) -> None:
+        """
+        Loads the uploaded file while showing a progress bar.
+
+        Args:
+            uploaded_file: The uploaded file.
+            columns (Optional[List[str]]): Columns to load, or None for all columns.
+        """
+        progress_text = f"Loading {uploaded_file.name}..."
+        progress_bar = st.progress(0.0, text=progress_text)
+        self.uploader.process_upload(
+            uploaded_file,
+            st.session_state,
+            columns=columns,
+            progress_callback=lambda fraction: progress_bar.progress(fraction, text=progress_text),
+        )
+        progress_bar.empty()
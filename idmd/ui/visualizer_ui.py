@@ -1,10 +1,14 @@
 """Module for data visualizer component."""
 
-from typing import List
+from concurrent.futures import as_completed
+from typing import Any, Callable, List, Optional, Tuple
 
 import streamlit as st
 from pandas import DataFrame
 
+from ..data.store import DatasetStore
+from ..visualization.aggregation import ChartData
+from ..visualization.cache import FIGURE_CACHE, FigureCache
 from ..visualization.visualizer import DataVisualizer
 from .base import Component
 
@@ -12,6 +16,37 @@ from .base import Component
 class DataVisualizerUI(Component):
     """UI component for rendering data visualizations."""
 
+    BACKENDS = ("matplotlib", "vega")
+
+    def __init__(
+        self,
+        position: int = 0,
+        image_format: str = "png",
+        cache: Optional[FigureCache] = None,
+        backend: str = "matplotlib",
+    ) -> None:
+        """
+        Initializes the DataVisualizerUI component.
+
+        Args:
+            position (int): The column position of the component. Defaults to 0.
+            image_format (str): The format figures are rendered in, "png" or "svg". Defaults to "png".
+            cache (FigureCache, optional): Cache of rendered figures. Defaults to the figure cache shared by all
+                sessions of the server.
+            backend (str): How line plots, histograms and bar plots are drawn: "matplotlib" renders images on the
+                server, "vega" sends only the aggregated data (see `ChartData`) to Streamlit's native charts, which
+                are drawn by the browser. Other plots are always rendered with matplotlib. Defaults to "matplotlib".
+
+        Raises:
+            ValueError: If the backend is not supported.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported chart backend: {backend}")
+        super().__init__(position)
+        self.image_format = image_format
+        self.cache = cache if cache is not None else FIGURE_CACHE
+        self.backend = backend
+
     def render(self) -> None:
         """
         Renders the UI for visualizing data.
@@ -22,62 +57,196 @@ class DataVisualizerUI(Component):
             st.warning("No dataset available. Please upload a dataset first.")
             return
 
-        df: DataFrame = st.session_state.df
+        # Each section is computed only while its toggle is on, so reruns triggered by other components cost
+        # nothing here, and the dataset is not even materialized while all sections are off.
+        if self._section("Show Dataset Overview"):
+            self._render_overview(DatasetStore.current_frame(st.session_state))
 
-        # Overview Section
-        self._render_overview(df)
+        st.subheader("Visualization Options")
+        if self._section("Show Default Plots"):
+            self._render_default_plots(DatasetStore.current_frame(st.session_state))
+        if self._section("Show Custom Visualization Builder"):
+            self._render_custom_plots(DatasetStore.current_frame(st.session_state))
 
-        # Visualization Options
-        self._render_visualization_options(df)
+    def _section(self, label: str) -> bool:
+        """
+        Renders the toggle of a lazily computed section.
+
+        Args:
+            label (str): The label of the toggle.
+
+        Returns:
+            bool: Whether the section is to be rendered.
+        """
+        return st.toggle(label, key=f"visualizer_{self.position}_{label}")
 
     def _render_overview(self, df: DataFrame) -> None:
         """
-        Renders the overview of the dataset.
+        Renders the overview of the dataset, computed once per version of the dataset.
         """
         st.subheader("Dataset Overview")
-        overview: DataFrame = DataVisualizer.generate_overview(df)
-        st.dataframe(overview)
-
-    def _render_visualization_options(self, df: DataFrame) -> None:
+        version = st.session_state.get("df_version")
+        key = f"_visualizer_{self.position}_overview"
+        cached = st.session_state.get(key)
+        if cached is None or version is None or cached[0] != version:
+            cached = st.session_state[key] = (version, DataVisualizer.generate_overview(df))
+        st.dataframe(cached[1])
+
+    def _render_default_plots(self, df: DataFrame) -> None:
         """
-        Renders the visualization options, including default and custom plots.
+        Renders the default plots of the first numeric columns.
         """
-        st.subheader("Visualization Options")
+        default_plot_cols: List[str] = df.select_dtypes(include="number").columns.tolist()[:10]
 
-        # Default Plots
-        numeric_cols: List[str] = df.select_dtypes(include="number").columns.tolist()
-        default_plot_cols: List[str] = numeric_cols[:10]
-
-        if default_plot_cols:
+        if default_plot_cols and self.backend == "vega":
             st.write("### Default Line Plot (First 10 Numeric Columns)")
-            fig = DataVisualizer.generate_line_plot(df, default_plot_cols)
-            st.pyplot(fig)
-
+            self._show_line_chart(df, default_plot_cols)
             st.write("### Default Correlation Heatmap (First 10 Numeric Columns)")
-            fig = DataVisualizer.generate_correlation_heatmap(df, default_plot_cols)
-            st.pyplot(fig)
-
+            self._show_figure(
+                "heatmap", default_plot_cols, lambda: DataVisualizer.generate_correlation_heatmap(df, default_plot_cols)
+            )
             st.write("### Default Histograms (First 10 Numeric Columns)")
-            fig = DataVisualizer.generate_histograms(df, default_plot_cols)
-            st.pyplot(fig)
+            self._show_histogram_charts(df, default_plot_cols)
+        elif default_plot_cols:
+            self._show_figures(
+                [
+                    (
+                        "### Default Line Plot (First 10 Numeric Columns)",
+                        "line",
+                        lambda: DataVisualizer.generate_line_plot(df, default_plot_cols),
+                    ),
+                    (
+                        "### Default Correlation Heatmap (First 10 Numeric Columns)",
+                        "heatmap",
+                        lambda: DataVisualizer.generate_correlation_heatmap(df, default_plot_cols),
+                    ),
+                    (
+                        "### Default Histograms (First 10 Numeric Columns)",
+                        "histograms",
+                        lambda: DataVisualizer.generate_histograms(df, default_plot_cols),
+                    ),
+                ],
+                default_plot_cols,
+            )
+
+    def _render_custom_plots(self, df: DataFrame) -> None:
+        """
+        Renders the builder of custom plots of selected columns.
+        """
+        numeric_cols: List[str] = df.select_dtypes(include="number").columns.tolist()
 
-        # Custom Plots
         st.write("### Custom Visualization Builder")
 
         # Custom Line Plot
         selected_plot_cols: List[str] = st.multiselect("Select Columns for Line Plot", numeric_cols)
         if selected_plot_cols and st.button("Generate Line Plot"):
-            fig = DataVisualizer.generate_line_plot(df, selected_plot_cols)
-            st.pyplot(fig)
+            if self.backend == "vega":
+                self._show_line_chart(df, selected_plot_cols)
+            else:
+                self._show_figure(
+                    "line", selected_plot_cols, lambda: DataVisualizer.generate_line_plot(df, selected_plot_cols)
+                )
 
         # Custom Correlation Heatmap
         selected_heatmap_cols: List[str] = st.multiselect("Select Columns for Correlation Heatmap", numeric_cols)
+        cluster: bool = st.checkbox("Group Correlated Columns")
+        top_k: int = st.number_input("Strongest Pairs to Highlight", min_value=0, max_value=50, value=0)
         if selected_heatmap_cols and st.button("Generate Correlation Heatmap"):
-            fig = DataVisualizer.generate_correlation_heatmap(df, selected_heatmap_cols)
-            st.pyplot(fig)
+            self._show_figure(
+                f"heatmap(cluster={cluster}, top_k={top_k})",
+                selected_heatmap_cols,
+                lambda: DataVisualizer.generate_correlation_heatmap(df, selected_heatmap_cols, cluster, top_k),
+            )
 
         # Custom Histograms
         selected_hist_cols: List[str] = st.multiselect("Select Columns for Histograms", numeric_cols)
         if selected_hist_cols and st.button("Generate Histograms"):
-            fig = DataVisualizer.generate_histograms(df, selected_hist_cols)
-            st.pyplot(fig)
+            if self.backend == "vega":
+                self._show_histogram_charts(df, selected_hist_cols)
+            else:
+                self._show_figure(
+                    "histograms", selected_hist_cols, lambda: DataVisualizer.generate_histograms(df, selected_hist_cols)
+                )
+
+        # Custom Bar Plot
+        bar_col: Optional[str] = st.selectbox("Select Column for Bar Plot", df.columns.tolist(), index=None)
+        if bar_col is not None and st.button("Generate Bar Plot"):
+            if self.backend == "vega":
+                st.bar_chart(ChartData.bar(df, bar_col), sort=False)
+            else:
+                self._show_figure("bar", [bar_col], lambda: DataVisualizer.generate_bar_plot(df, bar_col))
+
+        # Custom Density Plot
+        density_cols: List[str] = st.multiselect("Select Two Columns for Density Plot", numeric_cols, max_selections=2)
+        if len(density_cols) == 2 and st.button("Generate Density Plot"):
+            st.session_state["custom_density_cols"] = density_cols
+            self._show_figure("density", density_cols, lambda: DataVisualizer.generate_density_plot(df, *density_cols))
+
+    def _show_line_chart(self, df: DataFrame, columns: List[str]) -> None:
+        """
+        Displays a line chart drawn by the browser, sending only the decimated rows of the columns.
+
+        Args:
+            df (DataFrame): The DataFrame containing the data.
+            columns (List[str]): The columns to include in the line chart.
+        """
+        st.line_chart(ChartData.line(df, columns), x_label="Index", y_label="Values")
+
+    def _show_histogram_charts(self, df: DataFrame, columns: List[str]) -> None:
+        """
+        Displays histograms drawn by the browser, three per row, sending only their bin counts.
+
+        Args:
+            df (DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+        """
+        histograms = ChartData.histograms(df, columns)
+        for start in range(0, len(columns), 3):
+            row = columns[slice(start, start + 3)]
+            for container, col in zip(st.columns(3), row):
+                container.write(f"Histogram of {col}")
+                container.bar_chart(histograms[col], x_label="Values", y_label="Frequency")
+
+    def _show_figure(self, plot_type: str, columns: List[str], draw: Callable) -> None:
+        """
+        Displays a figure, rendering it only if it is not cached for the current version of the dataset.
+
+        Args:
+            plot_type (str): The type of the plot, e.g. "line" or "heatmap".
+            columns (List[str]): The columns the figure shows.
+            draw (Callable[[], Figure]): Draws the figure.
+        """
+        version = st.session_state.get("df_version")
+        self._show_image(st, self.cache.render(version, plot_type, columns, draw, self.image_format))
+
+    def _show_figures(self, figures: List[Tuple[str, str, Callable]], columns: List[str]) -> None:
+        """
+        Displays several figures, rendering them concurrently and showing each one as soon as it is ready.
+
+        Every figure gets its heading and a placeholder in the given order first, so the layout does not move
+        while the figures arrive.
+
+        Args:
+            figures (List[Tuple[str, str, Callable]]): The heading, plot type and drawing function of every figure.
+            columns (List[str]): The columns the figures show.
+        """
+        version = st.session_state.get("df_version")
+        placeholders = {}
+        for heading, plot_type, draw in figures:
+            st.write(heading)
+            placeholder = st.empty()
+            placeholder.caption("Rendering...")
+            placeholders[self.cache.submit(version, plot_type, columns, draw, self.image_format)] = placeholder
+
+        for future in as_completed(placeholders):
+            self._show_image(placeholders[future], future.result())
+
+    def _show_image(self, container: Any, image: bytes) -> None:
+        """
+        Displays a rendered figure.
+
+        Args:
+            container (Any): The Streamlit container to display the image in, e.g. `st` or a placeholder.
+            image (bytes): The rendered figure, in the format of the component.
+        """
+        container.image(image.decode() if self.image_format == "svg" else image, width="stretch")
@@ -1,4 +1,4 @@
 """
 This module handles data visualization.
-Contains the following submodules: heatmaps.py, histograms.py, plots.py, visualizer.py
+Contains the following submodules: aggregation.py, cache.py, decimation.py, density.py, heatmaps.py, histograms.py, plots.py, render.py, visualizer.py
 """
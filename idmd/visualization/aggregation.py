@@ -0,0 +1,83 @@
+"""Module for chart data aggregation."""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..data.stats import STATS_CACHE
+from .decimation import DEFAULT_MAX_POINTS, Decimator
+from .histograms import HistogramGenerator
+from .plots import DEFAULT_TOP_K, PlotGenerator
+
+
+class ChartData:
+    """
+    Aggregates data for charts that are drawn by the client, e.g. Streamlit's native Vega-Lite charts.
+
+    The server only reduces the data to what the chart shows (decimated series, bin counts, most frequent values),
+    which is small whatever the size of the dataset, and is cached per column of each dataset version.
+    """
+
+    @staticmethod
+    def line(
+        df: pd.DataFrame, columns: List[str], max_points: int = DEFAULT_MAX_POINTS, method: str = "minmax"
+    ) -> pd.DataFrame:
+        """
+        Returns the rows of the specified columns to draw as a line chart.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The columns to include in the line chart.
+            max_points (int): The number of points to keep per column (see `Decimator`). Defaults to 2000.
+            method (str): The decimation method, "minmax" or "lttb". Defaults to "minmax".
+
+        Returns:
+            pd.DataFrame: The selected rows of the columns, indexed by their original index.
+
+        Raises:
+            KeyError: If any of the columns is missing, before anything is cached.
+        """
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(missing)
+        return STATS_CACHE.joint(
+            df, ("decimated", max_points, method), columns, lambda: Decimator.decimate(df, columns, max_points, method)
+        )
+
+    @staticmethod
+    def histograms(df: pd.DataFrame, columns: List[str], bins: int = 20) -> Dict[str, pd.DataFrame]:
+        """
+        Returns the histogram of every specified column, to draw as a bar chart.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+            bins (int): The number of equal-width bins per column. Defaults to 20.
+
+        Returns:
+            Dict[str, pd.DataFrame]: The counts of every column in a "Frequency" column, indexed by the bin centers.
+        """
+        return {
+            col: pd.DataFrame({"Frequency": counts}, index=pd.Index((edges[:-1] + edges[1:]) / 2, name=col))
+            for col, (counts, edges) in HistogramGenerator.compute_histograms(df, columns, bins).items()
+        }
+
+    @staticmethod
+    def bar(df: pd.DataFrame, column: str, top_k: int = DEFAULT_TOP_K) -> pd.DataFrame:
+        """
+        Returns the counts of the most frequent values of a column, to draw as a bar chart.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            column (str): The column to count.
+            top_k (int): The number of most frequent values, the others being grouped as "Other". Defaults to 20.
+
+        Returns:
+            pd.DataFrame: The counts in a "Frequency" column, indexed by the values as strings, in decreasing
+                order with "Other" last.
+        """
+        counts = PlotGenerator.top_counts(df, column, top_k)
+        return pd.DataFrame(
+            {"Frequency": counts.to_numpy(dtype=np.int64)}, index=pd.Index(counts.index.astype(str), name=column)
+        )
@@ -0,0 +1,122 @@
+"""Module for caching rendered figures."""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Sequence
+
+from matplotlib.figure import Figure
+
+from ..data.cache import LRUCache
+from .render import RENDER_POOL, RenderPool
+
+
+class FigureCache:
+    """
+    Caches rendered figures as PNG or SVG bytes, keyed by dataset version, plot type and columns.
+
+    A figure is drawn and rendered only the first time it is requested for a version of the dataset; later
+    requests, e.g. on every Streamlit rerun, return the cached image. Concurrent requests for the same figure,
+    e.g. from several sessions, wait for a single rendering. The least recently used images are evicted once the
+    cache exceeds its memory limit.
+    """
+
+    FORMATS = ("png", "svg")
+
+    def __init__(self, max_bytes: int = 128 << 20, dpi: int = 200, pool: Optional[RenderPool] = None) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the cached images in bytes. Defaults to 128 MiB.
+            dpi (int): The resolution of PNG images. Defaults to 200, as used by `st.pyplot`.
+            pool (RenderPool, optional): The pool figures are drawn and rendered on. Defaults to the render pool
+                shared by all sessions of the server.
+        """
+        self.images = LRUCache(max_bytes, sizeof=len)
+        self.dpi = dpi
+        self.pool = pool if pool is not None else RENDER_POOL
+        self._pending: "Dict[Hashable, Future[bytes]]" = {}
+        self._lock = threading.RLock()
+
+    def render(
+        self,
+        version: Optional[Hashable],
+        plot_type: str,
+        columns: Sequence[str],
+        draw: Callable[[], Figure],
+        fmt: str = "png",
+    ) -> bytes:
+        """
+        Returns the rendered image of a figure, drawing it only if it is not cached yet.
+
+        Args:
+            version (Optional[Hashable]): The version of the dataset the figure shows. Figures of an unknown
+                version (None) are drawn every time and not cached.
+            plot_type (str): The type of the plot, e.g. "line" or "heatmap".
+            columns (Sequence[str]): The columns the figure shows.
+            draw (Callable[[], Figure]): Draws the figure. It is disposed once rendered.
+            fmt (str): The image format, "png" or "svg". Defaults to "png".
+
+        Returns:
+            bytes: The rendered image.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        return self.submit(version, plot_type, columns, draw, fmt).result()
+
+    def submit(
+        self,
+        version: Optional[Hashable],
+        plot_type: str,
+        columns: Sequence[str],
+        draw: Callable[[], Figure],
+        fmt: str = "png",
+    ) -> "Future[bytes]":
+        """
+        Like `render`, but returns at once with a future of the image.
+
+        Args:
+            version (Optional[Hashable]): The version of the dataset the figure shows, or None if unknown.
+            plot_type (str): The type of the plot, e.g. "line" or "heatmap".
+            columns (Sequence[str]): The columns the figure shows.
+            draw (Callable[[], Figure]): Draws the figure. It is disposed once rendered.
+            fmt (str): The image format, "png" or "svg". Defaults to "png".
+
+        Returns:
+            Future[bytes]: The rendered image, already resolved if it is cached.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported image format: {fmt}")
+        if version is None:
+            return self.pool.submit(draw, fmt, self.dpi)
+
+        key = (version, plot_type, tuple(columns), fmt)
+        with self._lock:
+            image = self.images.get(key)
+            if image is not None:
+                cached: "Future[bytes]" = Future()
+                cached.set_result(image)
+                return cached
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self.pool.submit(draw, fmt, self.dpi)
+                future.add_done_callback(lambda done: self._finish(key, done))
+            return future
+
+    def clear(self) -> None:
+        """Removes all cached images."""
+        self.images.clear()
+
+    def _finish(self, key: Hashable, future: "Future[bytes]") -> None:
+        """Caches the image of a finished rendering, unless it failed."""
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.exception() is None:
+                self.images.put(key, future.result())
+
+
+FIGURE_CACHE = FigureCache()
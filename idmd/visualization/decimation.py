@@ -0,0 +1,130 @@
+"""Module for line plot decimation."""
+
+import math
+import warnings
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+
+
+class Decimator:
+    """
+    Reduces long series to the few points a line plot can actually show, keeping their peaks and shape.
+
+    Two methods are available, both vectorized across all selected columns:
+
+    - "minmax" splits the rows into buckets and keeps the rows of the minimum and maximum of every column in every
+      bucket, so every peak and trough stays visible.
+    - "lttb" (Largest-Triangle-Three-Buckets) keeps, per bucket, the row that forms the largest triangle with the
+      previously kept row and the average of the next bucket, which preserves the visual shape closely.
+
+    The rows kept for any column are kept for all columns, so the result is a subset of the rows of the input.
+    """
+
+    METHODS = ("minmax", "lttb")
+
+    @staticmethod
+    def decimate(
+        df: pd.DataFrame, columns: List[str], max_points: int = DEFAULT_MAX_POINTS, method: str = "minmax"
+    ) -> pd.DataFrame:
+        """
+        Selects the rows to plot for the specified columns.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The columns to plot.
+            max_points (int): The number of points to keep per column. Defaults to 2000.
+            method (str): The decimation method, "minmax" or "lttb". Defaults to "minmax".
+
+        Returns:
+            pd.DataFrame: The selected rows of the columns, with their original index. If the DataFrame has at most
+                `max_points` rows, all of them.
+
+        Raises:
+            ValueError: If the method is not supported.
+        """
+        if method not in Decimator.METHODS:
+            raise ValueError(f"Unsupported decimation method: {method}")
+
+        data = df[columns]
+        if len(data) <= max_points:
+            return data
+
+        values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == "minmax":
+            rows = Decimator.min_max(values, max(1, max_points // 2))
+        else:
+            rows = np.unique(Decimator.lttb(values, max(3, max_points)))
+        return data.iloc[rows]
+
+    @staticmethod
+    def min_max(values: np.ndarray, n_buckets: int) -> np.ndarray:
+        """
+        Finds the rows of the minimum and maximum of every column in equally sized buckets of rows.
+
+        Args:
+            values (np.ndarray): The columns as a float array of shape (rows, columns), with NaN for missing values.
+            n_buckets (int): The number of buckets.
+
+        Returns:
+            np.ndarray: The sorted positions of the selected rows, including the first and last row.
+        """
+        n_rows, n_cols = values.shape
+        size = math.ceil(n_rows / n_buckets)
+        n_buckets = math.ceil(n_rows / size)
+        padding = np.full((n_buckets * size - n_rows, n_cols), np.nan)
+        buckets = np.concatenate([values, padding]).reshape(n_buckets, size, n_cols)
+
+        missing = np.isnan(buckets)
+        lowest = np.where(missing, np.inf, buckets).argmin(axis=1)
+        highest = np.where(missing, -np.inf, buckets).argmax(axis=1)
+
+        offsets = np.arange(n_buckets)[:, np.newaxis] * size
+        rows = np.concatenate([[0, n_rows - 1], (offsets + lowest).ravel(), (offsets + highest).ravel()])
+        return np.unique(np.minimum(rows, n_rows - 1))
+
+    @staticmethod
+    def lttb(values: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        Selects rows with the Largest-Triangle-Three-Buckets algorithm, for all columns at once.
+
+        The row position is used as the x coordinate.
+
+        Args:
+            values (np.ndarray): The columns as a float array of shape (rows, columns), with NaN for missing values.
+            n_out (int): The number of rows to select per column, at least 3.
+
+        Returns:
+            np.ndarray: The positions of the selected rows, of shape (n_out, columns), increasing per column.
+        """
+        n_rows, n_cols = values.shape
+        if n_out >= n_rows:
+            return np.repeat(np.arange(n_rows)[:, np.newaxis], n_cols, axis=1)
+
+        edges = (np.arange(n_out - 1) * (n_rows - 2) / (n_out - 2)).astype(int) + 1
+        edges[-1] = n_rows - 1
+        selected = np.empty((n_out, n_cols), dtype=int)
+        selected[0], selected[-1] = 0, n_rows - 1
+        columns = np.arange(n_cols)
+        previous = np.zeros(n_cols, dtype=int)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for i in range(n_out - 2):
+                start, end = edges[i], edges[i + 1]
+                next_end = edges[i + 2] if i + 2 < len(edges) else n_rows
+                next_x = (end + next_end - 1) / 2
+                next_y = np.nanmean(values[end:next_end], axis=0)
+
+                x = np.arange(start, end)[:, np.newaxis]
+                previous_y = values[previous, columns]
+                area = np.abs(
+                    (previous - next_x) * (values[start:end] - previous_y) - (previous - x) * (next_y - previous_y)
+                )
+                previous = start + np.where(np.isnan(area), -np.inf, area).argmax(axis=0)
+                selected[i + 1] = previous
+
+        return selected
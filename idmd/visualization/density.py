@@ -0,0 +1,129 @@
+"""Module for 2D density plot generation."""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from ..data.stats import STATS_CACHE
+
+
+class DensityGenerator:
+    """Generates 2D binned density plots to compare two numeric columns."""
+
+    @staticmethod
+    def generate_density_plot(df: pd.DataFrame, x: str, y: str, bins: int = 100) -> Figure:
+        """
+        Generates a 2D density plot of two columns: the number of rows in every cell of a regular grid.
+
+        Unlike a scatter plot, the cost of drawing does not depend on the number of rows, and dense regions are
+        not hidden by overplotting. Counts are shown on a logarithmic color scale, and empty cells are left blank.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            x (str): The column on the horizontal axis.
+            y (str): The column on the vertical axis.
+            bins (int): The number of bins along each axis. Defaults to 100.
+
+        Returns:
+            Figure: The generated density plot.
+        """
+        return DensityGenerator.draw_density_plot(DensityGenerator.compute_density(df, x, y, bins), x, y)
+
+    @staticmethod
+    def draw_density_plot(density: Tuple[np.ndarray, np.ndarray, np.ndarray], x: str, y: str) -> Figure:
+        """
+        Draws a 2D density plot from a precomputed 2D histogram, e.g. in a process that does not have the data.
+
+        Args:
+            density (Tuple[np.ndarray, np.ndarray, np.ndarray]): The counts and bin edges of the two columns, as
+                returned by `compute_density`.
+            x (str): The column on the horizontal axis.
+            y (str): The column on the vertical axis.
+
+        Returns:
+            Figure: The density plot.
+        """
+        counts, x_edges, y_edges = density
+
+        fig = Figure()
+        ax = fig.subplots()
+        image = ax.imshow(
+            np.ma.masked_equal(counts.T, 0),
+            origin="lower",
+            extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+            aspect="auto",
+            interpolation="nearest",
+            cmap="viridis",
+            norm="log",
+        )
+        fig.colorbar(image, ax=ax, label="Count")
+        ax.set_title(f"Density of {y} vs {x}")
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+        return fig
+
+    @staticmethod
+    def compute_density(df: pd.DataFrame, x: str, y: str, bins: int = 100) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes the 2D histogram of two columns, cached per column of each dataset version.
+
+        Rows with a missing value in either column are ignored.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            x (str): The first column.
+            y (str): The second column.
+            bins (int): The number of bins along each axis. Defaults to 100.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The counts, of shape (bins, bins) and indexed by the bins of
+                `x` then `y`, and the bin edges of `x` and `y`, as returned by `np.histogram2d`.
+
+        Raises:
+            KeyError: If either column is missing, before anything is cached.
+        """
+        missing = [col for col in (x, y) if col not in df.columns]
+        if missing:
+            raise KeyError(missing)
+        return STATS_CACHE.joint(df, ("density", bins), [x, y], lambda: DensityGenerator._bin(df, x, y, bins))
+
+    @staticmethod
+    def _bin(df: pd.DataFrame, x: str, y: str, bins: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes the 2D histogram of two columns with a single `np.bincount` over the flattened cell indices.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            x (str): The first column.
+            y (str): The second column.
+            bins (int): The number of bins along each axis.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The counts and the bin edges of `x` and `y`.
+        """
+        values = [df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in (x, y)]
+        valid = ~(np.isnan(values[0]) | np.isnan(values[1]))
+        if not valid.all():
+            values = [column[valid] for column in values]
+
+        cells = np.zeros(len(values[0]), dtype=np.intp)
+        edges = []
+        for column in values:
+            low, high = (column.min(), column.max()) if len(column) else (0.0, 1.0)
+            # Like np.histogram2d, constant columns get a unit-wide range around their value.
+            low, high = (low - 0.5, high + 0.5) if low == high else (low, high)
+            edges.append(np.linspace(low, high, bins + 1))
+
+            positions = (column - low) * (bins / (high - low))
+            indices = positions.astype(np.intp)
+            np.clip(indices, 0, bins - 1, out=indices)
+            # Correct rounding next to the bin edges, as np.histogram does.
+            indices -= column < edges[-1][indices]
+            indices += (column >= edges[-1][indices + 1]) & (indices != bins - 1)
+            cells *= bins
+            cells += indices
+
+        counts = np.bincount(cells, minlength=bins * bins).reshape(bins, bins)
+        return counts, edges[0], edges[1]
@@ -2,28 +2,108 @@
 
 from typing import List
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+from ..data.correlation import CorrelationEngine
+from ..data.stats import STATS_CACHE
 
 
 class HeatmapGenerator:
     """Generates correlation heatmaps."""
 
+    ANNOTATE_MAX_COLUMNS = 20
+    MAX_ROWS = 200_000
+    MAX_TICK_LABELS = 60
+
     @staticmethod
-    def generate_correlation_heatmap(df: pd.DataFrame, columns: List[str]) -> plt.Figure:
+    def generate_correlation_heatmap(
+        df: pd.DataFrame, columns: List[str], cluster: bool = False, top_k: int = 0
+    ) -> Figure:
         """
         Generates a correlation heatmap for the specified columns.
 
+        Up to `ANNOTATE_MAX_COLUMNS` columns, the exact correlations are drawn as an annotated heatmap. Beyond that,
+        the correlations are computed by `CorrelationEngine` on at most `MAX_ROWS` sampled rows and drawn as a
+        single image without annotations.
+
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             columns (List[str]): The columns to include in the heatmap.
+            cluster (bool): Whether to order the columns so that strongly correlated ones are adjacent. Defaults
+                to False.
+            top_k (int): The number of most strongly correlated pairs to mark. Defaults to 0.
 
         Returns:
-            plt.Figure: The generated heatmap.
+            Figure: The generated heatmap.
         """
-        fig, ax = plt.subplots(figsize=(10, 8))
-        correlation_matrix = df[columns].corr()
-        sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", ax=ax)
+        if len(columns) <= HeatmapGenerator.ANNOTATE_MAX_COLUMNS:
+            correlation_matrix = STATS_CACHE.corr(df, columns)
+        else:
+            correlation_matrix, _ = CorrelationEngine.correlate(df, columns, HeatmapGenerator.MAX_ROWS)
+
+        if cluster:
+            order = CorrelationEngine.cluster_order(correlation_matrix.to_numpy())
+            correlation_matrix = correlation_matrix.iloc[order, order]
+
+        fig = Figure(figsize=(10, 8))
+        ax = fig.subplots()
+        if len(columns) <= HeatmapGenerator.ANNOTATE_MAX_COLUMNS:
+            sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", ax=ax)
+        else:
+            HeatmapGenerator._draw_image(ax, correlation_matrix)
+
+        if top_k > 0:
+            HeatmapGenerator._mark_pairs(ax, correlation_matrix, top_k)
         ax.set_title("Correlation Heatmap")
         return fig
+
+    @staticmethod
+    def _draw_image(ax: Axes, correlation_matrix: pd.DataFrame) -> None:
+        """
+        Draws a correlation matrix as a single image, labelling the columns only if there are few enough.
+
+        Args:
+            ax (Axes): The axes to draw on.
+            correlation_matrix (pd.DataFrame): The correlation matrix.
+        """
+        image = ax.imshow(
+            correlation_matrix.to_numpy(), cmap="coolwarm", vmin=-1, vmax=1, interpolation="nearest", aspect="auto"
+        )
+        ax.figure.colorbar(image, ax=ax)
+
+        labels = correlation_matrix.columns.astype(str)
+        if len(labels) <= HeatmapGenerator.MAX_TICK_LABELS:
+            ax.set_xticks(np.arange(len(labels)), labels, rotation=90, fontsize=6)
+            ax.set_yticks(np.arange(len(labels)), labels, fontsize=6)
+        else:
+            ax.set_xticks([])
+            ax.set_yticks([])
+
+    @staticmethod
+    def _mark_pairs(ax: Axes, correlation_matrix: pd.DataFrame, top_k: int) -> None:
+        """
+        Outlines the cells of the most strongly correlated pairs of columns, on both sides of the diagonal.
+
+        Args:
+            ax (Axes): The axes the heatmap is drawn on.
+            correlation_matrix (pd.DataFrame): The correlation matrix, in the order it is drawn.
+            top_k (int): The number of pairs to mark.
+        """
+        pairs = CorrelationEngine.top_pairs(correlation_matrix, top_k)
+        positions = {col: i for i, col in enumerate(correlation_matrix.columns)}
+        rows = pairs["Column 1"].map(positions).to_numpy()
+        cols = pairs["Column 2"].map(positions).to_numpy()
+        # seaborn centers cells on half-integers, imshow on integers.
+        offset = 0.5 if not ax.images else 0.0
+        ax.set_autoscale_on(False)
+        ax.scatter(
+            np.concatenate([cols, rows]) + offset,
+            np.concatenate([rows, cols]) + offset,
+            marker="s",
+            facecolors="none",
+            edgecolors="black",
+        )
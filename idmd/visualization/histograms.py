@@ -1,34 +1,59 @@
 """Module for histogram generation."""
 
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.figure import Figure
+
+from ..data.stats import STATS_CACHE
 
 
 class HistogramGenerator:
     """Generates histograms for numerical columns."""
 
+    TIGHT_LAYOUT_MAX_ROWS = 4
+    ROW_INCHES = 5.0
+    MAX_FIGURE_INCHES = 24.0
+    COMPACT_MIN_COLUMNS = 13
+    COMPACT_COLUMNS_PER_ROW = 8
+    COMPACT_ROW_INCHES = 0.8
+    CHUNK_ROWS = 1 << 20
+    KDE_GRID_SIZE = 512
+
     @staticmethod
-    def generate_histograms(df: pd.DataFrame, columns: List[str]) -> plt.Figure:
+    def generate_histograms(df: pd.DataFrame, columns: List[str], bins: int = 20) -> Figure:
         """
         Generates histograms for the specified columns.
 
+        The counts are precomputed for all columns at once (see `compute_histograms`) and drawn as a single
+        step artist per column. Rows are at most `ROW_INCHES` high and the figure at most `MAX_FIGURE_INCHES`, so
+        the rendered image stays bounded. From `COMPACT_MIN_COLUMNS` columns on, creating and drawing an axes per
+        histogram would take seconds, so all histograms are drawn in a single axes instead (see `_draw_compact`).
+
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             columns (List[str]): The columns to include in the histograms.
+            bins (int): The number of equal-width bins per column. Defaults to 20.
 
         Returns:
-            plt.Figure: The generated histograms.
+            Figure: The generated histograms.
         """
+        histograms = HistogramGenerator.compute_histograms(df, columns, bins)
+        if len(columns) >= HistogramGenerator.COMPACT_MIN_COLUMNS:
+            return HistogramGenerator._draw_compact(histograms, columns)
+
         n_cols = 3
         n_rows = (len(columns) + n_cols - 1) // n_cols
-        fig, axs = plt.subplots(n_rows, n_cols, figsize=(15, 5 * n_rows))
+        row_inches = min(HistogramGenerator.ROW_INCHES, HistogramGenerator.MAX_FIGURE_INCHES / max(n_rows, 1))
+        fig = Figure(figsize=(15, row_inches * n_rows))
+        axs = fig.subplots(n_rows, n_cols, squeeze=False)
 
         axs = axs.flatten()
 
         for idx, col in enumerate(columns):
-            axs[idx].hist(df[col].dropna(), bins=20, alpha=0.7, color="blue")
+            counts, edges = histograms[col]
+            axs[idx].stairs(counts, edges, fill=True, alpha=0.7, color="blue")
             axs[idx].set_title(f"Histogram of {col}")
             axs[idx].set_xlabel("Values")
             axs[idx].set_ylabel("Frequency")
@@ -37,5 +62,255 @@ class HistogramGenerator:
         for i in range(len(columns), len(axs)):
             axs[i].axis("off")
 
-        fig.tight_layout()
+        # Laying out many axes with tight_layout costs seconds, so large grids use fixed spacing instead.
+        if n_rows <= HistogramGenerator.TIGHT_LAYOUT_MAX_ROWS:
+            fig.tight_layout()
+        else:
+            fig.subplots_adjust(left=0.05, right=0.98, top=0.99, bottom=0.01, wspace=0.3, hspace=0.4)
+        return fig
+
+    @staticmethod
+    def _draw_compact(histograms: Dict[str, Tuple[np.ndarray, np.ndarray]], columns: List[str]) -> Figure:
+        """
+        Draws many histograms as a grid of cells in a single axes, without ticks.
+
+        Every histogram is scaled to its cell, and its label gives the column, the range of the bins and the
+        highest count, which the ticks of separate axes would otherwise show.
+
+        Args:
+            histograms (Dict[str, Tuple[np.ndarray, np.ndarray]]): The counts and bin edges of every column.
+            columns (List[str]): The columns, in drawing order.
+
+        Returns:
+            Figure: The histograms.
+        """
+        n_cols = HistogramGenerator.COMPACT_COLUMNS_PER_ROW
+        n_rows = (len(columns) + n_cols - 1) // n_cols
+        height = min(HistogramGenerator.COMPACT_ROW_INCHES * n_rows, HistogramGenerator.MAX_FIGURE_INCHES)
+        fig = Figure(figsize=(15, height))
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+
+        for idx, col in enumerate(columns):
+            row, position = divmod(idx, n_cols)
+            counts, edges = histograms[col]
+            peak = max(int(counts.max(initial=0)), 1)
+            baseline = -row - 0.95
+            x = np.linspace(position + 0.05, position + 0.95, len(edges))
+            ax.stairs(baseline + 0.55 * counts / peak, x, baseline=baseline, fill=True, alpha=0.7, color="blue")
+            label = f"{col}\n[{edges[0]:.4g}, {edges[-1]:.4g}], max {peak}"
+            ax.text(position + 0.5, -row - 0.05, label, ha="center", va="top", fontsize=7)
+
+        ax.set_xlim(0, n_cols)
+        ax.set_ylim(-n_rows, 0)
         return fig
+
+    @staticmethod
+    def compute_histograms(
+        df: pd.DataFrame, columns: List[str], bins: int = 20
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Computes equal-width histograms of several columns, cached per column of each dataset version.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+            bins (int): The number of bins per column. Defaults to 20.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: The counts and bin edges of every column, as returned by
+                `np.histogram(df[col].dropna(), bins)`.
+
+        Raises:
+            KeyError: If any of the columns is missing, before anything is cached.
+        """
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(missing)
+        return STATS_CACHE.per_column(
+            df, ("histogram", bins), columns, lambda missing: HistogramGenerator._bin(df, missing, bins)
+        )
+
+    @staticmethod
+    def _bin(df: pd.DataFrame, columns: List[str], bins: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Computes the histograms of several columns in one vectorized pass over their values.
+
+        The rows are read in chunks of `CHUNK_ROWS` (see `_chunks`), once to find the range of every column and
+        once to count its values, so the memory used does not grow with the number of rows.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+            bins (int): The number of bins per column.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: The counts and bin edges of every column.
+        """
+        n_cols = len(columns)
+
+        # NaN as initial value ignores missing values and leaves NaN for columns without values.
+        low, high = np.full(n_cols, np.nan), np.full(n_cols, np.nan)
+        for values in HistogramGenerator._chunks(df, columns):
+            low = np.fmin(low, np.fmin.reduce(values, axis=0, initial=np.nan))
+            high = np.fmax(high, np.fmax.reduce(values, axis=0, initial=np.nan))
+        empty = np.isnan(low)
+        low, high = np.where(empty, 0.0, low), np.where(empty, 1.0, high)
+        # Like np.histogram, constant columns get a unit-wide range around their value.
+        constant = low == high
+        low, high = np.where(constant, low - 0.5, low), np.where(constant, high + 0.5, high)
+        edges = np.linspace(low, high, bins + 1, axis=1)
+
+        counts = np.zeros(n_cols * (bins + 1), dtype=np.intp)
+        for values in HistogramGenerator._chunks(df, columns):
+            positions = values - low
+            positions *= bins / (high - low)
+            fraction = positions.copy()
+            np.floor(positions, out=positions)
+            fraction -= positions
+            np.clip(positions, 0, bins - 1, out=positions)
+
+            # Correct rounding at the bin edges, as np.histogram does, only for the few values next to an edge.
+            near = np.nonzero((fraction < 1e-6) | (fraction > 1 - 1e-6))
+            cols, candidates, candidate_values = near[1], positions[near].astype(np.intp), values[near]
+            candidates -= candidate_values < edges[cols, candidates]
+            candidates += (candidate_values >= edges[cols, candidates + 1]) & (candidates != bins - 1)
+            positions[near] = candidates
+
+            # Missing values go to an extra bin per column that is dropped afterwards.
+            positions[np.isnan(values)] = bins
+            positions += np.arange(n_cols) * (bins + 1)
+            counts += np.bincount(positions.astype(np.intp).ravel(order="K"), minlength=len(counts))
+
+        counts = counts.reshape(n_cols, bins + 1)[:, :bins]
+        return {col: (counts[i], edges[i]) for i, col in enumerate(columns)}
+
+    @staticmethod
+    def _chunks(df: pd.DataFrame, columns: List[str]) -> Iterator[np.ndarray]:
+        """
+        Reads the values of several columns in chunks of `CHUNK_ROWS` rows.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+
+        Yields:
+            np.ndarray: The values of the next rows as floats, one column per column, with NaN for missing values.
+                It may share memory with the DataFrame, so it must not be modified.
+        """
+        for start in range(0, len(df), HistogramGenerator.CHUNK_ROWS):
+            rows = df.iloc[slice(start, start + HistogramGenerator.CHUNK_ROWS)][columns]
+            yield rows.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def compute_kdes(
+        df: pd.DataFrame, columns: List[str], grid_size: int = KDE_GRID_SIZE, cut: float = 3.0
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Estimates the Gaussian kernel density of several columns, cached per column of each dataset version.
+
+        The bandwidth follows Scott's rule, as in `sns.kdeplot`, and the estimate spans the range of the values
+        extended by `cut` bandwidths on both sides. Instead of summing a kernel per value, the values are binned
+        on an even grid and the bin weights are convolved with the kernel by FFT (see `_kde`), so the cost after
+        one pass over the values does not depend on the number of rows.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+            grid_size (int): The number of grid points the density is evaluated at. Defaults to 512.
+            cut (float): How many bandwidths the grid extends beyond the range of the values. Defaults to 3.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: The grid points and the density at them of every column.
+                Both are empty for columns with fewer than two distinct values.
+
+        Raises:
+            KeyError: If any of the columns is missing, before anything is cached.
+        """
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(missing)
+        return STATS_CACHE.per_column(
+            df, ("kde", grid_size, cut), columns, lambda missing: HistogramGenerator._kde(df, missing, grid_size, cut)
+        )
+
+    @staticmethod
+    def _kde(
+        df: pd.DataFrame, columns: List[str], grid_size: int, cut: float
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Estimates the kernel density of several columns by binning and FFT convolution, vectorized across columns.
+
+        Every value is split between its two nearest grid points in proportion to its distance to them (linear
+        binning), which keeps the error far below the resolution of a plot. The rows are read in chunks of
+        `CHUNK_ROWS` (see `_chunks`), once for the range and moments of every column and once to bin its values, so
+        the memory used does not grow with the number of rows.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            columns (List[str]): The numeric columns.
+            grid_size (int): The number of grid points.
+            cut (float): How many bandwidths the grid extends beyond the range of the values.
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: The grid points and the density at them of every column.
+        """
+        n_cols = len(columns)
+
+        # The moments are accumulated over the values shifted by the first value seen in each column, which keeps
+        # the sum of squares accurate for values far from zero.
+        count = np.zeros(n_cols, dtype=np.intp)
+        low, high, shift = np.full(n_cols, np.nan), np.full(n_cols, np.nan), np.full(n_cols, np.nan)
+        total, squares = np.zeros(n_cols), np.zeros(n_cols)
+        for values in HistogramGenerator._chunks(df, columns):
+            count += np.count_nonzero(~np.isnan(values), axis=0)
+            low = np.fmin(low, np.fmin.reduce(values, axis=0, initial=np.nan))
+            high = np.fmax(high, np.fmax.reduce(values, axis=0, initial=np.nan))
+            shift = np.where(np.isnan(shift), low, shift)
+            centered = values - shift
+            total += np.nansum(centered, axis=0)
+            squares += np.nansum(centered * centered, axis=0)
+
+        # Scott's rule, only for the columns with at least two values.
+        valid = count > 1
+        variance = np.zeros(n_cols)
+        np.divide(squares - total * total / np.maximum(count, 1), count - 1, out=variance, where=valid)
+        bandwidth = np.sqrt(np.maximum(variance, 0.0)) * np.maximum(count, 1) ** (-1 / 5)
+        valid &= bandwidth > 0
+        bandwidth = np.where(valid, bandwidth, 1.0)
+        low = np.where(valid, low, 0.0) - cut * bandwidth
+        high = np.where(valid, high, 0.0) + cut * bandwidth
+        step = (high - low) / (grid_size - 1)
+
+        # Linear binning: each value adds 1 - w to the grid point below it and w to the one above.
+        weights = np.zeros(n_cols * grid_size)
+        offsets = np.arange(n_cols) * grid_size
+        for values in HistogramGenerator._chunks(df, columns):
+            positions = values - low
+            positions /= step
+            missing = np.isnan(positions)
+            positions[missing] = 0.0
+            below = np.clip(np.floor(positions), 0, grid_size - 2)
+            above_weight = np.where(missing, 0.0, positions - below)
+            below_weight = np.where(missing, 0.0, 1.0 - above_weight)
+            indices = (below.astype(np.intp) + offsets).ravel()
+            weights += np.bincount(indices, below_weight.ravel(), minlength=len(weights))
+            weights += np.bincount(indices + 1, above_weight.ravel(), minlength=len(weights))
+        weights = weights.reshape(n_cols, grid_size)
+
+        # Convolve with the kernel sampled at every grid offset; zero padding avoids wrapping around the grid.
+        size = 1 << (2 * grid_size - 1).bit_length()
+        distances = np.arange(grid_size) * step[:, None] / bandwidth[:, None]
+        kernel = np.zeros((n_cols, size))
+        kernel[:, :grid_size] = np.exp(-0.5 * distances**2)
+        kernel[:, slice(size - grid_size + 1, None)] = kernel[:, slice(grid_size - 1, 0, -1)]
+        # The sampled kernel is normalized on the grid rather than analytically, so the estimate integrates to 1
+        # even when the grid is coarser than the bandwidth, e.g. when an outlier stretches the range.
+        kernel /= kernel.sum(axis=1, keepdims=True) * step[:, None]
+        density = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)[:, :grid_size]
+        density /= np.maximum(count, 1)[:, None]
+        np.clip(density, 0, None, out=density)
+
+        grid = np.linspace(low, high, grid_size, axis=1)
+        empty = np.empty(0)
+        return {col: (grid[i], density[i]) if valid[i] else (empty, empty) for i, col in enumerate(columns)}
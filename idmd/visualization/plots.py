@@ -1,48 +1,112 @@
 """Module for plot generation."""
 
-from typing import List
+from typing import List, Optional
 
-import matplotlib.pyplot as plt
 import pandas as pd
+from matplotlib.figure import Figure
+
+from ..data.stats import STATS_CACHE
+from ..manipulation.sketch import HeavyHitters
+from .decimation import Decimator
+
+DEFAULT_TOP_K = 20
 
 
 class PlotGenerator:
     """Generates various types of plots."""
 
     @staticmethod
-    def generate_line_plot(df: pd.DataFrame, columns: List[str]) -> plt.Figure:
+    def generate_line_plot(
+        df: pd.DataFrame, columns: List[str], max_points: Optional[int] = None, method: str = "minmax"
+    ) -> Figure:
         """
         Generates a line plot for the specified columns.
 
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             columns (List[str]): The columns to include in the line plot.
+            max_points (int, optional): The number of points to plot per column at most; longer series are
+                decimated first (see `Decimator`). Defaults to None, which plots every row.
+            method (str): The decimation method, "minmax" or "lttb". Defaults to "minmax".
 
         Returns:
-            plt.Figure: The generated line plot.
+            Figure: The generated line plot.
         """
-        fig, ax = plt.subplots()
-        df[columns].plot(ax=ax)
+        fig = Figure()
+        ax = fig.subplots()
+        data = Decimator.decimate(df, columns, max_points, method) if max_points else df[columns]
+        data.plot(ax=ax)
         ax.set_title("Line Plot")
         ax.set_xlabel("Index")
         ax.set_ylabel("Values")
         return fig
 
     @staticmethod
-    def generate_bar_plot(df: pd.DataFrame, column: str) -> plt.Figure:
+    def generate_bar_plot(df: pd.DataFrame, column: str, top_k: Optional[int] = DEFAULT_TOP_K) -> Figure:
         """
         Generates a bar plot for the specified column.
 
+        The most frequent values are found with a `HeavyHitters` summary counted in chunks, so high-cardinality
+        columns are plotted without counting every distinct value at once. The counts are exact unless the column
+        has more than `max(1000, 50 * top_k)` distinct values, in which case they may be slightly overestimated.
+        All other values are grouped in an "Other" bar.
+
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             column (str): The column to include in the bar plot.
+            top_k (int, optional): The number of most frequent values to plot. Defaults to 20. If None, every value
+                is plotted.
 
         Returns:
-            plt.Figure: The generated bar plot.
+            Figure: The generated bar plot.
         """
-        fig, ax = plt.subplots()
-        df[column].value_counts().plot(kind="bar", ax=ax)
+        fig = Figure()
+        ax = fig.subplots()
+        counts = df[column].value_counts() if top_k is None else PlotGenerator.top_counts(df, column, top_k)
+        counts.plot(kind="bar", ax=ax)
         ax.set_title(f"Bar Plot of {column}")
         ax.set_xlabel("Categories")
         ax.set_ylabel("Frequency")
         return fig
+
+    @staticmethod
+    def top_counts(df: pd.DataFrame, column: str, top_k: int = DEFAULT_TOP_K) -> pd.Series:
+        """
+        Counts the most frequent values of a column, cached per column of each dataset version.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            column (str): The column to count.
+            top_k (int): The number of most frequent values. Defaults to 20.
+
+        Returns:
+            pd.Series: The counts of the most frequent values in decreasing order, followed by the total count of
+                all other values under "Other" if there are any.
+
+        Raises:
+            KeyError: If the column is missing, before anything is cached.
+        """
+        if column not in df.columns:
+            raise KeyError(column)
+        return STATS_CACHE.per_column(
+            df, ("top", top_k), [column], lambda missing: {missing[0]: PlotGenerator._count_top(df[column], top_k)}
+        )[column]
+
+    @staticmethod
+    def _count_top(values: pd.Series, top_k: int) -> pd.Series:
+        """
+        Counts the most frequent values of a column with a `HeavyHitters` summary.
+
+        Args:
+            values (pd.Series): The column.
+            top_k (int): The number of most frequent values.
+
+        Returns:
+            pd.Series: The counts, as returned by `top_counts`.
+        """
+        summary = HeavyHitters.from_series(values, capacity=max(1000, 50 * top_k))
+        counts = summary.top(top_k)
+        other = summary.count - counts.sum()
+        if other > 0:
+            counts = pd.concat([counts.set_axis(counts.index.astype(str)), pd.Series({"Other": other})])
+        return counts
@@ -0,0 +1,96 @@
+"""Module for rendering figures."""
+
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+
+class RenderPool:
+    """
+    Draws and renders figures to image bytes on a bounded pool of worker threads.
+
+    The generators of this package build figures with the object-oriented `Figure` API instead of pyplot, so
+    figures drawn for concurrent sessions share no global state and are never registered with pyplot. At most
+    `max_workers` figures exist at once, whatever the number of sessions, and every figure is disposed as soon as
+    it is rendered, so the memory held by figures stays bounded under load.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        """
+        Initializes the pool. Worker threads are started on demand.
+
+        Args:
+            max_workers (int): The maximum number of figures drawn and rendered at once. Defaults to 4.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="idmd-render")
+
+    def submit(self, draw: Callable[[], Figure], fmt: str = "png", dpi: int = 200) -> "Future[bytes]":
+        """
+        Schedules a figure to be drawn and rendered.
+
+        Args:
+            draw (Callable[[], Figure]): Draws the figure. It is disposed once rendered.
+            fmt (str): The image format, "png" or "svg". Defaults to "png".
+            dpi (int): The resolution of PNG images. Defaults to 200.
+
+        Returns:
+            Future[bytes]: The rendered image, or the exception raised while drawing or rendering it.
+        """
+        return self._executor.submit(lambda: self.to_bytes(draw(), fmt, dpi))
+
+    def render(self, draw: Callable[[], Figure], fmt: str = "png", dpi: int = 200) -> bytes:
+        """
+        Draws and renders a figure on the pool, waiting for the result.
+
+        Args:
+            draw (Callable[[], Figure]): Draws the figure. It is disposed once rendered.
+            fmt (str): The image format, "png" or "svg". Defaults to "png".
+            dpi (int): The resolution of PNG images. Defaults to 200.
+
+        Returns:
+            bytes: The rendered image.
+        """
+        return self.submit(draw, fmt, dpi).result()
+
+    def shutdown(self) -> None:
+        """Waits for the scheduled figures and stops the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def to_bytes(fig: Figure, fmt: str = "png", dpi: int = 200) -> bytes:
+        """
+        Renders a figure to image bytes and disposes it.
+
+        Args:
+            fig (Figure): The figure to render.
+            fmt (str): The image format, "png" or "svg". Defaults to "png".
+            dpi (int): The resolution of PNG images. Defaults to 200.
+
+        Returns:
+            bytes: The rendered image.
+        """
+        buffer = io.BytesIO()
+        try:
+            fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+        finally:
+            RenderPool.dispose(fig)
+        return buffer.getvalue()
+
+    @staticmethod
+    def dispose(fig: Figure) -> None:
+        """
+        Releases a figure and its artists. Figures created through pyplot are also closed.
+
+        Args:
+            fig (Figure): The figure to dispose.
+        """
+        if fig.canvas.manager is not None:
+            plt.close(fig)
+        fig.clear()
+
+
+RENDER_POOL = RenderPool()
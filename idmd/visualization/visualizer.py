@@ -1,58 +1,85 @@
 """Module for data visualization."""
 
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
+from .decimation import DEFAULT_MAX_POINTS
+from .density import DensityGenerator
 from .heatmaps import HeatmapGenerator
 from .histograms import HistogramGenerator
-from .plots import PlotGenerator
+from .plots import DEFAULT_TOP_K, PlotGenerator
 
 
 class DataVisualizer:
     """Utility class for generating visualizations."""
 
     @staticmethod
-    def generate_line_plot(df: pd.DataFrame, columns: List[str]):
+    def generate_line_plot(
+        df: pd.DataFrame, columns: List[str], max_points: int = DEFAULT_MAX_POINTS, method: str = "minmax"
+    ):
         """
         Generates a line plot using PlotGenerator.
 
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             columns (List[str]): The columns to include in the line plot.
+            max_points (int): The number of points to plot per column at most. Longer series are decimated while
+                keeping their peaks and shape. Defaults to 2000.
+            method (str): The decimation method, "minmax" or "lttb". Defaults to "minmax".
 
         Returns:
-            plt.Figure: The generated line plot.
+            Figure: The generated line plot.
         """
-        return PlotGenerator.generate_line_plot(df, columns)
+        return PlotGenerator.generate_line_plot(df, columns, max_points=max_points, method=method)
 
     @staticmethod
-    def generate_bar_plot(df: pd.DataFrame, column: str):
+    def generate_bar_plot(df: pd.DataFrame, column: str, top_k: Optional[int] = DEFAULT_TOP_K):
         """
         Generates a bar plot using PlotGenerator.
 
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             column (str): The column to include in the bar plot.
+            top_k (int, optional): The number of most frequent values to plot, the others being grouped in an
+                "Other" bar. Defaults to 20. If None, every value is plotted.
 
         Returns:
-            plt.Figure: The generated bar plot.
+            Figure: The generated bar plot.
         """
-        return PlotGenerator.generate_bar_plot(df, column)
+        return PlotGenerator.generate_bar_plot(df, column, top_k=top_k)
 
     @staticmethod
-    def generate_correlation_heatmap(df: pd.DataFrame, columns: List[str]):
+    def generate_correlation_heatmap(df: pd.DataFrame, columns: List[str], cluster: bool = False, top_k: int = 0):
         """
         Generates a correlation heatmap using HeatmapGenerator.
 
         Args:
             df (pd.DataFrame): The DataFrame containing the data.
             columns (List[str]): The columns to include in the heatmap.
+            cluster (bool): Whether to order the columns so that strongly correlated ones are adjacent. Defaults
+                to False.
+            top_k (int): The number of most strongly correlated pairs to mark. Defaults to 0.
 
         Returns:
-            plt.Figure: The generated heatmap.
+            Figure: The generated heatmap.
         """
-        return HeatmapGenerator.generate_correlation_heatmap(df, columns)
+        return HeatmapGenerator.generate_correlation_heatmap(df, columns, cluster=cluster, top_k=top_k)
+
+    @staticmethod
+    def generate_density_plot(df: pd.DataFrame, x: str, y: str):
+        """
+        Generates a 2D density plot of two columns using DensityGenerator.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing the data.
+            x (str): The column on the horizontal axis.
+            y (str): The column on the vertical axis.
+
+        Returns:
+            Figure: The generated density plot.
+        """
+        return DensityGenerator.generate_density_plot(df, x, y)
 
     @staticmethod
     def generate_histograms(df: pd.DataFrame, columns: List[str]):
@@ -64,7 +91,7 @@ class DataVisualizer:
             columns (List[str]): The columns to include in the histograms.
 
         Returns:
-            plt.Figure: The generated histograms.
+            Figure: The generated histograms.
         """
         return HistogramGenerator.generate_histograms(df, columns)
 
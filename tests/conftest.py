@@ -0,0 +1,9 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def copy_on_write():
+    """Enables pandas copy-on-write for all tests, as `DataApp` does for the application."""
+    with pd.option_context("mode.copy_on_write", True):
+        yield
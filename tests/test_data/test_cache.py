@@ -0,0 +1,63 @@
+import pandas as pd
+from idmd.data.cache import LRUCache, ParseCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the cache evicts the least recently used values once it exceeds its size limit."""
+    cache = LRUCache(max_bytes=3, sizeof=lambda _: 1)
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.get("a")
+    cache.put("d", "D")
+
+    assert "b" not in cache, "The least recently used value should be evicted."
+    assert cache.get("a") == "A", "A recently used value should be kept."
+    assert len(cache) == 3 and cache.nbytes == 3, "The cache should stay within its size limit."
+
+
+def test_lru_cache_skips_oversized_values():
+    """Test that values larger than the whole cache are not stored."""
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put("small", "abc")
+    cache.put("large", "x" * 11)
+
+    assert "large" not in cache, "An oversized value should not be cached."
+    assert cache.get("small") == "abc", "Oversized values should not evict other values."
+
+
+def test_parse_cache_fingerprint_depends_on_content(tmp_path):
+    """Test that the fingerprint changes with the content and not with the file name."""
+    cache = ParseCache()
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    first.write_text("a,b\n1,2")
+    second.write_text("a,b\n1,2")
+
+    assert cache.fingerprint(str(first)) == cache.fingerprint(str(second)), "Equal content should match."
+    second.write_text("a,b\n1,3")
+    assert cache.fingerprint(str(first)) != cache.fingerprint(str(second)), "Different content should differ."
+
+
+def test_parse_cache_disk_spill(tmp_path):
+    """Test that cached DataFrames are restored from the on-disk Parquet cache after eviction."""
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    cache = ParseCache(disk_dir=str(tmp_path / "cache"))
+    cache.put(("digest", "csv", None), df)
+    cache.clear()
+
+    restored = cache.get(("digest", "csv", None))
+
+    pd.testing.assert_frame_equal(restored, df)
+    assert (
+        ParseCache(disk_dir=str(tmp_path / "cache")).get(("digest", "csv", None)) is not None
+    ), "A new cache instance should find the DataFrame on disk."
+
+
+def test_parse_cache_disk_spill_keeps_metadata(tmp_path):
+    """Test that the metadata of a DataFrame is restored with it from the disk cache."""
+    report = {"memory_report": {"before": 300, "after": 100}}
+    cache = ParseCache(disk_dir=str(tmp_path / "cache"))
+    cache.put(("digest", "csv", None), pd.DataFrame({"a": [1, 2, 3]}), report)
+
+    restored = ParseCache(disk_dir=str(tmp_path / "cache"))
+    assert restored.get(("digest", "csv", None)) is not None
+    assert restored.metadata(("digest", "csv", None)) == report
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from idmd.data.compactor import DtypeCompactor
+from idmd.data.uploader import FileUploader
+
+
+def test_compact_downcasts_numeric_columns():
+    """Test that integers are downcast and floats only when no precision is lost."""
+    df = pd.DataFrame({"small": [1, 2, 3], "exact": [0.5, 1.25, np.nan], "precise": [0.1, 0.2, 0.3]})
+    compacted = DtypeCompactor.compact(df)
+
+    assert compacted["small"].dtype == np.int8, "Small integers should be downcast to int8."
+    assert compacted["exact"].dtype == np.float32, "Floats representable in float32 should be downcast."
+    assert compacted["precise"].dtype == np.float64, "Floats that would lose precision should be kept."
+    assert DtypeCompactor.compact(df, lossy_floats=True)["precise"].dtype == np.float32, "Lossy mode downcasts."
+    pd.testing.assert_frame_equal(compacted, df, check_dtype=False)
+
+
+def test_compact_converts_strings():
+    """Test that low-cardinality strings become categories and the others Arrow-backed strings."""
+    df = pd.DataFrame({"city": ["A", "B", "A", "B", "A", "A"], "id": ["a", "b", "c", "d", "e", "f"]})
+    compacted = DtypeCompactor.compact(df)
+
+    assert isinstance(compacted["city"].dtype, pd.CategoricalDtype), "Repeated strings should become categories."
+    assert compacted["id"].dtype == "string[pyarrow]", "Unique strings should become Arrow-backed strings."
+    assert compacted["id"].tolist() == df["id"].tolist(), "String values should not change."
+    assert DtypeCompactor.compact(df, arrow_strings=False)["id"].dtype == object, "Arrow strings can be disabled."
+
+
+def test_upload_with_compaction_records_memory_report(tmp_path):
+    """Test that compaction at load time reports the memory before and after compaction."""
+    csv_file = tmp_path / "wide.csv"
+    csv_file.write_text("num,cat\n" + "".join(f"{i % 100},{'abc'[i % 3]}\n" for i in range(1000)))
+    uploader = FileUploader(compact=True)
+    session_state = {}
+
+    with open(csv_file, "rb") as file:
+        uploader.process_upload(file, session_state)
+
+    report = session_state["memory_report"]
+    assert report["after"] < report["before"], "Compaction should reduce memory usage."
+    assert report["after"] == DtypeCompactor.memory_usage(session_state["df"]), "The report should match the data."
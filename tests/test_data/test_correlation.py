@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.correlation import CorrelationEngine
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=500)
+    return pd.DataFrame(
+        {
+            "A": base + 1000,
+            "B": np.where(rng.random(500) < 0.2, np.nan, -base + rng.normal(size=500)),
+            "C": rng.normal(size=500),
+            "D": np.where(rng.random(500) < 0.5, np.nan, base * 3 + rng.normal(size=500) / 10),
+            "E": 2.0,
+        }
+    )
+
+
+def test_correlate_matches_pandas(df):
+    """Test that the pairwise correlations and counts match pandas, including missing values and constant columns."""
+    corr, counts = CorrelationEngine.correlate(df, list(df.columns))
+
+    expected = df.corr()
+    np.testing.assert_allclose(corr.to_numpy(), expected.to_numpy(), atol=1e-5)
+    assert list(corr.columns) == list(df.columns)
+    present = df.notna().astype(int)
+    np.testing.assert_array_equal(counts.to_numpy(), (present.T @ present).to_numpy())
+
+
+def test_correlate_samples_rows(df):
+    """Test that at most `max_rows` rows are used, and that the sample is reproducible."""
+    corr, counts = CorrelationEngine.correlate(df, ["A", "C"], max_rows=100)
+    again, _ = CorrelationEngine.correlate(df, ["A", "C"], max_rows=100)
+
+    assert counts.loc["A", "A"] == 100
+    pd.testing.assert_frame_equal(corr, again)
+
+
+def test_cluster_order_groups_correlated_columns():
+    """Test that strongly correlated columns are placed next to each other."""
+    corr = np.array(
+        [
+            [1.0, 0.0, 0.9, 0.0],
+            [0.0, 1.0, 0.0, -0.8],
+            [0.9, 0.0, 1.0, 0.1],
+            [0.0, -0.8, 0.1, 1.0],
+        ]
+    )
+
+    order = list(CorrelationEngine.cluster_order(corr))
+
+    assert sorted(order) == [0, 1, 2, 3]
+    assert abs(order.index(0) - order.index(2)) == 1
+    assert abs(order.index(1) - order.index(3)) == 1
+
+
+def test_top_pairs(df):
+    """Test that the strongest pairs are returned by decreasing absolute correlation, without the diagonal."""
+    corr = df.corr()
+
+    pairs = CorrelationEngine.top_pairs(corr, 2)
+
+    assert list(pairs.columns) == ["Column 1", "Column 2", "Correlation"]
+    upper = corr.where(np.triu(np.ones(corr.shape, dtype=bool), k=1)).stack()
+    expected = upper.reindex(upper.abs().sort_values(ascending=False).index)[:2]
+    assert pairs[["Column 1", "Column 2"]].values.tolist() == [list(pair) for pair in expected.index]
+    np.testing.assert_allclose(pairs["Correlation"], expected.to_numpy())
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.stats import StatisticsCache
+from idmd.data.store import DatasetStore
+from idmd.manipulation.plan import Operation
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"A": [0, 2, 3, 9], "B": [1.0, None, 3.0, 2.0], "C": [5, 6, 100, 7], "D": ["w", "x", "y", "z"]})
+
+
+def test_results_match_pandas(df):
+    """Test that cached statistics match the pandas results, for tracked and untracked DataFrames."""
+    cache = StatisticsCache()
+    tracked = df.copy(deep=False)
+    cache.track(tracked, {col: ("v", col) for col in df.columns})
+
+    for data in [df, tracked, tracked]:
+        pd.testing.assert_frame_equal(cache.describe(data), df.describe())
+        pd.testing.assert_frame_equal(cache.corr(data, ["A", "B", "C"]), df[["A", "B", "C"]].corr())
+    pd.testing.assert_frame_equal(cache.describe(tracked, ["D"]), df[["D"]].describe())
+
+
+def test_only_changed_columns_are_recomputed(df):
+    """Test that after an operation only the columns it changed are described and correlated again."""
+    cache = StatisticsCache()
+    store = DatasetStore(df, base_id="base")
+    with patch("idmd.data.store.STATS_CACHE", cache):
+        store.publish({})
+        cache.describe(store.current)
+        cache.corr(store.current, ["A", "B", "C"])
+
+        store.apply(Operation.replace("A", "0", "max"))
+        store.apply(Operation.swap("B", "C"))
+        store.publish({})
+
+    assert store.column_tokens["B"] == ("base", "C"), "Swapped columns should keep the token of their data."
+    with patch.object(pd.DataFrame, "describe", autospec=True, side_effect=pd.DataFrame.describe) as describe:
+        result = cache.describe(store.current)
+    assert describe.call_args.args[0].columns.tolist() == ["A"], "Only the replaced column should be described."
+    pd.testing.assert_frame_equal(result, store.current.describe())
+
+    with patch.object(pd.DataFrame, "corr", autospec=True) as corr:
+        result = cache.corr(store.current, ["A", "B", "C"])
+    corr.assert_not_called()
+    np.testing.assert_allclose(result, store.current[["A", "B", "C"]].corr())
+
+
+def test_commit_keeps_tokens_of_shared_columns(df):
+    """Test that committing a DataFrame keeps the tokens of the columns it shares with the previous version."""
+    store = DatasetStore(df, base_id="base")
+    updated = df.copy(deep=False)
+    updated["A"] = updated["A"] + 1
+    store.commit(updated.drop(columns=["D"]), "edit")
+
+    assert store.column_tokens["B"] == ("base", "B"), "Unchanged columns should keep their tokens."
+    assert store.column_tokens["A"] != ("base", "A"), "Changed columns should get new tokens."
+
+
+def test_cache_is_limited_by_size(df):
+    """Test that cached statistics are evicted by their size in bytes rather than by their number."""
+    histogram = (np.zeros(1000, dtype=np.int64), np.zeros(1001))
+    cache = StatisticsCache(max_bytes=3 * StatisticsCache.sizeof(histogram))
+    tracked = df.copy(deep=False)
+    cache.track(tracked, {col: ("v", col) for col in df.columns})
+
+    cache.per_column(tracked, "histogram", ["A", "B", "C", "D"], lambda cols: {col: histogram for col in cols})
+
+    assert StatisticsCache.sizeof(histogram) > 16000, "The arrays should be counted by their data."
+    assert len(cache.entries) == 3, "Only the statistics that fit in the size limit should be kept."
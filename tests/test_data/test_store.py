@@ -0,0 +1,135 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.store import DatasetStore
+from idmd.manipulation.plan import Operation
+from idmd.manipulation.replace import ReplaceLogic
+
+
+@pytest.fixture
+def store():
+    return DatasetStore(pd.DataFrame({"A": [0, 2, 3], "B": [1.0, 2.0, 3.0]}), base_id="base")
+
+
+def test_commit_undo_redo(store):
+    """Test that undo and redo move between versions without copying them."""
+    updated = ReplaceLogic.replace_values(store.current, "A", "0", "max")
+    version_id = store.commit(updated, "replace")
+
+    assert store.current is updated and store.version_id == version_id, "The commit should become current."
+    assert store.undo() and store.current is store.base, "Undo should return to the base snapshot itself."
+    assert store.version_id == "base", "The base snapshot should keep its identifier."
+    assert not store.undo(), "There should be nothing to undo before the base snapshot."
+    assert store.redo() and store.current is updated, "Redo should restore the undone version itself."
+    assert not store.redo(), "There should be nothing to redo after the last version."
+
+
+def test_commit_discards_undone_versions(store):
+    """Test that committing after an undo discards the undone versions."""
+    store.commit(store.current.drop(columns=["A"]), "drop A")
+    store.undo()
+    store.commit(store.current.drop(columns=["B"]), "drop B")
+
+    assert store.history == ["load", "drop B"], "The undone version should be discarded."
+    assert not store.can_redo, "There should be nothing to redo."
+
+
+def test_reset_restores_base_without_copy(store):
+    """Test that reset restores the base snapshot itself and can be undone."""
+    store.commit(store.current.drop(columns=["A"]), "drop A")
+    store.reset()
+
+    assert store.current is store.base and store.version_id == "base", "Reset should restore the base snapshot."
+    assert store.undo() and list(store.current.columns) == ["B"], "The reset should be undoable."
+
+
+def test_versions_share_unchanged_columns(store):
+    """Test that a new version shares the data of unchanged columns and leaves its parent untouched."""
+    updated = ReplaceLogic.replace_values(store.current, "A", "0", "max")
+    store.commit(updated, "replace")
+
+    assert np.shares_memory(updated["B"].to_numpy(), store.base["B"].to_numpy()), "Column B should be shared."
+    assert store.base["A"].tolist() == [0, 2, 3], "The parent version should not be modified."
+
+
+def test_session_helpers():
+    """Test that the session helpers publish the current version and adopt external changes."""
+    session_state = {}
+    df = pd.DataFrame({"A": [1, 2]})
+    store = DatasetStore.load(session_state, df)
+    DatasetStore.update(session_state, df.drop(columns=["A"]), "drop A")
+
+    assert session_state["df"] is store.current and session_state["df_version"] == store.version_id
+    session_state["df"] = df.assign(B=1)
+    assert DatasetStore.from_session(session_state).history[-1] == "external change", "External data is adopted."
+    assert DatasetStore.from_session({}) is None, "There should be no store without a dataset."
+
+
+def test_apply_defers_execution(store):
+    """Test that recorded operations run only when the current data is requested."""
+    store.apply(Operation.replace("A", "0", "max"))
+    store.apply(Operation.drop("B"))
+
+    assert store.pending == 2, "Both operations should be pending."
+    assert store.columns == ["A"], "The columns should be known without executing the operations."
+    assert store.current["A"].tolist() == [3, 2, 3], "The operations should run when the data is requested."
+    assert store.pending == 0, "No operation should be pending after the data was computed."
+
+
+def test_undo_to_pending_version(store):
+    """Test that undoing onto a version that was never computed computes it from its predecessor."""
+    store.apply(Operation.drop("A"))
+    store.apply(Operation.drop("B"))
+    store.current
+    store.undo()
+
+    assert store.pending == 1, "The intermediate version should not have been computed."
+    assert store.current.columns.tolist() == ["B"], "The intermediate version should be computed on demand."
+
+
+def test_current_frame_publishes_pending_operations(store):
+    """Test that lazily recorded operations are published when the session's data is requested."""
+    session_state = {}
+    DatasetStore.load(session_state, store.base)
+    DatasetStore.record(session_state, Operation.drop("A"), lazy=True)
+
+    assert "A" in session_state["df"].columns, "A lazy operation should not be published immediately."
+    assert DatasetStore.current_frame(session_state).columns.tolist() == ["B"], "It should run on demand."
+    assert session_state["df_version"] == session_state["dataset"].version_id
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_failed_operation_leaves_history_intact(lazy):
+    """Test that an operation that fails is not kept in the history, so the previous data stays usable."""
+    session_state = {}
+    store = DatasetStore.load(session_state, pd.DataFrame({"A": [0, 2, 3], "S": ["a", "b", "c"]}))
+    DatasetStore.record(session_state, Operation.drop("A"), lazy=lazy)
+    previous = DatasetStore.current_frame(session_state)
+
+    with pytest.raises(TypeError):
+        DatasetStore.record(session_state, Operation.replace("S", "outliers", "median"), lazy=lazy)
+        DatasetStore.current_frame(session_state)
+
+    assert store.history == ["load", "drop A"], "The failed operation should be discarded."
+    assert DatasetStore.current_frame(session_state) is previous, "The previous data should stay current."
+    assert store.undo() and DatasetStore.current_frame(session_state).columns.tolist() == ["A", "S"]
+
+
+def test_load_removes_previous_memory_report():
+    """Test that loading a new dataset drops the memory report of the previous one."""
+    session_state = {"memory_report": {"before": 300, "after": 100}}
+
+    DatasetStore.load(session_state, pd.DataFrame({"a": [1, 2]}))
+
+    assert "memory_report" not in session_state
+
+
+def test_import_leaves_copy_on_write_unchanged():
+    """Test that importing idmd does not change the global copy-on-write option of pandas."""
+    code = "import pandas as pd; import idmd; print(pd.get_option('mode.copy_on_write'))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
@@ -1,14 +1,30 @@
+import pandas as pd
 import pytest
+from idmd.data.cache import ParseCache
+from idmd.data.compactor import DtypeCompactor
 from idmd.data.uploader import FileUploader
 
 
-def test_is_new_file():
-    """Test that the uploader correctly identifies a new file."""
-    uploader = FileUploader()
-    session_state = {"uploaded_file_name": "old_file.csv"}
-    new_file = type("File", (object,), {"name": "new_file.csv"})()
+def test_is_new_file(tmp_path):
+    """Test that the uploader identifies new files by their content rather than their name."""
+    uploader = FileUploader(cache=ParseCache())
+    session_state = {}
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("col1,col2\n1,2")
+
+    with open(csv_file, "rb") as file:
+        assert uploader.is_new_file(file, session_state), "A file should be new when nothing is loaded."
+        uploader.process_upload(file, session_state)
+        assert not uploader.is_new_file(file, session_state), "The loaded file should not be new."
+
+    renamed_file = tmp_path / "renamed.csv"
+    renamed_file.write_text("col1,col2\n1,2")
+    with open(renamed_file, "rb") as file:
+        assert not uploader.is_new_file(file, session_state), "Identical content under a new name is not new."
 
-    assert uploader.is_new_file(new_file, session_state), "The new file should be recognized as new."
+    csv_file.write_text("col1,col2\n5,6")
+    with open(csv_file, "rb") as file:
+        assert uploader.is_new_file(file, session_state), "Changed content under the same name should be new."
 
 
 def test_process_upload_valid_csv(tmp_path):
@@ -59,3 +75,117 @@ def test_default_file_not_specified():
 
     with pytest.raises(ValueError, match="No default file specified."):
         uploader.load_default_file(session_state)
+
+
+def test_process_upload_chunked_csv_reports_progress(tmp_path):
+    """Test that chunked CSV parsing yields the full DataFrame and reports increasing progress."""
+    uploader = FileUploader(chunk_size=10)
+    session_state = {}
+    csv_file = tmp_path / "chunked.csv"
+    csv_file.write_text("col1,col2\n" + "".join(f"{i},{i * 2}\n" for i in range(95)))
+    progress = []
+
+    with open(csv_file, "rb") as file:
+        uploader.process_upload(file, session_state, progress_callback=progress.append)
+
+    assert session_state["df"].shape == (95, 2), "All chunks should be concatenated into one DataFrame."
+    assert session_state["df"]["col1"].tolist() == list(range(95)), "Rows should keep their original order."
+    assert session_state["df"].index.equals(pd.RangeIndex(95)), "The index should be continuous across chunks."
+    assert progress == sorted(progress), "Progress should never decrease."
+    assert progress[-1] == 1.0, "Progress should finish at 1.0."
+
+
+def test_process_upload_does_not_duplicate_data(tmp_path):
+    """Test that the parsed DataFrame is stored once, as the base snapshot of the dataset store."""
+    cache = ParseCache()
+    uploader = FileUploader(cache=cache)
+    session_state = {}
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text("col1,col2\n1,2\n3,4")
+
+    with open(csv_file, "r") as file:
+        uploader.process_upload(file, session_state)
+
+    store = session_state["dataset"]
+    assert session_state["df"] is store.base, "The published DataFrame should be the base snapshot itself."
+    assert cache.frames.nbytes == DtypeCompactor.memory_usage(store.base), "Only one DataFrame should be cached."
+    assert session_state["df_version"] == store.version_id, "The version identifier should be published."
+
+
+@pytest.mark.parametrize("extension", ["parquet", "feather", "arrow"])
+def test_process_upload_columnar_formats(tmp_path, extension):
+    """Test that Parquet and Feather/Arrow files are loaded with all their columns."""
+    source = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"], "col3": [0.5, 1.5, 2.5]})
+    path = tmp_path / f"test.{extension}"
+    if extension == "parquet":
+        source.to_parquet(path)
+    else:
+        source.to_feather(path)
+    uploader = FileUploader()
+    session_state = {}
+
+    with open(path, "rb") as file:
+        uploader.process_upload(file, session_state)
+
+    pd.testing.assert_frame_equal(session_state["df"], source)
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "feather"])
+def test_column_projection(tmp_path, extension):
+    """Test that only the requested columns are loaded and that the schema is read without the data."""
+    source = pd.DataFrame({"col1": [1, 2], "col2": [3, 4], "col3": [5, 6]})
+    path = tmp_path / f"test.{extension}"
+    if extension == "csv":
+        source.to_csv(path, index=False)
+    else:
+        getattr(source, f"to_{extension}")(path)
+    uploader = FileUploader()
+    session_state = {}
+
+    with open(path, "rb") as file:
+        assert uploader.get_columns(file) == ["col1", "col2", "col3"], "All column names should be listed."
+        uploader.process_upload(file, session_state, columns=["col1", "col3"])
+
+    assert list(session_state["df"].columns) == ["col1", "col3"], "Only the projected columns should be loaded."
+    assert session_state["df"]["col3"].tolist() == [5, 6], "The projected column should keep its values."
+
+
+def test_is_new_file_with_different_projection(tmp_path):
+    """Test that a different column projection of the loaded file counts as a new file."""
+    uploader = FileUploader(cache=ParseCache())
+    session_state = {}
+    path = tmp_path / "data.parquet"
+    pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}).to_parquet(path)
+
+    with open(path, "rb") as file:
+        uploader.process_upload(file, session_state)
+        assert not uploader.is_new_file(file, session_state), "The same file and projection should not be new."
+        assert uploader.is_new_file(file, session_state, ["col1"]), "A new projection should be treated as new."
+
+
+def test_identical_content_is_parsed_once(tmp_path):
+    """Test that uploads with identical content share one parsed DataFrame across sessions."""
+    uploader = FileUploader(cache=ParseCache())
+    first_session, second_session = {}, {}
+    for name, session_state in [("first.csv", first_session), ("second.csv", second_session)]:
+        csv_file = tmp_path / name
+        csv_file.write_text("col1,col2\n1,2\n3,4")
+        with open(csv_file, "rb") as file:
+            uploader.process_upload(file, session_state)
+
+    assert first_session["dataset"] is not second_session["dataset"], "Each session should get its own store."
+    assert first_session["dataset"].base is second_session["dataset"].base, "The parsed DataFrame should be reused."
+    assert first_session["df_version"] == second_session["df_version"], "Equal content should share a version."
+
+
+def test_load_default_file_uses_cache(tmp_path):
+    """Test that the default file is parsed once and shared by all sessions."""
+    csv_file = tmp_path / "default.csv"
+    csv_file.write_text("col1,col2\n1,2\n3,4")
+    uploader = FileUploader(default_file=str(csv_file), cache=ParseCache())
+    first_session, second_session = {}, {}
+
+    uploader.load_default_file(first_session)
+    uploader.load_default_file(second_session)
+
+    assert first_session["df"] is second_session["df"], "The default file should be parsed once."
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 from idmd.manipulation.columns import ColumnManipulatorLogic
 
 
@@ -28,3 +30,40 @@ def test_select_columns():
 
     assert list(selected_df.columns) == ["A", "C"], "Only columns 'A' and 'C' should be selected."
     assert selected_df.shape == (2, 2), "The resulting DataFrame should have 2 rows and 2 columns."
+
+
+def _shares_data(result, df, pairs):
+    """Check that every (result column, source column) pair is backed by the same buffer."""
+    return all(np.shares_memory(result[new].to_numpy(), df[old].to_numpy()) for new, old in pairs)
+
+
+@pytest.fixture
+def mixed_df():
+    return pd.DataFrame({"A": [1, 2], "B": [3.0, 4.0], "C": [5, 6], "D": pd.array(["x", "y"], dtype="string")})
+
+
+def test_swap_columns_copies_no_data(mixed_df):
+    """Test that swapping columns only relabels them."""
+    swapped_df = ColumnManipulatorLogic.swap_columns(mixed_df, "A", "C")
+
+    assert list(swapped_df.columns) == ["C", "B", "A", "D"], "The columns should exchange their positions."
+    assert _shares_data(swapped_df, mixed_df, [("C", "A"), ("B", "B"), ("A", "C")]), "No data should be copied."
+    assert swapped_df["D"].array is mixed_df["D"].array, "Extension arrays should not be copied."
+
+
+def test_drop_and_select_copy_no_data(mixed_df):
+    """Test that dropping and selecting columns share the data of the remaining columns."""
+    dropped_df = ColumnManipulatorLogic.drop_column(mixed_df, "B")
+    selected_df = ColumnManipulatorLogic.select_columns(mixed_df, ["C", "A"])
+
+    assert _shares_data(dropped_df, mixed_df, [("A", "A"), ("C", "C")]), "Dropping should not copy data."
+    assert _shares_data(selected_df, mixed_df, [("C", "C"), ("A", "A")]), "Selecting should not copy data."
+
+
+def test_modifying_result_leaves_source_unchanged(mixed_df):
+    """Test that modifying a selection copies only the modified column and leaves the source unchanged."""
+    selected_df = ColumnManipulatorLogic.select_columns(mixed_df, ["A", "C"])
+    selected_df.loc[0, "A"] = 100
+
+    assert mixed_df.loc[0, "A"] == 1, "The source DataFrame should be unchanged."
+    assert _shares_data(selected_df, mixed_df, [("C", "C")]), "The unmodified column should still be shared."
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.manipulation.columns import ColumnManipulatorLogic
+from idmd.manipulation.plan import LazyPlan, Operation
+from idmd.manipulation.replace import ReplaceLogic
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"A": [0, 2, 3], "B": [1.0, None, 3.0], "C": [5, 6, 100]})
+
+
+def test_column_operations_match_eager_logic(df):
+    """Test that a plan of column operations gives the same result as the eager logic."""
+    plan = LazyPlan(df).then(Operation.swap("A", "C")).then(Operation.drop("B"))
+    expected = ColumnManipulatorLogic.drop_column(ColumnManipulatorLogic.swap_columns(df, "A", "C"), "B")
+
+    assert plan.columns == ["C", "A"], "The columns should be known without executing the plan."
+    pd.testing.assert_frame_equal(plan.collect(), expected)
+
+
+def test_replacements_are_fused(df):
+    """Test that replacements on one column run in order and give the same result as the eager logic."""
+    plan = LazyPlan(df, [Operation.replace("B", "np.nan", "max"), Operation.replace("B", "outliers", "min")])
+    expected = ReplaceLogic.replace_values(
+        ReplaceLogic.replace_values(df, "B", "np.nan", "max"), "B", "outliers", "min"
+    )
+
+    assert plan.explain() == ["project 3 of 3 columns", "replace in B: np.nan → max, outliers → min"]
+    pd.testing.assert_frame_equal(plan.collect(), expected)
+
+
+def test_replacements_on_dropped_columns_are_skipped(df):
+    """Test that replacements on columns dropped later are never executed."""
+    plan = LazyPlan(df, [Operation.replace("A", "0", "median"), Operation.select(["C", "B"])])
+
+    with patch.object(ReplaceLogic, "replace_values_batch") as replace_values_batch:
+        result = plan.collect()
+
+    replace_values_batch.assert_not_called()
+    assert list(result.columns) == ["C", "B"], "Only the selected columns should remain, in the selected order."
+
+
+def test_replacement_follows_swapped_label(df):
+    """Test that a replacement after a swap applies to the column under its new label."""
+    result = LazyPlan(df, [Operation.swap("A", "B"), Operation.replace("A", "np.nan", "min")]).collect()
+
+    assert result["A"].tolist() == [1.0, 1.0, 3.0], "The replacement should apply to the data labelled A."
+    assert result["B"].tolist() == [0, 2, 3], "The data labelled B should be unchanged."
+
+
+def test_missing_column_raises(df):
+    """Test that recording an operation on a missing column raises a KeyError."""
+    plan = LazyPlan(df).then(Operation.drop("A"))
+
+    with pytest.raises(KeyError):
+        plan.then(Operation.replace("A", "0", "max"))
+    assert len(plan.operations) == 1, "The invalid operation should not be recorded."
+    assert df.columns.tolist() == ["A", "B", "C"], "The source should not be modified."
+
+
+def test_collect_copies_only_replaced_columns(df):
+    """Test that executing a plan copies no data except the replaced columns."""
+    result = LazyPlan(df, [Operation.swap("A", "C"), Operation.replace("B", "np.nan", "max")]).collect()
+
+    assert np.shares_memory(result["C"].to_numpy(), df["A"].to_numpy()), "Swapped columns should not be copied."
+    assert np.shares_memory(result["A"].to_numpy(), df["C"].to_numpy()), "Swapped columns should not be copied."
+    assert not np.shares_memory(result["B"].to_numpy(), df["B"].to_numpy()), "The replaced column is new data."
+    assert df["B"].isna().sum() == 1, "The source should not be modified."
@@ -1,5 +1,13 @@
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
+import pytest
+from idmd.data.stats import STATS_CACHE
+from idmd.data.store import DatasetStore
+from idmd.manipulation.plan import Operation
 from idmd.manipulation.replace import ReplaceLogic
+from idmd.manipulation.sketch import QuantileSketch
 
 
 def test_replace_zeros_with_median():
@@ -59,3 +67,108 @@ def test_replace_all_with_max():
     updated_df = ReplaceLogic.replace_values(df, column="A", values_to_replace="all", replacement_method="max")
 
     assert updated_df["A"].tolist() == [5, 2, 3, 5, 5], "All missing values should be replaced with the maximum (5)."
+
+
+def test_replace_values_batch_matches_single_column():
+    """Test that a batched replacement gives the same result as replacing each column separately."""
+    df = pd.DataFrame({"A": [0, 2, 3, 0, 5], "B": [1, None, 3, None, 5], "C": [1, 2, 100, 3, 4]})
+
+    for values_to_replace in ["0", "np.nan", "outliers", "all"]:
+        for replacement_method in ["median", "min", "max"]:
+            batched = ReplaceLogic.replace_values_batch(df, ["A", "B", "C"], values_to_replace, replacement_method)
+            expected = df
+            for col in ["A", "B", "C"]:
+                expected = ReplaceLogic.replace_values(expected, col, values_to_replace, replacement_method)
+            pd.testing.assert_frame_equal(batched, expected, obj=f"{values_to_replace} → {replacement_method}")
+
+
+def test_replace_values_batch_matches_single_column_dtypes():
+    """
+    Test that both paths give the same values and dtypes, including nullable dtypes and missing values, and that
+    both reject a replacement value the dtype cannot hold.
+    """
+    df = pd.DataFrame(
+        {
+            "int": [0, 1, 2, 3, 100, 0, 4],
+            "float": [0.0, 1.5, np.nan, 3.0, 100.0, 2.0, 4.0],
+            "Int64": pd.array([0, 1, None, 3, 100, 2, 4], dtype="Int64"),
+            "Float64": pd.array([0, 1.5, None, 3, 100, 2, 4], dtype="Float64"),
+        }
+    )
+
+    for values_to_replace in ["0", "np.nan", "outliers", "all"]:
+        for replacement_method in ["median", "min", "max", "np.nan"]:
+            for col in df.columns:
+                case = f"{col}: {values_to_replace} → {replacement_method}"
+                try:
+                    single = ReplaceLogic.replace_in_series(df[col], values_to_replace, replacement_method)
+                except TypeError:
+                    with pytest.raises(TypeError):
+                        ReplaceLogic.replace_values_batch(df, [col], values_to_replace, replacement_method)
+                    continue
+                batched = ReplaceLogic.replace_values_batch(df, [col], values_to_replace, replacement_method)
+                pd.testing.assert_series_equal(batched[col], single, obj=case)
+
+
+def test_replace_values_batch_random_and_unchanged_columns():
+    """Test random batched replacement, and that columns without replaced values keep their data."""
+    df = pd.DataFrame({"A": [0, 2, 3, 0, 5], "B": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    updated_df = ReplaceLogic.replace_values_batch(df, ["A", "B"], "0", "random", rng=np.random.default_rng(0))
+
+    assert updated_df["A"].iloc[[0, 3]].isin([2, 3, 5]).all(), "Zeros should be replaced with values from the column."
+    assert updated_df["A"].dtype == df["A"].dtype, "The column should keep its dtype."
+    assert np.shares_memory(updated_df["B"].to_numpy(), df["B"].to_numpy()), "Column B should not be copied."
+    assert df["A"].tolist() == [0, 2, 3, 0, 5], "The input DataFrame should be unchanged."
+
+
+def test_replace_outliers_approximate():
+    """Test that approximate outlier detection finds the same outliers as the exact one."""
+    values = np.random.default_rng(0).normal(size=100_000)
+    values[[10, 500, 9000]] = [50.0, -40.0, 60.0]
+    df = pd.DataFrame({"A": values, "B": values * 2})
+
+    exact = ReplaceLogic.replace_values_batch(df, ["A", "B"], "outliers", "np.nan")
+    approximate = ReplaceLogic.replace_values_batch(df, ["A", "B"], "outliers", "np.nan", approximate=True)
+    single = ReplaceLogic.replace_values(df, "A", "outliers", "np.nan", approximate=True)
+
+    assert approximate["A"].iloc[[10, 500, 9000]].isna().all(), "The injected outliers should be replaced."
+    assert abs(approximate["A"].isna().sum() - exact["A"].isna().sum()) < 0.001 * len(df), "Close to exact."
+    pd.testing.assert_series_equal(single["A"].isna(), approximate["A"].isna())
+
+
+def test_approximate_outliers_through_store_use_the_sketch():
+    """Test that approximate replacements recorded in the store use the sketch with the requested error."""
+    values = np.random.default_rng(0).normal(size=10_000)
+    session_state = {}
+    DatasetStore.load(session_state, pd.DataFrame({"A": values, "B": values * 2}))
+    DatasetStore.current_frame(session_state)
+    operation = Operation.replace_batch(["A", "B"], "outliers", "np.nan", approximate=True, error=0.05)
+
+    with (
+        patch.object(QuantileSketch, "from_array", wraps=QuantileSketch.from_array) as from_array,
+        patch.object(pd.DataFrame, "describe", autospec=True, side_effect=pd.DataFrame.describe) as describe,
+    ):
+        DatasetStore.record(session_state, operation)
+
+    assert from_array.call_count == 2, "Every column should be sketched."
+    assert all(call.args[1] == 0.05 for call in from_array.call_args_list), "The error should be passed on."
+    assert describe.call_count == 0, "Exact statistics should not be computed."
+    assert session_state["df"]["A"].isna().any(), "The outliers should be replaced."
+
+
+def test_exact_outliers_use_only_cached_statistics():
+    """Test that exact replacements reuse cached summary statistics but never compute them."""
+    session_state = {}
+    DatasetStore.load(session_state, pd.DataFrame({"A": [1, 2, 100, 3, 4], "B": [1.0, 2.0, 3.0, 4.0, -50.0]}))
+    operation = Operation.replace_batch(["A", "B"], "outliers", "np.nan")
+
+    with patch.object(pd.DataFrame, "describe", autospec=True, side_effect=pd.DataFrame.describe) as describe:
+        DatasetStore.record(session_state, operation)
+    assert describe.call_count == 0, "Summary statistics should not be computed for the replacement."
+
+    DatasetStore.from_session(session_state).undo()
+    STATS_CACHE.describe(DatasetStore.current_frame(session_state))
+    with patch.object(np, "nanpercentile", wraps=np.nanpercentile) as nanpercentile:
+        DatasetStore.record(session_state, operation)
+    assert nanpercentile.call_count == 0, "The cached quartiles should be used."
+    assert session_state["df"].isna().sum().tolist() == [1, 1]
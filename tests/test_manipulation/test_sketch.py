@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.manipulation.sketch import HeavyHitters, QuantileSketch
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(size=200_000)
+
+
+def _rank(values, quantiles):
+    return np.searchsorted(np.sort(values), quantiles) / len(values)
+
+
+def test_small_input_is_exact():
+    """Test that quantiles are exact as long as the sketch was never compacted."""
+    values = [4.0, 1.0, np.nan, 3.0, 2.0]
+    sketch = QuantileSketch().update(values)
+
+    assert sketch.count == 4, "Missing values should be ignored."
+    np.testing.assert_allclose(sketch.quantile([0.25, 0.5, 0.75]), np.nanquantile(values, [0.25, 0.5, 0.75]))
+
+
+def test_rank_error_within_bound(values):
+    """Test that the ranks of the approximate quantiles are within the error bound while memory stays small."""
+    sketch = QuantileSketch.from_array(values, error=0.01, seed=0, chunk_size=10_000)
+    quantiles = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+    np.testing.assert_allclose(_rank(values, sketch.quantile(quantiles)), quantiles, atol=0.01)
+    assert sum(len(level) for level in sketch.levels) < len(values) / 100, "The sketch should be much smaller."
+
+
+def test_merged_chunks(values):
+    """Test that sketches of separate chunks merge into a sketch of the whole input."""
+    chunks = np.array_split(values, 4)
+    merged = QuantileSketch(seed=0)
+    for i, chunk in enumerate(chunks):
+        merged.merge(QuantileSketch.from_chunks([chunk], seed=i))
+
+    assert merged.count == len(values)
+    np.testing.assert_allclose(_rank(values, merged.quantile([0.25, 0.75])), [0.25, 0.75], atol=0.01)
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(error=0.05))
+
+
+def test_empty_sketch():
+    """Test that an empty sketch returns NaN."""
+    assert np.isnan(QuantileSketch().quantile(0.5)), "The quantile of no values should be NaN."
+
+
+def test_heavy_hitters_exact_below_capacity():
+    """Test that the counts are exact while there are no more distinct values than the capacity."""
+    values = pd.Series(["a", "b", "a", None, "c", "a", "b"])
+
+    summary = HeavyHitters(capacity=3).update(values)
+
+    assert summary.exact and summary.count == 6
+    pd.testing.assert_series_equal(summary.top(2), values.value_counts().iloc[:2], check_names=False)
+
+
+def test_heavy_hitters_bounds_over_chunks():
+    """Test that chunked and merged summaries find the frequent values with bounded overestimates."""
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.zipf(1.5, 100_000))
+    expected = values.value_counts()
+
+    chunked = HeavyHitters.from_series(values, capacity=100, chunk_size=10_000)
+    merged = (
+        HeavyHitters(capacity=100).update(values[:50_000]).merge(HeavyHitters(capacity=100).update(values[50_000:]))
+    )
+
+    for summary in [chunked, merged]:
+        top = summary.top(10)
+        assert not summary.exact and summary.count == len(values)
+        assert list(top.index) == list(expected.index[:10])
+        assert (top >= expected[top.index]).all() and (top - expected[top.index] <= summary.floor).all()
+        assert summary.floor <= 2 * len(values) / summary.capacity
+
+
+def test_heavy_hitters_categorical_and_invalid_capacity():
+    """Test that categorical columns are counted by value, and that the capacity must be positive."""
+    values = pd.Series(pd.Categorical(["x", "y", "x"], categories=["x", "y", "z"]))
+
+    assert HeavyHitters.from_series(values).top(5).to_dict() == {"x": 2, "y": 1}
+    with pytest.raises(ValueError):
+        HeavyHitters(capacity=0)
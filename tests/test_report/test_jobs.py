@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.store import DatasetStore
+from idmd.report.cache import ReportCache
+from idmd.report.jobs import ReportJobRunner
+from idmd.report.report import ReportCancelled, ReportGenerator
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"A": rng.normal(size=200), "B": rng.normal(size=200)})
+
+
+@pytest.fixture
+def runner():
+    runner = ReportJobRunner(max_workers=1)
+    yield runner
+    runner.shutdown()
+
+
+def test_job_reports_progress_and_result(df, runner):
+    """Test that a finished job has written every page and returns the PDF."""
+    job = runner.submit("v1", df, max_workers=1)
+    pdf = job.result()
+
+    assert job.status == "done"
+    assert job.version == "v1"
+    assert (job.pages_written, job.pages_total, job.progress) == (3, 3, 1.0)
+    assert pdf.read(4) == b"%PDF"
+    assert job.result().tell() == 0, "The buffer should be read from the start every time."
+
+
+def test_queued_job_can_be_cancelled(df, runner):
+    """Test that a job waiting for a worker is cancelled without being run."""
+    release = threading.Event()
+    blocker = runner._executor.submit(release.wait)
+    job = runner.submit("v1", df, max_workers=1)
+
+    job.cancel()
+    release.set()
+    blocker.result()
+
+    assert job.status == "cancelled"
+    assert job.future.cancelled()
+    assert job.error is None
+    with pytest.raises(ReportCancelled):
+        job.result()
+
+
+def test_failed_job_keeps_its_error(runner):
+    """Test that the exception raised while generating the report is kept by the job."""
+    job = runner.submit("v1", pd.DataFrame({"A": [1.0, 2.0]}), plot_cols=["missing"], max_workers=1)
+    with pytest.raises(KeyError):
+        job.future.result()
+
+    assert job.status == "failed"
+    assert isinstance(job.error, KeyError)
+
+
+def test_cached_report_is_returned_at_once(df):
+    """Test that a report in the cache is returned by a job that is already done, without using a worker."""
+    session_state = {}
+    DatasetStore.load(session_state, df)
+    tracked = session_state["df"]
+    cache = ReportCache()
+    cache.put_report(ReportGenerator.page_keys(tracked), b"%PDF cached")
+    runner = ReportJobRunner(max_workers=1, cache=cache)
+    runner._executor.shutdown()
+
+    job = runner.submit("v1", tracked)
+
+    assert job.status == "done"
+    assert job.result().read() == b"%PDF cached"
+    assert job.progress == 1.0
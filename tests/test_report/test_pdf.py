@@ -0,0 +1,51 @@
+import io
+import re
+
+import pytest
+from idmd.report.pdf import PdfAssembler
+from matplotlib.figure import Figure
+
+
+def _page(title):
+    fig = Figure(figsize=(4, 3))
+    ax = fig.add_subplot()
+    ax.plot([0, 1, 2], [2, 0, 1])
+    ax.set_title(title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="pdf")
+    return buffer.getvalue()
+
+
+def test_pages_are_joined_in_order():
+    """Test that single-page PDFs are joined into one PDF whose cross-reference table points at every object."""
+    output = io.BytesIO()
+    with PdfAssembler(output) as pdf:
+        for title in ["first (page)", "second", "third"]:
+            pdf.add_page(_page(title))
+        assert pdf.page_count == 3
+    data = output.getvalue()
+
+    assert data.startswith(b"%PDF") and data.endswith(b"%%EOF\n")
+    assert data.count(b"/Type /Page") - data.count(b"/Type /Pages") == 3
+    assert re.search(rb"/Kids \[ (\d+) 0 R (\d+) 0 R (\d+) 0 R \] /Count 3", data)
+
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    entries = re.findall(rb"(\d{10}) 00000 n", data[xref:])
+    for number, offset in enumerate(entries, start=1):
+        assert data.startswith(b"%d 0 obj" % number, int(offset))
+
+
+def test_unfinished_pdf_is_not_closed():
+    """Test that a failed report is left without its page tree, like an incomplete file."""
+    output = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with PdfAssembler(output) as pdf:
+            pdf.add_page(_page("only"))
+            raise RuntimeError("failed")
+    assert b"/Type /Catalog" not in output.getvalue()
+
+
+def test_non_pdf_pages_are_rejected():
+    """Test that a page that is not a PDF with a cross-reference table raises a ValueError."""
+    with pytest.raises(ValueError):
+        PdfAssembler(io.BytesIO()).add_page(b"not a pdf")
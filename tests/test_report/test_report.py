@@ -0,0 +1,156 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.store import DatasetStore
+from idmd.report.cache import ReportCache
+from idmd.report.report import ReportCancelled, ReportGenerator
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"A": rng.normal(size=200), "B": rng.normal(size=200), "C": rng.choice(list("xy"), 200)})
+
+
+def _page_count(pdf):
+    return pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+
+
+def test_pages_in_order(df):
+    """Test that the pages are prepared in report order, with the density page only if requested."""
+    assert [draw.__name__ for draw, _ in ReportGenerator.pages(df)] == [
+        "_summary_page",
+        "_plots_page",
+        "_histograms_page",
+    ]
+
+    pages = ReportGenerator.pages(df, hist_cols=["B"], density_cols=["A", "B"])
+    assert pages[-1][0].__name__ == "_density_page"
+    assert list(pages[2][1][0]) == list(pages[2][1][1]) == ["B"], "Only the shown columns should be sent to the page."
+    (counts, _, _), x, y = pages[-1][1]
+    assert (x, y) == ("A", "B") and counts.sum() == len(df), "The density page should get the 2D histogram."
+
+
+def test_parallel_report_matches_serial(df):
+    """Test that rendering the pages in worker processes gives the same PDF as rendering them in order."""
+    serial = ReportGenerator.create_pdf_report(df, density_cols=["A", "B"], max_workers=1).read()
+    parallel = ReportGenerator.create_pdf_report(df, density_cols=["A", "B"], max_workers=2).read()
+
+    assert serial.startswith(b"%PDF") and parallel.startswith(b"%PDF")
+    assert _page_count(serial) == _page_count(parallel) == 4
+    assert serial == parallel
+
+
+def test_progress_is_reported_per_page(df):
+    """Test that the progress callback is called after every written page."""
+    updates = []
+    ReportGenerator.create_pdf_report(
+        df, max_workers=1, progress=lambda written, total: updates.append((written, total))
+    )
+
+    assert updates == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_cancelled_report_stops_before_next_page(df, max_workers):
+    """Test that setting the cancel event stops the report before its next page."""
+    cancel_event = threading.Event()
+    updates = []
+
+    def progress(written, total):
+        updates.append(written)
+        cancel_event.set()
+
+    with pytest.raises(ReportCancelled):
+        ReportGenerator.create_pdf_report(df, max_workers=max_workers, progress=progress, cancel_event=cancel_event)
+    assert updates == [1]
+
+
+def test_unchanged_pages_are_reused(df):
+    """Test that a repeated report is returned from the cache, and only pages of changed columns are drawn."""
+    session_state = {}
+    DatasetStore.load(session_state, df)
+    cache = ReportCache()
+    first = ReportGenerator.create_pdf_report(session_state["df"], hist_cols=["A"], max_workers=1, cache=cache).read()
+
+    with patch.object(ReportGenerator, "_build_page", side_effect=ReportGenerator._build_page) as build:
+        again = ReportGenerator.create_pdf_report(
+            session_state["df"], hist_cols=["A"], max_workers=1, cache=cache
+        ).read()
+        assert build.call_count == 0
+        assert again == first
+
+        DatasetStore.update(session_state, session_state["df"].assign(B=session_state["df"]["B"] * 2), "scale B")
+        updated = ReportGenerator.create_pdf_report(
+            session_state["df"], hist_cols=["A"], max_workers=1, cache=cache
+        ).read()
+
+    # Only the summary and the line plot and heatmap show column B; the histogram of A is reused.
+    assert [call.args[0][0].__name__ for call in build.call_args_list] == ["_summary_page", "_plots_page"]
+    assert _page_count(updated) == 3
+
+
+def test_untracked_frames_are_not_cached(df):
+    """Test that reports of DataFrames without column tokens are neither cached nor keyed."""
+    cache = ReportCache()
+    ReportGenerator.create_pdf_report(df, max_workers=1, cache=cache).read()
+
+    assert ReportGenerator.page_keys(df) is None
+    assert len(cache.reports) == len(cache.pages) == 0
+
+
+def test_wide_datasets_are_paginated():
+    """Test that every column of a wide dataset is shown, split across pages of legible size."""
+    rng = np.random.default_rng(0)
+    wide = pd.DataFrame(rng.normal(size=(50, 45)), columns=[f"n{i}" for i in range(45)])
+    wide[["c0", "c1", "c2"]] = "x"
+
+    layout = ReportGenerator._layout(wide)
+    names = [draw.__name__ for draw, _ in layout]
+
+    assert names == ["_summary_page"] * 6 + ["_plots_page"] * 6 + ["_histograms_page"] * 4
+    assert sum((groups[0] for draw, groups in layout[:6]), []) == wide.columns.tolist()
+    assert sum((groups[0] or [] for draw, groups in layout[6:12]), []) == wide.columns[:45].tolist()
+    blocks = {(rows[0], cols[0]) for _, (_, rows, cols) in layout[6:12]}
+    assert blocks == {("n0", "n0"), ("n0", "n20"), ("n0", "n40"), ("n20", "n20"), ("n20", "n40"), ("n40", "n40")}
+    assert sum((groups[0] for draw, groups in layout[12:]), []) == wide.columns[:45].tolist()
+
+    pdf = ReportGenerator.create_pdf_report(wide, max_workers=1).read()
+    assert _page_count(pdf) == 16
+
+
+def test_pool_builds_a_bounded_window_of_pages():
+    """Test that pages are submitted to the pool only a few pages ahead of the one being written."""
+    prepared = []
+
+    def pages():
+        for i in range(10):
+            prepared.append(i)
+            yield (_numbered_page, (i,))
+
+    # Pages are numbers here; only the order and the window are checked.
+    render = patch.object(ReportGenerator, "_render_page", side_effect=ReportGenerator._build_page)
+    with ThreadPoolExecutor(2) as pool, render:
+        for written, page in enumerate(ReportGenerator._render_in_pool(pool, pages(), window=3)):
+            assert page == written
+            assert len(prepared) <= written + 3
+
+
+def _numbered_page(number):
+    return number
+
+
+def test_rendered_pages_are_cached_as_pdfs(df):
+    """Test that the cache keeps every page as a single-page PDF, which the report copies unchanged."""
+    session_state = {}
+    DatasetStore.load(session_state, df)
+    cache = ReportCache()
+    ReportGenerator.create_pdf_report(session_state["df"], max_workers=1, cache=cache).read()
+
+    keys = ReportGenerator.page_keys(session_state["df"])
+    pages = [cache.page(key) for key in keys]
+    assert all(page.startswith(b"%PDF") and _page_count(page) == 1 for page in pages)
@@ -2,28 +2,35 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
+from idmd.data.store import DatasetStore
 from idmd.ui.data_preview import DataPreview
 
 
+class SessionState(dict):
+    """Dictionary with attribute access, like Streamlit's session state."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
 @pytest.fixture
 def sample_df():
     return pd.DataFrame({"a": [1, 2], "b": [3, 4]})
 
 
-@patch("idmd.ui.data_preview.st")
-def test_render_shows_preview(mock_st, sample_df):
-    session_state = MagicMock()
-    session_state.__contains__.side_effect = lambda key: key in ["df", "original_df"]
-    session_state.df = sample_df
-    session_state.original_df = sample_df.copy()
-    session_state._refresh_preview = False
+def _render(mock_st, session_state, clicked=None):
     mock_st.session_state = session_state
+    mock_st.columns.return_value = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
+    mock_st.button.side_effect = lambda label, **kwargs: label == clicked
+    DataPreview().render()
 
-    mock_st.columns.return_value = [MagicMock(), MagicMock(), MagicMock()]
-    mock_st.button.side_effect = [False, False]
 
-    comp = DataPreview()
-    comp.render()
+@patch("idmd.ui.data_preview.st")
+def test_render_shows_preview(mock_st, sample_df):
+    session_state = SessionState()
+    DatasetStore.load(session_state, sample_df)
+
+    _render(mock_st, session_state)
 
     mock_st.header.assert_called_once_with("Dataset Preview")
     args, _ = mock_st.dataframe.call_args
@@ -33,59 +40,47 @@ def test_render_shows_preview(mock_st, sample_df):
 
 @patch("idmd.ui.data_preview.st")
 def test_refresh_preview_button(mock_st, sample_df):
-    session_state = MagicMock()
-    session_state.__contains__.side_effect = lambda key: key == "df"
-    session_state.df = sample_df
-    session_state._refresh_preview = False
-    mock_st.session_state = session_state
-
-    col1, col2, _ = MagicMock(), MagicMock(), MagicMock()
-    mock_st.columns.return_value = [col1, col2, _]
-    col1.button.return_value = True
-    col2.button.return_value = False
+    session_state = SessionState(df=sample_df)
 
-    comp = DataPreview()
-    comp.render()
+    _render(mock_st, session_state, clicked="Refresh Preview")
 
     assert session_state._refresh_preview is True
 
 
 @patch("idmd.ui.data_preview.st")
 def test_reset_to_default_data_success(mock_st, sample_df):
-    session_state = MagicMock()
-    session_state.__contains__.side_effect = lambda key: key in ["df", "original_df"]
-    session_state.df = sample_df.copy()
-    session_state.original_df = sample_df
-    session_state._refresh_preview = False
-    mock_st.session_state = session_state
-
-    col1, col2, _ = MagicMock(), MagicMock(), MagicMock()
-    mock_st.columns.return_value = [col1, col2, _]
-    col1.button.return_value = False
-    col2.button.return_value = True
+    session_state = SessionState()
+    DatasetStore.load(session_state, sample_df)
+    DatasetStore.update(session_state, sample_df.drop(columns=["a"]), "drop a")
 
-    comp = DataPreview()
-    comp.render()
+    _render(mock_st, session_state, clicked="Reset to Default Data")
 
-    pd.testing.assert_frame_equal(session_state.df, sample_df)
+    assert session_state.df is sample_df, "Reset should restore the base snapshot without copying it."
     assert session_state._refresh_preview is True
     mock_st.success.assert_called_once_with("Data has been reset to original upload.")
 
 
 @patch("idmd.ui.data_preview.st")
-def test_reset_to_default_data_missing(mock_st, sample_df):
-    session_state = MagicMock()
-    session_state.__contains__.side_effect = lambda key: key == "df"
-    session_state.df = sample_df.copy()
-    session_state._refresh_preview = False
-    mock_st.session_state = session_state
+def test_reset_without_store_keeps_data(mock_st, sample_df):
+    session_state = SessionState(df=sample_df)
+
+    _render(mock_st, session_state, clicked="Reset to Default Data")
+
+    assert session_state.df is sample_df, "Data placed in the session state should become the base snapshot."
+    mock_st.success.assert_called_once_with("Data has been reset to original upload.")
+
+
+@patch("idmd.ui.data_preview.st")
+def test_undo_and_redo(mock_st, sample_df):
+    session_state = SessionState()
+    DatasetStore.load(session_state, sample_df)
+    DatasetStore.update(session_state, sample_df.drop(columns=["a"]), "drop a")
 
-    col1, col2, _ = MagicMock(), MagicMock(), MagicMock()
-    mock_st.columns.return_value = [col1, col2, _]
-    col1.button.return_value = False
-    col2.button.return_value = True
+    _render(mock_st, session_state, clicked="Undo")
+    assert list(session_state.df.columns) == ["a", "b"], "Undo should restore the previous version."
 
-    comp = DataPreview()
-    comp.render()
+    _render(mock_st, session_state, clicked="Redo")
+    assert list(session_state.df.columns) == ["b"], "Redo should restore the undone version."
 
-    mock_st.warning.assert_called_once_with("No original data found to reset.")
+    _render(mock_st, session_state, clicked="Redo")
+    mock_st.warning.assert_called_once_with("Nothing to redo.")
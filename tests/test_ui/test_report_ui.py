@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from idmd.data.store import DatasetStore
+from idmd.ui.report_ui import ReportUI
+
+
+class SessionState(dict):
+    """Dictionary with attribute access, like Streamlit's session state."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def session_state():
+    state = SessionState()
+    DatasetStore.load(state, pd.DataFrame({"A": [1.0, 2.0, 3.0], "B": [3.0, 1.0, 2.0]}))
+    return state
+
+
+def _job(status, version):
+    return MagicMock(
+        status=status, version=version, selection=(None,) * 4, pages_written=1, pages_total=3, progress=1 / 3
+    )
+
+
+def _render(mock_st, session_state, jobs, clicked=()):
+    mock_st.session_state = session_state
+    mock_st.button.side_effect = lambda label: label in clicked
+    mock_st.fragment.side_effect = lambda func, run_every=None: func
+    ReportUI(jobs=jobs).render()
+
+
+@patch("idmd.ui.report_ui.st")
+def test_button_starts_one_job_per_version(mock_st, session_state):
+    """Test that a job is started on click, and not again while it runs for the same version."""
+    jobs = MagicMock()
+    jobs.submit.side_effect = lambda version, *args, **kwargs: _job("running", version)
+
+    _render(mock_st, session_state, jobs, clicked=["Generate PDF Report"])
+    _render(mock_st, session_state, jobs, clicked=["Generate PDF Report"])
+
+    jobs.submit.assert_called_once()
+    assert jobs.submit.call_args.args[0] == session_state["df_version"]
+    assert mock_st.progress.call_count == 2
+
+
+@patch("idmd.ui.report_ui.st")
+def test_finished_job_offers_download(mock_st, session_state):
+    """Test that the download is offered once the job is done, without starting another job."""
+    jobs = MagicMock()
+    job = session_state["_report_0_job"] = _job("done", session_state["df_version"])
+
+    _render(mock_st, session_state, jobs, clicked=["Generate PDF Report"])
+
+    jobs.submit.assert_not_called()
+    assert mock_st.download_button.call_args.kwargs["data"]() is job.result.return_value.read.return_value
+
+
+@patch("idmd.ui.report_ui.st")
+def test_cancel_button_cancels_running_job(mock_st, session_state):
+    """Test that the cancel button cancels the running job and reruns the app."""
+    job = session_state["_report_0_job"] = _job("running", session_state["df_version"])
+    job.cancel.side_effect = lambda: setattr(job, "status", "cancelled")
+
+    _render(mock_st, session_state, MagicMock(), clicked=["Cancel Report"])
+
+    job.cancel.assert_called_once()
+    mock_st.rerun.assert_called_once()
+
+
+@patch("idmd.ui.report_ui.st")
+def test_new_version_cancels_previous_job(mock_st, session_state):
+    """Test that a job of a previous dataset version is cancelled and a new one can be started."""
+    old = session_state["_report_0_job"] = _job("running", "old-version")
+    jobs = MagicMock()
+    jobs.submit.side_effect = lambda version, *args, **kwargs: _job("running", version)
+
+    _render(mock_st, session_state, jobs, clicked=["Generate PDF Report"])
+
+    old.cancel.assert_called_once()
+    assert session_state["_report_0_job"].version == session_state["df_version"]
+
+
+@patch("idmd.ui.report_ui.st")
+def test_changed_selection_offers_new_report(mock_st, session_state):
+    """Test that a finished report of other columns is not offered, and a new one can be started."""
+    session_state["_report_0_job"] = _job("done", session_state["df_version"])
+    session_state["custom_hist_cols"] = ["B"]
+    jobs = MagicMock()
+
+    _render(mock_st, session_state, jobs)
+
+    mock_st.download_button.assert_not_called()
+    mock_st.button.assert_called_once_with("Generate PDF Report")
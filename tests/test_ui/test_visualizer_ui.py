@@ -0,0 +1,129 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from idmd.data.store import DatasetStore
+from idmd.ui.visualizer_ui import DataVisualizerUI
+from idmd.visualization.cache import FigureCache
+from idmd.visualization.plots import PlotGenerator
+from idmd.visualization.render import RenderPool
+
+
+class SessionState(dict):
+    """Dictionary with attribute access, like Streamlit's session state."""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def session_state():
+    state = SessionState()
+    DatasetStore.load(state, pd.DataFrame({"A": [1, 2, 3], "B": [3, 1, 2], "C": ["x", "y", "z"]}))
+    return state
+
+
+def _render(mock_st, session_state, opened=(), backend="matplotlib"):
+    mock_st.session_state = session_state
+    mock_st.toggle.side_effect = lambda label, **kwargs: label in opened
+    mock_st.multiselect.return_value = []
+    mock_st.selectbox.return_value = None
+    mock_st.empty.side_effect = lambda: MagicMock()
+    containers = []
+    mock_st.columns.side_effect = lambda n: containers.extend(MagicMock() for _ in range(n)) or containers[-n:]
+    DataVisualizerUI(cache=FigureCache(), backend=backend).render()
+    return containers
+
+
+@patch("idmd.ui.visualizer_ui.DatasetStore.current_frame")
+@patch("idmd.ui.visualizer_ui.st")
+def test_closed_sections_compute_nothing(mock_st, mock_current_frame, session_state):
+    """Test that nothing is computed, and the dataset is not materialized, while all sections are closed."""
+    _render(mock_st, session_state)
+
+    assert mock_st.toggle.call_count == 3
+    mock_current_frame.assert_not_called()
+    mock_st.dataframe.assert_not_called()
+    mock_st.empty.assert_not_called()
+
+
+@patch("idmd.ui.visualizer_ui.DataVisualizer.generate_overview")
+@patch("idmd.ui.visualizer_ui.st")
+def test_overview_is_cached_until_the_version_changes(mock_st, mock_overview, session_state):
+    """Test that the overview is computed when opened, and again only for a new version of the dataset."""
+    mock_overview.side_effect = lambda df: pd.DataFrame({"columns": df.columns})
+
+    _render(mock_st, session_state, opened=["Show Dataset Overview"])
+    _render(mock_st, session_state, opened=["Show Dataset Overview"])
+    assert mock_overview.call_count == 1
+
+    DatasetStore.update(session_state, session_state.df.drop(columns=["C"]), "drop C")
+    _render(mock_st, session_state, opened=["Show Dataset Overview"])
+    assert mock_overview.call_count == 2
+    assert mock_st.dataframe.call_count == 3
+
+
+@patch("idmd.ui.visualizer_ui.st")
+def test_default_plots_rendered_when_opened(mock_st, session_state):
+    """Test that the three default plots are rendered once their section is opened."""
+    _render(mock_st, session_state, opened=["Show Default Plots"])
+
+    assert mock_st.empty.call_count == 3
+    mock_st.dataframe.assert_not_called()
+
+
+@patch("idmd.ui.visualizer_ui.st")
+def test_vega_backend_sends_aggregated_data(mock_st, session_state):
+    """Test that the vega backend draws line plots and histograms as native charts of the aggregated data."""
+    containers = _render(mock_st, session_state, opened=["Show Default Plots"], backend="vega")
+
+    assert list(mock_st.line_chart.call_args.args[0].columns) == ["A", "B"]
+    for container, col in zip(containers, ["A", "B"]):
+        assert container.bar_chart.call_args.args[0].index.name == col
+    mock_st.image.assert_called_once()  # The heatmap is still rendered as an image.
+    mock_st.empty.assert_not_called()
+
+
+def test_unknown_backend():
+    """Test that an unknown chart backend is rejected."""
+    with pytest.raises(ValueError):
+        DataVisualizerUI(backend="bokeh")
+
+
+def _slow_plot(delay):
+    df = pd.DataFrame({"A": [1, 2, 3]})
+
+    def draw():
+        time.sleep(delay)
+        return PlotGenerator.generate_line_plot(df, ["A"])
+
+    return draw
+
+
+@patch("idmd.ui.visualizer_ui.st")
+def test_show_figures_renders_concurrently(mock_st):
+    """Test that figures are rendered at the same time and each one is shown as soon as it is ready."""
+    mock_st.session_state = {"df_version": "v1"}
+    placeholders = [MagicMock(name=name) for name in ["slow", "fast", "medium"]]
+    mock_st.empty.side_effect = placeholders
+    shown = []
+    for placeholder in placeholders:
+        placeholder.image.side_effect = lambda *args, placeholder=placeholder, **kwargs: shown.append(placeholder)
+    ui = DataVisualizerUI(cache=FigureCache(pool=RenderPool(max_workers=3)))
+
+    start = time.perf_counter()
+    ui._show_figures(
+        [
+            ("# Slow", "slow", _slow_plot(1.2)),
+            ("# Fast", "fast", _slow_plot(0.0)),
+            ("# Medium", "medium", _slow_plot(0.6)),
+        ],
+        ["A"],
+    )
+    elapsed = time.perf_counter() - start
+
+    assert [call.args[0] for call in mock_st.write.call_args_list] == ["# Slow", "# Fast", "# Medium"]
+    assert shown == [placeholders[1], placeholders[2], placeholders[0]], "Figures should appear as they finish."
+    assert elapsed < 1.2 + 0.6, "The total time should be close to the slowest figure, not the sum."
+    assert all(placeholder.caption.called for placeholder in placeholders)
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.stats import StatisticsCache
+from idmd.data.store import DatasetStore
+from idmd.visualization.aggregation import ChartData
+from idmd.visualization.decimation import Decimator
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"A": rng.normal(size=10_000), "B": rng.normal(size=10_000), "C": rng.choice(list("abcdef"), 10_000)}
+    )
+
+
+def test_line_is_decimated_and_cached(df):
+    """Test that line chart data is decimated, and computed once per version of the columns."""
+    cache = StatisticsCache()
+    store = DatasetStore(df, base_id="base")
+    with patch("idmd.data.store.STATS_CACHE", cache), patch("idmd.visualization.aggregation.STATS_CACHE", cache):
+        store.publish({})
+        with patch.object(Decimator, "decimate", wraps=Decimator.decimate) as decimated:
+            first = ChartData.line(store.current, ["A", "B"], max_points=100)
+            second = ChartData.line(store.current, ["A", "B"], max_points=100)
+
+    pd.testing.assert_frame_equal(first, Decimator.decimate(df, ["A", "B"], 100))
+    assert second is first and decimated.call_count == 1
+
+
+def test_histograms_indexed_by_bin_centers(df):
+    """Test that histogram data holds the bin counts, indexed by the bin centers."""
+    histograms = ChartData.histograms(df, ["A"], bins=10)
+
+    counts, edges = np.histogram(df["A"], 10)
+    np.testing.assert_array_equal(histograms["A"]["Frequency"], counts)
+    np.testing.assert_allclose(histograms["A"].index, (edges[:-1] + edges[1:]) / 2)
+
+
+def test_bar_groups_other_values(df):
+    """Test that bar chart data holds the most frequent values, followed by the other values."""
+    bars = ChartData.bar(df, "C", top_k=2)
+
+    expected = df["C"].value_counts()
+    assert list(bars.index) == list(expected.index[:2]) + ["Other"]
+    assert bars["Frequency"].tolist() == expected.iloc[:2].tolist() + [expected.iloc[2:].sum()]
@@ -0,0 +1,46 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.visualization.decimation import Decimator
+from idmd.visualization.plots import PlotGenerator
+
+
+@pytest.fixture
+def long_df():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"A": np.cumsum(rng.normal(size=100_000)), "B": rng.normal(size=100_000)})
+    df.loc[54_321, "B"] = 100.0
+    df.loc[12_345, "A"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_decimation_keeps_peaks(long_df, method):
+    """Test that decimation keeps few rows, in order, including the extremes of every column."""
+    result = Decimator.decimate(long_df, ["A", "B"], max_points=500, method=method)
+
+    assert len(result) <= 2 * 500, "At most max_points rows per column should be kept."
+    assert result.index.is_monotonic_increasing, "The rows should stay in order."
+    assert {0, len(long_df) - 1, 54_321} <= set(result.index), "The ends and the peak should be kept."
+    if method == "minmax":
+        assert long_df["A"].idxmax() in result.index and long_df["A"].idxmin() in result.index
+
+
+def test_short_series_unchanged():
+    """Test that series shorter than max_points are not decimated."""
+    df = pd.DataFrame({"A": [1, 2, 3]})
+
+    pd.testing.assert_frame_equal(Decimator.decimate(df, ["A"], max_points=10), df)
+    np.testing.assert_array_equal(Decimator.lttb(np.arange(10.0)[:, np.newaxis], 10).ravel(), np.arange(10))
+    with pytest.raises(ValueError):
+        Decimator.decimate(df, ["A"], method="mean")
+
+
+def test_line_plot_decimated(long_df):
+    """Test that the line plot draws only the decimated points."""
+    fig = PlotGenerator.generate_line_plot(long_df, ["A", "B"], max_points=500)
+
+    assert all(len(line.get_xdata()) <= 1000 for line in fig.axes[0].get_lines()), "Lines should be decimated."
+    assert max(fig.axes[0].get_lines()[1].get_ydata()) == 100.0, "The peak should be drawn."
+    plt.close(fig)
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idmd.data.stats import StatisticsCache
+from idmd.data.store import DatasetStore
+from idmd.visualization.density import DensityGenerator
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=5000)
+    return pd.DataFrame(
+        {
+            "x": np.where(rng.random(5000) < 0.1, np.nan, x),
+            "y": x + rng.normal(size=5000),
+            "k": rng.integers(0, 9, 5000),
+        }
+    )
+
+
+def test_compute_density_matches_numpy(df):
+    """Test that the 2D histogram matches np.histogram2d, ignoring rows with missing values."""
+    for x, y, bins in [("x", "y", 50), ("k", "y", 9)]:
+        valid = df[[x, y]].dropna()
+        counts, x_edges, y_edges = DensityGenerator.compute_density(df, x, y, bins)
+        expected, expected_x, expected_y = np.histogram2d(valid[x], valid[y], bins)
+        np.testing.assert_array_equal(counts, expected)
+        np.testing.assert_array_equal(x_edges, expected_x)
+        np.testing.assert_array_equal(y_edges, expected_y)
+
+
+def test_generate_density_plot(df):
+    """Test that the density is drawn as a single image with labelled axes."""
+    fig = DensityGenerator.generate_density_plot(df, "x", "y", bins=20)
+
+    ax = fig.axes[0]
+    assert len(ax.images) == 1 and ax.images[0].get_array().shape == (20, 20)
+    assert ax.get_title() == "Density of y vs x"
+    assert (ax.get_xlabel(), ax.get_ylabel()) == ("x", "y")
+
+
+def test_density_cached_per_version(df):
+    """Test that the density of a tracked dataset is computed once per pair of column versions."""
+    cache = StatisticsCache()
+    store = DatasetStore(df, base_id="base")
+    with patch("idmd.data.store.STATS_CACHE", cache), patch("idmd.visualization.density.STATS_CACHE", cache):
+        store.publish({})
+        with patch.object(DensityGenerator, "_bin", wraps=DensityGenerator._bin) as binned:
+            first = DensityGenerator.compute_density(store.current, "x", "y")
+            second = DensityGenerator.compute_density(store.current, "x", "y")
+            DensityGenerator.compute_density(store.current, "y", "x")
+
+    assert binned.call_count == 2, "Swapping the axes is a different density."
+    assert first is second
+
+
+def test_compute_density_missing_column(df):
+    """Test that a missing column raises a KeyError."""
+    with pytest.raises(KeyError):
+        DensityGenerator.compute_density(df, "x", "missing")
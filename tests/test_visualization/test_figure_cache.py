@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+from idmd.visualization.cache import FigureCache
+from idmd.visualization.plots import PlotGenerator
+
+
+@pytest.fixture
+def draw():
+    df = pd.DataFrame({"A": [1, 2, 3], "B": [3, 2, 1]})
+    return MagicMock(side_effect=lambda: PlotGenerator.generate_line_plot(df, ["A", "B"]))
+
+
+def test_figure_rendered_once_per_version(draw):
+    """Test that a figure is drawn once per dataset version, plot type and columns."""
+    cache = FigureCache()
+    open_figures = plt.get_fignums()
+
+    first = cache.render("v1", "line", ["A", "B"], draw)
+    second = cache.render("v1", "line", ["A", "B"], draw)
+    cache.render("v2", "line", ["A", "B"], draw)
+
+    assert first.startswith(b"\x89PNG") and first == second, "The cached PNG image should be returned."
+    assert draw.call_count == 2, "The figure should be drawn again only for a new version."
+    assert plt.get_fignums() == open_figures, "Rendered figures should be closed."
+
+
+def test_svg_and_unknown_version(draw):
+    """Test SVG rendering, and that figures of an unknown version are not cached."""
+    cache = FigureCache()
+
+    assert b"<svg" in cache.render(None, "line", ["A"], draw, fmt="svg"), "The image should be an SVG."
+    cache.render(None, "line", ["A"], draw, fmt="svg")
+    assert draw.call_count == 2 and len(cache.images) == 0, "Figures of an unknown version should not be cached."
+    with pytest.raises(ValueError):
+        cache.render("v1", "line", ["A"], draw, fmt="jpg")
+
+
+def test_memory_limit_evicts_least_recently_used(draw):
+    """Test that the least recently used images are evicted once the memory limit is reached."""
+    size = len(FigureCache().render("v0", "line", ["A"], draw))
+    cache = FigureCache(max_bytes=int(size * 2.5))
+
+    for version in ["v1", "v2", "v3"]:
+        cache.render(version, "line", ["A"], draw)
+
+    assert len(cache.images) == 2 and cache.images.nbytes <= cache.images.max_bytes
+    assert ("v1", "line", ("A",), "png") not in cache.images, "The oldest image should be evicted."
@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from idmd.visualization.heatmaps import HeatmapGenerator
 
@@ -43,3 +44,28 @@ def test_generate_correlation_heatmap_single_column():
     assert isinstance(fig, plt.Figure), "The output should be a matplotlib Figure."
     assert len(fig.axes) > 0, "The figure should contain at least one axis."
     assert fig.axes[0].get_title() == "Correlation Heatmap", "The heatmap title should be 'Correlation Heatmap'."
+
+
+def test_generate_correlation_heatmap_wide_dataframe_uses_image():
+    """Test that a heatmap of many columns is drawn as a single image without annotations."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(50, 30)), columns=[f"c{i}" for i in range(30)])
+
+    fig = HeatmapGenerator.generate_correlation_heatmap(df, columns=list(df.columns), cluster=True, top_k=3)
+
+    ax = fig.axes[0]
+    assert len(ax.images) == 1 and ax.images[0].get_array().shape == (30, 30)
+    assert not ax.texts, "Large heatmaps should not be annotated."
+    assert len(ax.collections[0].get_offsets()) == 6, "Each of the strongest pairs is marked on both sides."
+    assert ax.get_title() == "Correlation Heatmap"
+    plt.close(fig)
+
+
+def test_generate_correlation_heatmap_small_dataframe_is_annotated():
+    """Test that a heatmap of few columns keeps its annotations."""
+    df = pd.DataFrame({"A": [1, 2, 3, 4, 5], "B": [5, 4, 3, 2, 1], "C": [2, 3, 4, 5, 7]})
+
+    fig = HeatmapGenerator.generate_correlation_heatmap(df, columns=["A", "B", "C"])
+
+    assert len(fig.axes[0].texts) == 9
+    plt.close(fig)
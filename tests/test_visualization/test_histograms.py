@@ -1,6 +1,17 @@
+import time
+import warnings
+from unittest.mock import patch
+
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pytest
+from idmd.data.stats import StatisticsCache
+from idmd.data.store import DatasetStore
+from idmd.manipulation.plan import Operation
 from idmd.visualization.histograms import HistogramGenerator
+from idmd.visualization.render import RenderPool
+from matplotlib.patches import StepPatch
 
 
 def test_generate_histograms_valid_columns():
@@ -60,3 +71,151 @@ def test_generate_histograms_extra_empty_subplots():
     assert isinstance(fig, plt.Figure), "The output should be a matplotlib Figure."
     assert len(fig.axes) == 3, "The figure should contain three subplots (grid size is 3)."
     assert not fig.axes[2].has_data(), "The third subplot should be empty as there are only two columns."
+
+
+def test_compute_histograms_matches_numpy():
+    """Test that the vectorized histograms match np.histogram, including missing and constant columns."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "A": rng.normal(size=1000),
+            "B": rng.integers(0, 101, 1000),
+            "C": np.where(rng.random(1000) < 0.2, np.nan, rng.random(1000)),
+            "D": 3.0,
+        }
+    )
+
+    for bins in [7, 20]:
+        histograms = HistogramGenerator.compute_histograms(df, list(df.columns), bins)
+        for col in df.columns:
+            counts, edges = np.histogram(df[col].dropna(), bins)
+            np.testing.assert_array_equal(histograms[col][0], counts)
+            np.testing.assert_array_equal(histograms[col][1], edges)
+
+
+def test_histograms_do_not_depend_on_chunking():
+    """Test that binning the rows in chunks gives the same histograms as binning them at once."""
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"A": rng.normal(size=1000), "B": np.where(rng.random(1000) < 0.5, np.nan, 1.0)})
+
+    with patch.object(HistogramGenerator, "CHUNK_ROWS", 64):
+        histograms = HistogramGenerator._bin(df, ["A", "B"], 20)
+
+    for col in df.columns:
+        counts, edges = np.histogram(df[col].dropna(), 20)
+        np.testing.assert_array_equal(histograms[col][0], counts)
+        np.testing.assert_array_equal(histograms[col][1], edges)
+
+
+def test_histograms_are_drawn_as_stairs():
+    """Test that every histogram is a single step artist with the computed counts."""
+    df = pd.DataFrame({"A": [1, 2, 2, 3, 3, 3], "B": [0.5, 0.1, 0.9, 0.4, 0.3, 0.2]})
+
+    fig = HistogramGenerator.generate_histograms(df, columns=["A", "B"], bins=3)
+
+    for ax, col in zip(fig.axes, ["A", "B"]):
+        assert len(ax.patches) == 1 and isinstance(ax.patches[0], StepPatch)
+        np.testing.assert_array_equal(ax.patches[0].get_data().values, np.histogram(df[col], 3)[0])
+    plt.close(fig)
+
+
+def test_wide_histogram_grid_stays_small():
+    """Test that a grid of 100+ histograms is drawn in one axes on a bounded canvas, and renders quickly."""
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 120)), columns=[f"col_{i}" for i in range(120)])
+    HistogramGenerator.compute_histograms(df, list(df.columns))
+
+    start = time.perf_counter()
+    fig = HistogramGenerator.generate_histograms(df, list(df.columns))
+    assert len(fig.axes) == 1 and len(fig.axes[0].patches) == 120, "Every histogram should share one axes."
+    assert fig.get_size_inches()[1] <= HistogramGenerator.MAX_FIGURE_INCHES, "The canvas should be bounded."
+    RenderPool.to_bytes(fig, "png", 200)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 5, "Rendering should not grow with the number of axes."
+
+
+def test_only_changed_columns_are_binned_again():
+    """Test that histograms of a tracked dataset are cached per column and recomputed only for changed columns."""
+    cache = StatisticsCache()
+    store = DatasetStore(pd.DataFrame({"A": [0, 2, 3, 9], "B": [1.0, 4.0, 3.0, 2.0]}), base_id="base")
+    with patch("idmd.data.store.STATS_CACHE", cache), patch("idmd.visualization.histograms.STATS_CACHE", cache):
+        store.publish({})
+        HistogramGenerator.compute_histograms(store.current, ["A", "B"])
+
+        store.apply(Operation.replace("A", "0", "max"))
+        store.publish({})
+        with patch.object(HistogramGenerator, "_bin", wraps=HistogramGenerator._bin) as binned:
+            histograms = HistogramGenerator.compute_histograms(store.current, ["A", "B"])
+
+    assert binned.call_args.args[1] == ["A"]
+    np.testing.assert_array_equal(histograms["A"][0], np.histogram([9, 2, 3, 9], 20)[0])
+
+
+def _exact_kde(values, grid):
+    values = values[~np.isnan(values)]
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5)
+    return np.exp(-0.5 * ((grid[:, None] - values) / bandwidth) ** 2).sum(axis=1) / (
+        len(values) * bandwidth * np.sqrt(2 * np.pi)
+    )
+
+
+def test_kde_matches_exact_gaussian_sum():
+    """Test that the binned FFT estimate matches the sum of a Gaussian kernel per value."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"A": rng.normal(size=2000), "B": rng.exponential(size=2000)})
+    df.loc[::7, "A"] = np.nan
+
+    kdes = HistogramGenerator.compute_kdes(df, ["A", "B"])
+
+    for col in ["A", "B"]:
+        grid, density = kdes[col]
+        exact = _exact_kde(df[col].to_numpy(), grid)
+        assert len(grid) == HistogramGenerator.KDE_GRID_SIZE
+        assert np.abs(density - exact).max() < 1e-3 * exact.max()
+        assert np.trapezoid(density, grid) == pytest.approx(1, abs=1e-3)
+
+
+def test_kde_integrates_to_one_with_an_outlier():
+    """Test that the estimate stays normalized when an outlier makes the grid coarser than the bandwidth."""
+    values = np.random.default_rng(4).normal(size=100_000)
+    values[0] = 1e4
+    df = pd.DataFrame({"A": values})
+
+    grid, density = HistogramGenerator.compute_kdes(df, ["A"])["A"]
+
+    step = grid[1] - grid[0]
+    assert step > 1, "The grid step should exceed the bandwidth."
+    assert density.sum() * step == pytest.approx(1, abs=1e-6), "The estimate should integrate to 1 on the grid."
+
+
+def test_kde_is_empty_for_degenerate_columns():
+    """Test that columns with fewer than two distinct values get no estimate, without numpy warnings."""
+    df = pd.DataFrame({"A": [1.0, 1.0, 1.0], "B": [np.nan, 2.0, np.nan], "C": [np.nan] * 3, "D": [0.0, 1.0, 3.0]})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        kdes = HistogramGenerator.compute_kdes(df, ["A", "B", "C", "D"])
+
+    assert all(len(kdes[col][0]) == len(kdes[col][1]) == 0 for col in ["A", "B", "C"])
+    assert len(kdes["D"][1]) == HistogramGenerator.KDE_GRID_SIZE
+
+
+def test_kde_does_not_depend_on_chunking():
+    """Test that binning the rows in chunks gives the same estimate as binning them at once."""
+    df = pd.DataFrame({"A": np.random.default_rng(1).normal(size=1000)})
+
+    whole = HistogramGenerator._kde(df, ["A"], 128, 3.0)
+    with patch.object(HistogramGenerator, "CHUNK_ROWS", 64):
+        chunked = HistogramGenerator._kde(df, ["A"], 128, 3.0)
+
+    np.testing.assert_allclose(chunked["A"][1], whole["A"][1])
+
+
+def test_kde_bandwidth_is_accurate_far_from_zero():
+    """Test that the estimate of values far from zero matches the estimate of the same values near zero."""
+    values = np.random.default_rng(3).normal(size=1000)
+    df = pd.DataFrame({"A": values, "B": values + 1e9})
+
+    kdes = HistogramGenerator._kde(df, ["A", "B"], 128, 3.0)
+
+    np.testing.assert_allclose(kdes["B"][1], kdes["A"][1], rtol=1e-6, atol=1e-9)
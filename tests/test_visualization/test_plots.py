@@ -35,3 +35,23 @@ def test_generate_bar_plot_returns_figure(sample_df):
 
     bars = [patch for patch in ax.patches if patch.get_height() > 0]
     assert len(bars) == 2  # Should have 2 categories: A and B
+
+
+def test_generate_bar_plot_groups_rare_values():
+    """Test that only the most frequent values get a bar, and all others are counted in an "Other" bar."""
+    df = pd.DataFrame({"id": ["a"] * 5 + ["b"] * 3 + [f"x{i}" for i in range(50)]})
+
+    fig = PlotGenerator.generate_bar_plot(df, "id", top_k=2)
+
+    ax = fig.axes[0]
+    assert [label.get_text() for label in ax.get_xticklabels()] == ["a", "b", "Other"]
+    assert [patch.get_height() for patch in ax.patches] == [5, 3, 50]
+
+
+def test_generate_bar_plot_all_values():
+    """Test that every value is plotted without a top-k limit."""
+    df = pd.DataFrame({"id": [f"x{i}" for i in range(30)]})
+
+    fig = PlotGenerator.generate_bar_plot(df, "id", top_k=None)
+
+    assert len(fig.axes[0].patches) == 30
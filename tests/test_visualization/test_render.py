@@ -0,0 +1,87 @@
+import gc
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+from idmd.visualization.cache import FigureCache
+from idmd.visualization.heatmaps import HeatmapGenerator
+from idmd.visualization.histograms import HistogramGenerator
+from idmd.visualization.plots import PlotGenerator
+from idmd.visualization.render import RenderPool
+from matplotlib.figure import Figure
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"A": [1, 2, 3, 4], "B": [4, 2, 3, 1], "C": ["x", "y", "x", "x"]})
+
+
+def test_generators_do_not_use_pyplot(df):
+    """Test that figures are built without registering them with pyplot."""
+    open_figures = plt.get_fignums()
+
+    figures = [
+        PlotGenerator.generate_line_plot(df, ["A", "B"]),
+        PlotGenerator.generate_bar_plot(df, "C"),
+        HeatmapGenerator.generate_correlation_heatmap(df, ["A", "B"]),
+        HistogramGenerator.generate_histograms(df, ["A", "B"]),
+    ]
+
+    assert all(isinstance(fig, Figure) and fig.canvas.manager is None for fig in figures)
+    assert plt.get_fignums() == open_figures
+
+
+def test_rendered_figures_are_released(df):
+    """Test that a figure is disposed once rendered, so that it can be garbage collected."""
+    fig = PlotGenerator.generate_line_plot(df, ["A", "B"])
+    ref = weakref.ref(fig)
+
+    image = RenderPool.to_bytes(fig)
+    del fig
+    gc.collect()
+
+    assert image.startswith(b"\x89PNG")
+    assert ref() is None, "The figure should not be referenced anymore."
+
+
+def test_pool_bounds_concurrent_renderings(df):
+    """Test that no more figures than workers are drawn at once, and that drawing errors reach the caller."""
+    pool = RenderPool(max_workers=2)
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def draw():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return PlotGenerator.generate_line_plot(df, ["A"])
+
+    images = [future.result() for future in [pool.submit(draw) for _ in range(6)]]
+    with pytest.raises(KeyError):
+        pool.render(lambda: PlotGenerator.generate_line_plot(df, ["missing"]))
+    pool.shutdown()
+
+    assert peak[0] <= 2 and len(set(images)) == 1
+
+
+def test_concurrent_sessions_share_one_rendering(df):
+    """Test that concurrent requests for the same figure draw it only once."""
+    cache = FigureCache(pool=RenderPool(max_workers=2))
+    calls = []
+
+    def draw():
+        calls.append(1)
+        time.sleep(0.05)
+        return PlotGenerator.generate_line_plot(df, ["A", "B"])
+
+    with ThreadPoolExecutor(8) as sessions:
+        images = list(sessions.map(lambda _: cache.render("v1", "line", ["A", "B"], draw), range(8)))
+
+    assert len(calls) == 1 and len(set(images)) == 1
+    assert ("v1", "line", ("A", "B"), "png") in cache.images
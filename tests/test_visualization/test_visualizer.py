@@ -16,7 +16,7 @@ def test_generate_line_plot_delegates(mock_plot_gen, sample_df):
     mock_plot_gen.generate_line_plot.return_value = mock_fig
 
     result = DataVisualizer.generate_line_plot(sample_df, ["a", "b"])
-    mock_plot_gen.generate_line_plot.assert_called_once_with(sample_df, ["a", "b"])
+    mock_plot_gen.generate_line_plot.assert_called_once_with(sample_df, ["a", "b"], max_points=2000, method="minmax")
     assert result == mock_fig
 
 
@@ -26,7 +26,17 @@ def test_generate_bar_plot_delegates(mock_plot_gen, sample_df):
     mock_plot_gen.generate_bar_plot.return_value = mock_fig
 
     result = DataVisualizer.generate_bar_plot(sample_df, "c")
-    mock_plot_gen.generate_bar_plot.assert_called_once_with(sample_df, "c")
+    mock_plot_gen.generate_bar_plot.assert_called_once_with(sample_df, "c", top_k=20)
+    assert result == mock_fig
+
+
+@patch("idmd.visualization.visualizer.DensityGenerator")
+def test_generate_density_plot_delegates(mock_density_gen, sample_df):
+    mock_fig = MagicMock()
+    mock_density_gen.generate_density_plot.return_value = mock_fig
+
+    result = DataVisualizer.generate_density_plot(sample_df, "a", "b")
+    mock_density_gen.generate_density_plot.assert_called_once_with(sample_df, "a", "b")
     assert result == mock_fig
 
 
@@ -36,7 +46,7 @@ def test_generate_correlation_heatmap_delegates(mock_heatmap_gen, sample_df):
     mock_heatmap_gen.generate_correlation_heatmap.return_value = mock_fig
 
     result = DataVisualizer.generate_correlation_heatmap(sample_df, ["a", "b"])
-    mock_heatmap_gen.generate_correlation_heatmap.assert_called_once_with(sample_df, ["a", "b"])
+    mock_heatmap_gen.generate_correlation_heatmap.assert_called_once_with(sample_df, ["a", "b"], cluster=False, top_k=0)
     assert result == mock_fig
 
 